@@ -34,8 +34,17 @@ from app.models.maladie import Maladie
 from app.models.district import District
 from app.models.centre_sante import CentreSante
 from app.models.cas import Cas
+from app.models.compteur_cas import CompteurCas
+from app.models.numero_cas import NumeroCas
+from app.models.cas_supprime import CasSupprime
+from app.models.doublon_cas import DoublonCas
+from app.models.cas_archive import CasArchive
+from app.models.cas_daily_agg import CasDailyAgg
 from app.models.alerte import Alerte
 from app.models.intervention import Intervention
+from app.models.anomalie import Anomalie
+from app.models.prediction import Prediction
+from app.models.recommandation import Recommandation
 
 # Ajoutez ici tous vos autres modèles si vous en avez :
 # from app.models.alerte import Alerte
@@ -0,0 +1,41 @@
+"""add compteurs_cas (numérotation des cas par année)
+
+Revision ID: 3b7e91c0d4a2
+Revises: 98551600bc48
+Create Date: 2026-10-16 21:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e91c0d4a2'
+down_revision: Union[str, Sequence[str], None] = '98551600bc48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'compteurs_cas',
+        sa.Column('annee', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('dernier_numero', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('annee')
+    )
+    # Reprise des numéros VAKIN-AAAA-NNNNN déjà attribués
+    op.execute("""
+        INSERT INTO compteurs_cas (annee, dernier_numero)
+        SELECT split_part(numero_cas, '-', 2)::int, max(split_part(numero_cas, '-', 3)::int)
+        FROM cas
+        WHERE numero_cas ~ '^VAKIN-[0-9]{4}-[0-9]+$'
+        GROUP BY 1
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('compteurs_cas')
@@ -0,0 +1,44 @@
+"""add cas_archives (manifeste des archives Parquet des cas clôturés)
+
+Revision ID: 3c8e5a1f7d64
+Revises: e6b1c9d4a852
+Create Date: 2026-10-17 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e5a1f7d64'
+down_revision: Union[str, Sequence[str], None] = 'e6b1c9d4a852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cas_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('chemin', sa.String(), nullable=False),
+        sa.Column('annee', sa.Integer(), nullable=False),
+        sa.Column('maladie_id', sa.Integer(), nullable=False),
+        sa.Column('lignes', sa.Integer(), nullable=False),
+        sa.Column('date_min', sa.Date(), nullable=False),
+        sa.Column('date_max', sa.Date(), nullable=False),
+        sa.Column('archive_le', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chemin')
+    )
+    op.create_index(op.f('ix_cas_archives_id'), 'cas_archives', ['id'])
+    op.create_index('ix_cas_archives_maladie_dates', 'cas_archives', ['maladie_id', 'date_min', 'date_max'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cas_archives_maladie_dates', table_name='cas_archives')
+    op.drop_index(op.f('ix_cas_archives_id'), table_name='cas_archives')
+    op.drop_table('cas_archives')
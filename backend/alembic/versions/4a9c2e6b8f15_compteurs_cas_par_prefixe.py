@@ -0,0 +1,50 @@
+"""compteurs_cas par préfixe (VAKIN, CAS...) et par année
+
+Revision ID: 4a9c2e6b8f15
+Revises: 8d2f4b7a1c39
+Create Date: 2026-10-17 11:00:00.000000
+
+Les numéros CAS-AAAA-NNNNNN de l'ancien générateur reçoivent aussi leur
+compteur : tout préfixe présent dans cas reprend après son plus grand numéro.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9c2e6b8f15'
+down_revision: Union[str, Sequence[str], None] = '8d2f4b7a1c39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'compteurs_cas',
+        sa.Column('prefixe', sa.String(length=16), nullable=False, server_default='VAKIN')
+    )
+    op.alter_column('compteurs_cas', 'prefixe', server_default=None)
+    op.drop_constraint('compteurs_cas_pkey', 'compteurs_cas', type_='primary')
+    op.create_primary_key('compteurs_cas_pkey', 'compteurs_cas', ['prefixe', 'annee'])
+    # Reprise des numéros PREFIXE-AAAA-NNNNN déjà attribués, tous préfixes confondus
+    op.execute("""
+        INSERT INTO compteurs_cas (prefixe, annee, dernier_numero)
+        SELECT split_part(numero_cas, '-', 1), split_part(numero_cas, '-', 2)::int,
+               max(split_part(numero_cas, '-', 3)::int)
+        FROM cas
+        WHERE numero_cas ~ '^[A-Z]+-[0-9]{4}-[0-9]{1,9}$'
+        GROUP BY 1, 2
+        ON CONFLICT (prefixe, annee) DO UPDATE
+        SET dernier_numero = GREATEST(compteurs_cas.dernier_numero, EXCLUDED.dernier_numero)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM compteurs_cas WHERE prefixe <> 'VAKIN'")
+    op.drop_constraint('compteurs_cas_pkey', 'compteurs_cas', type_='primary')
+    op.create_primary_key('compteurs_cas_pkey', 'compteurs_cas', ['annee'])
+    op.drop_column('compteurs_cas', 'prefixe')
@@ -0,0 +1,50 @@
+"""add cas_supprimes (tombstones) and change index for /cas/changes
+
+Revision ID: 4f8a2c6e9b13
+Revises: 7c2d5e8f1a90
+Create Date: 2026-10-16 22:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8a2c6e9b13'
+down_revision: Union[str, Sequence[str], None] = '7c2d5e8f1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cas_supprimes',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('numero_cas', sa.String(), nullable=False),
+        sa.Column('district_id', sa.Integer(), nullable=False),
+        sa.Column('centre_sante_id', sa.Integer(), nullable=False),
+        sa.Column('supprime_par', sa.Integer(), nullable=True),
+        sa.Column('supprime_le', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_cas_supprimes_supprime_le_id', 'cas_supprimes', ['supprime_le', 'id'])
+    op.create_index(op.f('ix_cas_supprimes_district_id'), 'cas_supprimes', ['district_id'])
+    # Dernière modification d'un cas (création ou mise à jour), construit sans bloquer la saisie
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cas_modifie_le_id', 'cas', [sa.text('coalesce(updated_at, created_at)'), 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_cas_modifie_le_id', table_name='cas', postgresql_concurrently=True, if_exists=True)
+    op.drop_index(op.f('ix_cas_supprimes_district_id'), table_name='cas_supprimes')
+    op.drop_index('ix_cas_supprimes_supprime_le_id', table_name='cas_supprimes')
+    op.drop_table('cas_supprimes')
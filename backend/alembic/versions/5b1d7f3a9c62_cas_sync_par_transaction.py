@@ -0,0 +1,72 @@
+"""/cas/changes ordonné par transaction (xid) au lieu de l'horodatage
+
+Revision ID: 5b1d7f3a9c62
+Revises: 4a9c2e6b8f15
+Create Date: 2026-10-17 12:00:00.000000
+
+cas.xid_modif et cas_supprimes.xid_suppression reçoivent l'identifiant de
+la transaction qui écrit la ligne (pg_current_xact_id, 64 bits, jamais
+recyclé). Le flux ne sert que les transactions antérieures au xmin de son
+instantané : toutes sont terminées, une transaction longue qui valide plus
+tard ne peut plus écrire derrière un curseur déjà servi. Les lignes
+existantes reçoivent 0 (servies en tête de la prochaine synchronisation
+initiale) ; les anciens curseurs horodatés sont refusés (400), les
+terminaux repartent d'une synchronisation initiale.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1d7f3a9c62'
+down_revision: Union[str, Sequence[str], None] = '4a9c2e6b8f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+XID_COURANT = "pg_current_xact_id()::text::bigint"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Défaut constant : ajout sans réécriture de la table
+    op.add_column('cas', sa.Column('xid_modif', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column(
+        'cas_supprimes', sa.Column('xid_suppression', sa.BigInteger(), server_default='0', nullable=False)
+    )
+    op.alter_column('cas', 'xid_modif', server_default=None)
+    op.alter_column('cas_supprimes', 'xid_suppression', server_default=sa.text(XID_COURANT))
+
+    # Création et modification d'un cas : xid de la transaction (déclencheur
+    # du parent, recopié sur chaque partition)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION cas_xid_modif() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.xid_modif := {XID_COURANT};
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER cas_xid_modif BEFORE INSERT OR UPDATE ON cas
+        FOR EACH ROW EXECUTE FUNCTION cas_xid_modif()
+    """)
+
+    # cas est partitionnée : pas de CREATE INDEX CONCURRENTLY
+    op.drop_index('ix_cas_modifie_le_id', table_name='cas')
+    op.create_index('ix_cas_xid_modif_id', 'cas', ['xid_modif', 'id'])
+    op.drop_index('ix_cas_supprimes_supprime_le_id', table_name='cas_supprimes')
+    op.create_index('ix_cas_supprimes_xid_suppression_id', 'cas_supprimes', ['xid_suppression', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cas_supprimes_xid_suppression_id', table_name='cas_supprimes')
+    op.create_index('ix_cas_supprimes_supprime_le_id', 'cas_supprimes', ['supprime_le', 'id'])
+    op.drop_index('ix_cas_xid_modif_id', table_name='cas')
+    op.create_index('ix_cas_modifie_le_id', 'cas', [sa.text('coalesce(updated_at, created_at)'), 'id'])
+    op.execute("DROP TRIGGER cas_xid_modif ON cas")
+    op.execute("DROP FUNCTION cas_xid_modif()")
+    op.drop_column('cas_supprimes', 'xid_suppression')
+    op.drop_column('cas', 'xid_modif')
@@ -1,7 +1,7 @@
 """add_nom_to_cas
 
-Revision ID: xxxxx
-Revises: xxxxx
+Revision ID: 5ec24b4384d4
+Revises: c89a76cc914c
 Create Date: 2025-11-16 18:27:00.000000
 
 """
@@ -10,8 +10,8 @@ import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
-revision = 'xxxxx'
-down_revision = 'xxxxx'
+revision = '5ec24b4384d4'
+down_revision = 'c89a76cc914c'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,55 @@
+"""add numeros_cas (unicité de numero_cas sur cas partitionnée)
+
+Revision ID: 6c3e8a2d4f17
+Revises: 5b1d7f3a9c62
+Create Date: 2026-10-17 13:00:00.000000
+
+Depuis le partitionnement (e6b1c9d4a852), numero_cas n'a plus d'index
+unique. numeros_cas (numero_cas PRIMARY KEY) est remplie par un déclencheur
+BEFORE INSERT de cas, dans la transaction de l'insertion : un numéro déjà
+utilisé fait échouer l'écriture, quel que soit l'écrivain. Le déplacement
+des lignes de cas_defaut vers une nouvelle partition (insertion dans la
+table avant son attachement) ne passe pas par le déclencheur.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c3e8a2d4f17'
+down_revision: Union[str, Sequence[str], None] = '5b1d7f3a9c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'numeros_cas',
+        sa.Column('numero_cas', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('numero_cas')
+    )
+    # Écritures bloquées le temps du remplissage et de la pose du déclencheur
+    op.execute("LOCK TABLE cas IN SHARE MODE")
+    op.execute("INSERT INTO numeros_cas (numero_cas) SELECT DISTINCT numero_cas FROM cas")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION cas_numero_unique() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO numeros_cas (numero_cas) VALUES (NEW.numero_cas);
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER cas_numero_unique BEFORE INSERT ON cas
+        FOR EACH ROW EXECUTE FUNCTION cas_numero_unique()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER cas_numero_unique ON cas")
+    op.execute("DROP FUNCTION cas_numero_unique()")
+    op.drop_table('numeros_cas')
@@ -0,0 +1,64 @@
+"""add workload-derived indexes on cas and alertes
+
+Revision ID: 7c2d5e8f1a90
+Revises: 3b7e91c0d4a2
+Create Date: 2026-10-16 21:40:00.000000
+
+Index construits avec CREATE INDEX CONCURRENTLY (hors transaction) pour ne pas
+bloquer la saisie pendant la migration sur une base en production.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d5e8f1a90'
+down_revision: Union[str, Sequence[str], None] = '3b7e91c0d4a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nom, table, colonnes, condition d'index partiel)
+INDEXES = [
+    # Listes /cas (keyset), compteurs 24h/7j/30j, fenêtres de dates des rapports
+    ('ix_cas_date_declaration_id', 'cas', ['date_declaration', 'id'], None),
+    # Statistiques, exports et carto filtrés par maladie ou district sur une période
+    ('ix_cas_maladie_date_declaration', 'cas', ['maladie_id', 'date_declaration'], None),
+    ('ix_cas_district_date_declaration', 'cas', ['district_id', 'date_declaration'], None),
+    # Décès / guérisons sur une période
+    ('ix_cas_statut_date_declaration', 'cas', ['statut', 'date_declaration'], None),
+    # check-thresholds : 7 derniers jours groupés par maladie et district (index-only)
+    ('ix_cas_date_symptomes_maladie_district', 'cas', ['date_symptomes', 'maladie_id', 'district_id'], None),
+    # Marqueurs et heatmap : seuls les cas géolocalisés
+    ('ix_cas_geolocalises_date_declaration', 'cas', ['date_declaration'],
+     'latitude IS NOT NULL AND longitude IS NOT NULL'),
+    # Recherche de l'alerte active d'un couple maladie/district
+    ('ix_alertes_maladie_district_statut', 'alertes', ['maladie_id', 'district_id', 'statut'], None),
+    # Liste /alertes (keyset) et rapports par période
+    ('ix_alertes_date_detection_id', 'alertes', ['date_detection', 'id'], None),
+    # Alertes ouvertes par niveau (dashboard)
+    ('ix_alertes_ouvertes_niveau', 'alertes', ['niveau_gravite'], "statut IN ('active', 'en_cours')"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True
+            )
+    op.execute("ANALYZE cas")
+    op.execute("ANALYZE alertes")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
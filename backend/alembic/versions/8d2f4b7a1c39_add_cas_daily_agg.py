@@ -0,0 +1,68 @@
+"""add cas_daily_agg (cas par jour et par dimension, tenue incrémentale)
+
+Revision ID: 8d2f4b7a1c39
+Revises: 3c8e5a1f7d64
+Create Date: 2026-10-17 09:30:00.000000
+
+Le remplissage initial ne lit que la table cas : si des cas ont déjà été
+archivés en Parquet, lancer ensuite python -m scripts.agreger_cas.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b7a1c39'
+down_revision: Union[str, Sequence[str], None] = '3c8e5a1f7d64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cas_daily_agg',
+        sa.Column('axe', sa.String(length=12), nullable=False),
+        sa.Column('jour', sa.Date(), nullable=False),
+        sa.Column('maladie_id', sa.Integer(), nullable=False),
+        sa.Column('district_id', sa.Integer(), nullable=False),
+        sa.Column('centre_sante_id', sa.Integer(), nullable=False),
+        sa.Column('statut', sa.String(length=20), nullable=False),
+        sa.Column('sexe', sa.String(length=20), nullable=False),
+        sa.Column('tranche_age', sa.String(length=20), nullable=False),
+        sa.Column('nombre', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            'axe', 'jour', 'maladie_id', 'district_id', 'centre_sante_id', 'statut', 'sexe', 'tranche_age'
+        )
+    )
+    op.create_index('ix_cas_daily_agg_maladie_jour', 'cas_daily_agg', ['axe', 'maladie_id', 'jour'])
+    op.create_index('ix_cas_daily_agg_district_jour', 'cas_daily_agg', ['axe', 'district_id', 'jour'])
+
+    # Mêmes tranches que app.services.agregat_service.TRANCHES_AGE
+    op.execute("""
+        INSERT INTO cas_daily_agg
+            (axe, jour, maladie_id, district_id, centre_sante_id, statut, sexe, tranche_age, nombre)
+        SELECT d.axe, d.jour, maladie_id, district_id, centre_sante_id,
+               statut::text, coalesce(sexe::text, 'NR'),
+               CASE WHEN age < 1 THEN '0-1 an'
+                    WHEN age < 5 THEN '1-4 ans'
+                    WHEN age < 15 THEN '5-14 ans'
+                    WHEN age < 25 THEN '15-24 ans'
+                    WHEN age < 45 THEN '25-44 ans'
+                    WHEN age < 65 THEN '45-64 ans'
+                    WHEN age >= 65 THEN '65+ ans'
+                    ELSE 'Non renseigné' END,
+               count(*)
+        FROM cas
+        CROSS JOIN LATERAL (VALUES ('declaration', date_declaration), ('symptomes', date_symptomes)) AS d(axe, jour)
+        GROUP BY 1, 2, 3, 4, 5, 6, 7, 8
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cas_daily_agg_district_jour', table_name='cas_daily_agg')
+    op.drop_index('ix_cas_daily_agg_maladie_jour', table_name='cas_daily_agg')
+    op.drop_table('cas_daily_agg')
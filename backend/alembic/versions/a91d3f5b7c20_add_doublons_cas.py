@@ -0,0 +1,52 @@
+"""add doublons_cas (file de revue des doublons probables)
+
+Revision ID: a91d3f5b7c20
+Revises: 4f8a2c6e9b13
+Create Date: 2026-10-16 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91d3f5b7c20'
+down_revision: Union[str, Sequence[str], None] = '4f8a2c6e9b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'doublons_cas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cas_id', sa.Integer(), nullable=False),
+        sa.Column('doublon_de_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('statut', sa.Enum('a_verifier', 'confirme', 'rejete', name='statut_doublon'), nullable=False),
+        sa.Column('detecte_le', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('traite_par', sa.Integer(), nullable=True),
+        sa.Column('traite_le', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['cas_id'], ['cas.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['doublon_de_id'], ['cas.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['traite_par'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cas_id', 'doublon_de_id', name='uq_doublons_cas_paire')
+    )
+    op.create_index(op.f('ix_doublons_cas_id'), 'doublons_cas', ['id'])
+    op.create_index(op.f('ix_doublons_cas_cas_id'), 'doublons_cas', ['cas_id'])
+    op.create_index(op.f('ix_doublons_cas_doublon_de_id'), 'doublons_cas', ['doublon_de_id'])
+    op.create_index(op.f('ix_doublons_cas_statut'), 'doublons_cas', ['statut'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_doublons_cas_statut'), table_name='doublons_cas')
+    op.drop_index(op.f('ix_doublons_cas_doublon_de_id'), table_name='doublons_cas')
+    op.drop_index(op.f('ix_doublons_cas_cas_id'), table_name='doublons_cas')
+    op.drop_index(op.f('ix_doublons_cas_id'), table_name='doublons_cas')
+    op.drop_table('doublons_cas')
+    sa.Enum(name='statut_doublon').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""add pg_trgm and full-text indexes for /cas/search
+
+Revision ID: d27b4e8a6f31
+Revises: a91d3f5b7c20
+Create Date: 2026-10-16 23:10:00.000000
+
+Index GIN construits avec CREATE INDEX CONCURRENTLY (hors transaction).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27b4e8a6f31'
+down_revision: Union[str, Sequence[str], None] = 'a91d3f5b7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        # Nom du patient et fragment de numéro : similarité, ILIKE '%...%'
+        op.create_index(
+            'ix_cas_nom_trgm', 'cas', ['nom'],
+            postgresql_using='gin', postgresql_ops={'nom': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_cas_numero_cas_trgm', 'cas', ['numero_cas'],
+            postgresql_using='gin', postgresql_ops={'numero_cas': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Observations : recherche plein texte (même expression que app.models.cas)
+        op.create_index(
+            'ix_cas_observations_fts', 'cas',
+            [sa.text("to_tsvector('french', coalesce(observations, ''))")],
+            postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in ('ix_cas_observations_fts', 'ix_cas_numero_cas_trgm', 'ix_cas_nom_trgm'):
+            op.drop_index(name, table_name='cas', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,150 @@
+"""partition cas by year of date_declaration
+
+Revision ID: e6b1c9d4a852
+Revises: d27b4e8a6f31
+Create Date: 2026-10-16 23:40:00.000000
+
+La table est reconstruite : cas devient une table partitionnée
+(RANGE (date_declaration), une partition cas_AAAA par année + cas_defaut),
+les lignes y sont copiées puis l'ancienne table est supprimée, le tout dans
+la transaction de la migration (écritures bloquées pendant la copie).
+
+Une contrainte unique d'une table partitionnée doit contenir la clé de
+partition : la clé primaire devient (id, date_declaration) et l'index de
+numero_cas n'est plus unique (unicité assurée par compteurs_cas et la
+fusion des imports). Les clés étrangères doublons_cas -> cas.id sont
+supprimées pour la même raison.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b1c9d4a852'
+down_revision: Union[str, Sequence[str], None] = 'd27b4e8a6f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Clés étrangères de cas (noms générés par PostgreSQL à la création)
+CLES_ETRANGERES = (
+    ('cas_maladie_id_fkey', 'maladie_id', 'maladies'),
+    ('cas_centre_sante_id_fkey', 'centre_sante_id', 'centres_sante'),
+    ('cas_district_id_fkey', 'district_id', 'districts'),
+    ('cas_created_by_fkey', 'created_by', 'users'),
+)
+
+
+def _supprimer_index(table: str) -> None:
+    """Libère les noms ix_cas_* (index de l'ancienne table)"""
+    op.execute(f"""
+        DO $$
+        DECLARE nom text;
+        BEGIN
+            FOR nom IN SELECT indexname FROM pg_indexes
+                       WHERE schemaname = current_schema() AND tablename = '{table}'
+                         AND indexname LIKE 'ix\\_cas\\_%'
+            LOOP
+                EXECUTE format('DROP INDEX %I', nom);
+            END LOOP;
+        END $$
+    """)
+
+
+def _creer_index(numero_unique: bool) -> None:
+    """Index de cas (migrations 7c2d5e8f1a90, 4f8a2c6e9b13, d27b4e8a6f31)"""
+    op.create_index('ix_cas_id', 'cas', ['id'])
+    op.create_index('ix_cas_numero_cas', 'cas', ['numero_cas'], unique=numero_unique)
+    op.create_index('ix_cas_date_declaration_id', 'cas', ['date_declaration', 'id'])
+    op.create_index('ix_cas_maladie_date_declaration', 'cas', ['maladie_id', 'date_declaration'])
+    op.create_index('ix_cas_district_date_declaration', 'cas', ['district_id', 'date_declaration'])
+    op.create_index('ix_cas_statut_date_declaration', 'cas', ['statut', 'date_declaration'])
+    op.create_index(
+        'ix_cas_date_symptomes_maladie_district', 'cas', ['date_symptomes', 'maladie_id', 'district_id']
+    )
+    op.create_index(
+        'ix_cas_geolocalises_date_declaration', 'cas', ['date_declaration'],
+        postgresql_where=sa.text('latitude IS NOT NULL AND longitude IS NOT NULL')
+    )
+    op.create_index('ix_cas_modifie_le_id', 'cas', [sa.text('coalesce(updated_at, created_at)'), 'id'])
+    op.create_index(
+        'ix_cas_nom_trgm', 'cas', ['nom'], postgresql_using='gin', postgresql_ops={'nom': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_cas_numero_cas_trgm', 'cas', ['numero_cas'],
+        postgresql_using='gin', postgresql_ops={'numero_cas': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_cas_observations_fts', 'cas',
+        [sa.text("to_tsvector('french', coalesce(observations, ''))")], postgresql_using='gin'
+    )
+
+
+def _reconstruire(partitionnee: bool) -> None:
+    """Remplace cas par une copie (partitionnée ou non) avec les mêmes données"""
+    op.execute("LOCK TABLE cas IN ACCESS EXCLUSIVE MODE")
+    op.rename_table('cas', 'cas_ancienne')
+    op.execute("ALTER TABLE cas_ancienne RENAME CONSTRAINT cas_pkey TO cas_ancienne_pkey")
+    for nom, _, _ in CLES_ETRANGERES:
+        op.execute(f"ALTER TABLE cas_ancienne RENAME CONSTRAINT {nom} TO {nom.replace('cas_', 'cas_ancienne_', 1)}")
+    _supprimer_index('cas_ancienne')
+
+    if partitionnee:
+        op.execute("""
+            CREATE TABLE cas (LIKE cas_ancienne INCLUDING DEFAULTS,
+                              CONSTRAINT cas_pkey PRIMARY KEY (id, date_declaration))
+            PARTITION BY RANGE (date_declaration)
+        """)
+        bornes = op.get_bind().execute(sa.text(
+            "SELECT min(date_declaration), max(date_declaration) FROM cas_ancienne"
+        )).one()
+        annee_courante = date.today().year
+        premiere = bornes[0].year if bornes[0] else annee_courante
+        derniere = max(bornes[1].year if bornes[1] else annee_courante, annee_courante) + 1
+        for annee in range(premiere, derniere + 1):
+            op.execute(
+                f"CREATE TABLE cas_{annee} PARTITION OF cas "
+                f"FOR VALUES FROM ('{annee}-01-01') TO ('{annee + 1}-01-01')"
+            )
+        op.execute("CREATE TABLE cas_defaut PARTITION OF cas DEFAULT")
+    else:
+        op.execute("""
+            CREATE TABLE cas (LIKE cas_ancienne INCLUDING DEFAULTS, CONSTRAINT cas_pkey PRIMARY KEY (id))
+        """)
+
+    op.execute("INSERT INTO cas SELECT * FROM cas_ancienne")
+    op.execute("ALTER SEQUENCE cas_id_seq OWNED BY cas.id")
+    for nom, colonne, cible in CLES_ETRANGERES:
+        op.create_foreign_key(nom, 'cas', cible, [colonne], ['id'])
+    _creer_index(numero_unique=not partitionnee)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('doublons_cas_cas_id_fkey', 'doublons_cas', type_='foreignkey')
+    op.drop_constraint('doublons_cas_doublon_de_id_fkey', 'doublons_cas', type_='foreignkey')
+    _reconstruire(partitionnee=True)
+    op.drop_table('cas_ancienne')
+    op.execute("ANALYZE cas")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Les partitions détachées (archivées) ne sont pas réintégrées
+    _reconstruire(partitionnee=False)
+    op.execute("DROP TABLE cas_ancienne CASCADE")
+    op.execute("ANALYZE cas")
+    op.execute("""
+        DELETE FROM doublons_cas d
+        WHERE NOT EXISTS (SELECT 1 FROM cas WHERE cas.id = d.cas_id)
+           OR NOT EXISTS (SELECT 1 FROM cas WHERE cas.id = d.doublon_de_id)
+    """)
+    op.create_foreign_key(
+        'doublons_cas_cas_id_fkey', 'doublons_cas', 'cas', ['cas_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'doublons_cas_doublon_de_id_fkey', 'doublons_cas', 'cas', ['doublon_de_id'], ['id'], ondelete='CASCADE'
+    )
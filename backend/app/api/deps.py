@@ -1,17 +1,24 @@
 # app/api/deps.py
-from typing import Generator, Optional
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import AsyncGenerator, Callable, Generator, Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import SessionLocal
+from app.core.principal import Principal, principal_cache
+from app.core.database import SessionLocal, AsyncSessionLocal, AsyncOLTPSessionLocal, SESSION_FACTORIES
 from app.models.user import User
-from app.utils.enums import UserRole
+from app.utils.enums import UserRole, WorkloadClass
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Principal déjà authentifié par POST /batch, réutilisé par ses sous-requêtes
+principal_lot: ContextVar[Optional[Principal]] = ContextVar("principal_lot", default=None)
+
 
 def get_db() -> Generator:
     """Dépendance pour obtenir la session de base de données"""
@@ -22,11 +29,60 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    """Récupère l'utilisateur actuel depuis le token JWT"""
+@lru_cache(maxsize=None)
+def get_db_for(workload: WorkloadClass) -> Callable[[], Generator]:
+    """
+    Dépendance de session liée au pool d'une classe de charge
+    (ex: les exports utilisent le pool reporting pour ne pas bloquer la saisie)
+    """
+    factory = SESSION_FACTORIES[workload]
+
+    def _get_db() -> Generator:
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return _get_db
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dépendance pour obtenir une session asynchrone (lectures intensives)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_oltp_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session asynchrone du pool OLTP, sur la primaire (lecture puis écriture : login, inscription)"""
+    async with AsyncOLTPSessionLocal() as db:
+        yield db
+
+
+def load_principal(user_id: int) -> Optional[Principal]:
+    """Lit en base les seules colonnes du principal (appelé en cas d'absence du cache)"""
+    db = SessionLocal()
+    try:
+        row = db.query(
+            User.id, User.role, User.is_active, User.district_id, User.centre_sante_id
+        ).filter(User.id == user_id).first()
+    finally:
+        db.close()
+    return Principal.from_user(row) if row else None
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Récupère l'utilisateur actuel depuis le token JWT.
+
+    Le principal est mis en cache (TTL) : une requête authentifiée ne touche
+    la base que si le cache est vide, expiré ou invalidé pour cet utilisateur.
+    Dans une sous-requête de POST /batch, le principal du lot est repris tel quel.
+    """
+    principal = principal_lot.get()
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Impossible de valider les identifiants",
@@ -39,22 +95,25 @@ def get_current_user(
             settings.SECRET_KEY, 
             algorithms=[settings.ALGORITHM]
         )
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
+    # Version prise avant la lecture : un invalidate concurrent écarte le résultat
+    cle = principal_cache.key(user_id)
+    principal = principal_cache.get(cle)
+    if principal is None:
+        principal = await run_in_threadpool(load_principal, user_id)
+        if principal is None:
+            raise credentials_exception
+        principal_cache.set(cle, principal)
     
-    return user
+    return principal
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_active_user(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Vérifie que l'utilisateur est actif"""
     if not current_user.is_active:
         raise HTTPException(
@@ -64,9 +123,9 @@ def get_current_active_user(
     return current_user
 
 
-def get_current_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+async def get_current_admin(
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """Vérifie que l'utilisateur est administrateur"""
     if current_user.role != UserRole.ADMINISTRATEUR:
         raise HTTPException(
@@ -76,9 +135,9 @@ def get_current_admin(
     return current_user
 
 
-def get_current_epidemiologist(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+async def get_current_epidemiologist(
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """Vérifie que l'utilisateur est épidémiologiste ou admin"""
     if current_user.role not in [UserRole.ADMINISTRATEUR, UserRole.EPIDEMIOLOGISTE]:
         raise HTTPException(
@@ -88,9 +147,9 @@ def get_current_epidemiologist(
     return current_user
 
 
-def get_current_data_entry_agent(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+async def get_current_data_entry_agent(
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """Vérifie que l'utilisateur peut saisir des données"""
     if current_user.role not in [
         UserRole.ADMINISTRATEUR, 
@@ -5,17 +5,22 @@
 
 from typing import List, Optional
 from datetime import date, datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.api.deps import get_db, get_current_active_user
 from app.crud import alerte as crud_alerte
 from app.schemas.alerte import AlerteResponse, AlerteCreate, AlerteUpdate
-from app.models.user import User
+from app.core.principal import Principal
+from app.utils.pagination import decode_cursor, set_next_cursor
+from app.utils.projection import json_response, projection
 from app.models.alerte import Alerte
 from app.models.cas import Cas
+from app.models.cas_daily_agg import AXE_SYMPTOMES, CasDailyAgg
+from app.services.agregat_service import NOMBRE, conditions
 from app.services.ai_service import AIService
+from app.services.doublon_service import DoublonService
 from app.models.intervention import Intervention
 
 router = APIRouter()
@@ -32,7 +37,7 @@ def resolve_alerte(
     alerte_id: int,
     request: ResolveAlerteRequest,  # ✅ Body au lieu de Query
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """✅ Marquer une alerte comme résolue"""
     alerte = crud_alerte.get(db, id=alerte_id)
@@ -60,6 +65,7 @@ def resolve_alerte(
 
 @router.get("", response_model=List[AlerteResponse])
 def read_alertes(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
     statut: Optional[str] = Query(None),
@@ -68,14 +74,20 @@ def read_alertes(
     district_id: Optional[int] = Query(None),
     date_debut: Optional[date] = Query(None),
     date_fin: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None, description="Curseur X-Next-Cursor de la page précédente (remplace skip)"),
+    fields: Optional[str] = Query(None, description="Champs renvoyés, ex. id,niveau_gravite,statut,date_detection"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     📋 Récupérer la liste des alertes avec filtres
+
+    Tri (date_detection DESC, id DESC). Pagination par skip/limit ou par
+    curseur : l'en-tête X-Next-Cursor d'une page pleine se repasse dans `cursor`.
+    Avec `fields`, seules les colonnes demandées sont lues (jointures maladie et
+    district uniquement si demandées).
     """
-    alertes = crud_alerte.get_by_filters(
-        db,
+    filters = dict(
         statut=statut,
         niveau_gravite=niveau_gravite,
         maladie_id=maladie_id,
@@ -83,8 +95,17 @@ def read_alertes(
         date_debut=date_debut,
         date_fin=date_fin,
         skip=skip,
-        limit=limit
+        limit=limit,
+        apres=decode_cursor(cursor) if cursor else None
     )
+    if fields:
+        query, serialiser = projection(Alerte, AlerteResponse, fields, cles=("id", "date_detection"))
+        lignes = crud_alerte.get_rows_by_filters(db, query, **filters)
+        set_next_cursor(response, lignes, limit, "date_detection")
+        return json_response(lignes, serialiser, response)
+
+    alertes = crud_alerte.get_by_filters(db, **filters)
+    set_next_cursor(response, alertes, limit, "date_detection")
     return alertes
 
 # ========================================
@@ -95,7 +116,7 @@ def read_alertes(
 def read_alerte(
     alerte_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """👁️ Récupérer une alerte par ID"""
     alerte = crud_alerte.get(db, id=alerte_id)
@@ -113,7 +134,7 @@ def read_alerte(
 @router.get("/count/active", response_model=dict)
 def count_active_alertes(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🔢 Compter les alertes actives"""
     count = crud_alerte.count_active(db)
@@ -127,7 +148,7 @@ def count_active_alertes(
 def create_alerte(
     alerte_in: AlerteCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """➕ Créer une nouvelle alerte manuelle"""
     
@@ -161,7 +182,7 @@ def update_alerte(
     alerte_id: int,
     alerte_in: AlerteUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """✏️ Mettre à jour une alerte"""
     alerte = crud_alerte.get(db, id=alerte_id)
@@ -190,7 +211,7 @@ def resolve_alerte(
     alerte_id: int,
     actions: str = Query(..., description="Actions entreprises"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """✅ Marquer une alerte comme résolue"""
     alerte = crud_alerte.resolve(
@@ -215,11 +236,13 @@ def resolve_alerte(
 @router.post("/check-thresholds", response_model=List[dict])
 def check_thresholds(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     🔍 Vérifier les seuils et générer des alertes automatiques
     
+    Les cas confirmés comme doublons (file /doublons) sont exclus du comptage.
+
     Règles :
     - critique : cas >= seuil_epidemie
     - alerte : seuil_alerte <= cas < seuil_epidemie  
@@ -233,22 +256,39 @@ def check_thresholds(
     nouvelles_alertes = []
     date_limite = date.today() - timedelta(days=7)
     
-    # Analyser par maladie et district
+    # Analyser par maladie et district (cas_daily_agg, axe date des symptômes)
     stats = db.query(
-        Cas.maladie_id,
-        Cas.district_id,
-        func.count(Cas.id).label('nombre_cas')
+        CasDailyAgg.maladie_id,
+        CasDailyAgg.district_id,
+        NOMBRE.label('nombre_cas')
     ).filter(
-        Cas.date_symptomes >= date_limite,
-        Cas.maladie_id.isnot(None),
-        Cas.district_id.isnot(None)
+        *conditions(AXE_SYMPTOMES, date_debut=date_limite),
+        CasDailyAgg.maladie_id.isnot(None),
+        CasDailyAgg.district_id.isnot(None)
     ).group_by(
-        Cas.maladie_id,
-        Cas.district_id
+        CasDailyAgg.maladie_id,
+        CasDailyAgg.district_id
     ).all()
     
+    # Un cas confirmé comme doublon d'une déclaration antérieure ne compte pas
+    doublons = dict(
+        ((maladie_id, district_id), nombre)
+        for maladie_id, district_id, nombre in db.query(
+            Cas.maladie_id,
+            Cas.district_id,
+            func.count(Cas.id)
+        ).filter(
+            Cas.date_symptomes >= date_limite,
+            Cas.id.in_(DoublonService.cas_doublons_confirmes())
+        ).group_by(
+            Cas.maladie_id,
+            Cas.district_id
+        )
+    )
+    
     for stat in stats:
         maladie_id, district_id, nombre_cas = stat
+        nombre_cas -= doublons.get((maladie_id, district_id), 0)
         
         # Récupérer la maladie avec ses seuils
         maladie = db.query(Maladie).filter(Maladie.id == maladie_id).first()
@@ -367,7 +407,7 @@ def check_thresholds(
 def delete_alerte(
     alerte_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🗑️ Supprimer une alerte"""
     alerte = crud_alerte.get(db, id=alerte_id)
@@ -388,7 +428,7 @@ def delete_alerte(
 async def suggerer_action_ia_pour_alerte(
     alerte_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     🤖 Suggère une action IA pour une alerte active
@@ -7,11 +7,15 @@
 from datetime import timedelta, datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token
-from app.api.deps import get_db
+from app.core.security import (
+    verify_and_update_password_async, get_password_hash_async, create_access_token
+)
+from app.api.deps import get_async_oltp_db
+from app.core.principal import principal_cache
 from app.models.user import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserResponse
@@ -20,7 +24,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_oltp_db)):
     """
     📝 Inscription d'un nouvel utilisateur
     
@@ -28,7 +32,9 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     avec le mot de passe hashé.
     """
     # Vérifier si l'email existe déjà
-    existing_user = db.query(User).filter(User.email == user_in.email).first()
+    existing_user = (await db.execute(
+        select(User.id).where(User.email == user_in.email)
+    )).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,7 +46,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         email=user_in.email,
         nom=user_in.nom,
         prenom=user_in.prenom,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         role=user_in.role,
         district_id=user_in.district_id,
         centre_sante_id=user_in.centre_sante_id,
@@ -48,28 +54,44 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_oltp_db)
 ):
-    """🔐 Connexion"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    """
+    🔐 Connexion
+    
+    bcrypt tourne dans le pool de processus dédié ; si le coût configuré a
+    changé depuis la création du hash, le mot de passe est re-hashé ici.
+    """
+    user = (await db.execute(
+        select(User).where(User.email == form_data.username)
+    )).scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=401, detail="Identifiants incorrects")
+    
+    valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Identifiants incorrects")
     
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Compte désactivé")
     
+    if new_hash:
+        user.hashed_password = new_hash
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    
+    # Nouvelle session : le principal sera relu depuis la base
+    principal_cache.invalidate(user.id)
     
     access_token = create_access_token(data={"sub": str(user.id)})
     
@@ -0,0 +1,153 @@
+"""
+📄 Fichier: app/api/v1/endpoints/batch.py
+📝 Description: Plusieurs requêtes GET de l'API en un seul aller-retour
+🎯 Usage: Chargement du dashboard par le SPA (dashboard, statistiques, alertes)
+
+Les sous-requêtes passent par l'application elle-même (ASGI, dans le
+processus) : routage, validation, contrôles d'accès et gestionnaires
+d'erreurs sont ceux des routes appelées. Le jeton est vérifié une fois pour
+le lot ; ses sous-requêtes reprennent le principal (deps.principal_lot).
+Deux sous-requêtes identiques (même chemin, même query string) ne sont
+exécutées qu'une fois et partagent leur réponse : les référentiels
+(/maladies, /districts...) ne sont lus qu'une fois par lot.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, Request, status
+
+from app.api.deps import get_current_active_user, principal_lot
+from app.core.config import settings
+from app.core.principal import Principal
+from app.schemas.batch import BatchRequest, BatchResponse, SousReponse
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# En-têtes des sous-réponses transmis au client
+EN_TETES_TRANSMIS = (NEXT_CURSOR_HEADER.lower(),)
+# En-têtes de la requête du lot recopiés dans les sous-requêtes
+EN_TETES_COPIES = (b"authorization", b"host", b"accept-language")
+
+
+def _scope(request: Request, url: str) -> Dict:
+    """Scope ASGI d'une sous-requête GET, dérivé de celui du lot"""
+    morceaux = urlsplit(url)
+    chemin = settings.API_V1_STR + morceaux.path
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": chemin,
+        "raw_path": chemin.encode(),
+        "query_string": morceaux.query.encode(),
+        "headers": [
+            (nom, valeur) for nom, valeur in request.scope["headers"] if nom in EN_TETES_COPIES
+        ] + [(b"accept", b"application/json")],
+    }
+    if "state" in request.scope:
+        scope["state"] = dict(request.scope["state"])
+    return scope
+
+
+async def _executer(request: Request, url: str) -> Tuple[int, object, Dict[str, str]]:
+    """Exécute une sous-requête dans l'application : (statut, corps JSON, en-têtes transmis)"""
+    reponse = {"status": None, "headers": {}, "body": bytearray()}
+    termine = asyncio.Event()
+    recue = False
+
+    async def receive():
+        nonlocal recue
+        if not recue:
+            recue = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Corps en streaming : la route écoute une déconnexion jusqu'à la fin de l'envoi
+        await termine.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            reponse["status"] = message["status"]
+            reponse["headers"] = {nom.decode("latin-1").lower(): valeur.decode("latin-1")
+                                  for nom, valeur in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            reponse["body"] += message.get("body", b"")
+
+    try:
+        await request.app(_scope(request, url), receive, send)
+    except Exception:
+        # La réponse 500 a déjà été envoyée par le gestionnaire global, qui relance l'exception
+        if reponse["status"] is None:
+            logger.exception(f"❌ Sous-requête {url} du lot en échec")
+            return status.HTTP_500_INTERNAL_SERVER_ERROR, {"detail": "Une erreur interne est survenue"}, {}
+    finally:
+        termine.set()
+
+    en_tetes = {nom: valeur for nom, valeur in reponse["headers"].items() if nom in EN_TETES_TRANSMIS}
+    if not reponse["body"]:
+        return reponse["status"], None, en_tetes
+    if not reponse["headers"].get("content-type", "").startswith("application/json"):
+        return (
+            status.HTTP_406_NOT_ACCEPTABLE,
+            {"detail": "Réponse non JSON : route non disponible dans un lot"},
+            {}
+        )
+    try:
+        return reponse["status"], json.loads(reponse["body"]), en_tetes
+    except ValueError:
+        # Corps interrompu (erreur pendant un envoi en streaming)
+        logger.error(f"❌ Sous-requête {url} du lot : corps JSON incomplet")
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {"detail": "Une erreur interne est survenue"}, {}
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    lot: BatchRequest,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    📦 Exécuter plusieurs requêtes GET de l'API en un seul appel
+
+    - **requetes**: liste de `{id, url}`, `url` relative à /api/v1
+      (ex: `/dashboard/statistics`, `/statistiques/dashboard?maladie_id=2`)
+
+    Les sous-requêtes s'exécutent en parallèle (au plus BATCH_CONCURRENCE à
+    la fois) ; les réponses sont renvoyées dans l'ordre des requêtes, chacune
+    avec son propre statut HTTP (une erreur n'interrompt pas le lot).
+    """
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCE)
+
+    async def limiter(url: str):
+        async with semaphore:
+            return await _executer(request, url)
+
+    jeton = principal_lot.set(current_user)
+    try:
+        # Une tâche par URL distincte ; les tâches copient le contexte (principal_lot)
+        taches: Dict[str, asyncio.Task] = {}
+        for sous_requete in lot.requetes:
+            if sous_requete.url not in taches:
+                taches[sous_requete.url] = asyncio.create_task(limiter(sous_requete.url))
+        await asyncio.gather(*taches.values())
+    finally:
+        principal_lot.reset(jeton)
+
+    reponses: List[SousReponse] = []
+    for sous_requete in lot.requetes:
+        code, corps, en_tetes = taches[sous_requete.url].result()
+        reponses.append(SousReponse(
+            id=sous_requete.id, url=sous_requete.url, status=code, body=corps, headers=en_tetes
+        ))
+    return BatchResponse(reponses=reponses)
@@ -4,16 +4,31 @@
 🎯 Usage: CRUD des cas de maladies avec filtres avancés
 """
 
-from typing import List, Optional
-from datetime import date, datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, Response, UploadFile, status, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user, get_current_data_entry_agent
+from app.api.deps import get_db, get_db_for, get_async_db, get_current_active_user, get_current_data_entry_agent
+from app.core.config import settings
 from app.crud import cas as crud_cas
-from app.schemas.cas import CasResponse, CasCreate, CasUpdate
-from app.models.user import User
+from app.schemas.cas import (
+    CasResponse, CasCreate, CasUpdate, CasBulkLigne, CasBulkResultat, CasImportResultat,
+    CasRechercheResponse
+)
+from app.core.principal import Principal
 from app.models.cas import Cas
+from app.services.doublon_service import CHAMPS_BLOCAGE, detecter_nouveaux_cas
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER, decode_cursor, decode_rank_cursor, decode_sync_cursor,
+    encode_rank_cursor, encode_sync_cursor, set_next_cursor
+)
+from app.utils.enums import WorkloadClass
+from app.utils.projection import dumps, json_response, projection
 
 router = APIRouter()
 
@@ -23,7 +38,8 @@ router = APIRouter()
 # ========================================
 
 @router.get("", response_model=List[CasResponse])  # ✅ Sans slash
-def read_cas(
+async def read_cas(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
     maladie_id: Optional[int] = Query(None, description="Filtrer par maladie"),
@@ -35,8 +51,10 @@ def read_cas(
     # Filtres par dates de déclaration
     date_declaration_debut: Optional[date] = Query(None, description="Date début déclaration"),
     date_declaration_fin: Optional[date] = Query(None, description="Date fin déclaration"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="Curseur X-Next-Cursor de la page précédente (remplace skip)"),
+    fields: Optional[str] = Query(None, description="Champs renvoyés, ex. id,numero_cas,date_declaration,statut"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     📋 Récupérer la liste des cas avec filtres avancés
@@ -47,10 +65,12 @@ def read_cas(
     - Par statut (suspect, probable, confirme, gueri, decede)
     - Par période d'apparition des symptômes (date_symptomes_debut/fin)
     - Par période de déclaration (date_declaration_debut/fin)
-    - Pagination (skip/limit)
+    - Pagination (skip/limit) ou par curseur : tri (date_declaration DESC, id DESC),
+      l'en-tête X-Next-Cursor d'une page pleine se repasse dans `cursor`
+    - Projection (fields) : seules les colonnes demandées sont lues, les
+      relations maladie/district/centre_sante ne sont jointes que si demandées
     """
-    cas_list = crud_cas.get_by_filters(
-        db,
+    filters = dict(
         maladie_id=maladie_id,
         district_id=district_id,
         statut=statut,
@@ -59,8 +79,17 @@ def read_cas(
         date_declaration_debut=date_declaration_debut,
         date_declaration_fin=date_declaration_fin,
         skip=skip,
-        limit=limit
+        limit=limit,
+        apres=decode_cursor(cursor) if cursor else None
     )
+    if fields:
+        query, serialiser = projection(Cas, CasResponse, fields, cles=("id", "date_declaration"))
+        lignes = await crud_cas.get_rows_by_filters_async(db, query, **filters)
+        set_next_cursor(response, lignes, limit, "date_declaration")
+        return json_response(lignes, serialiser, response)
+
+    cas_list = await crud_cas.get_by_filters_async(db, **filters)
+    set_next_cursor(response, cas_list, limit, "date_declaration")
     return cas_list
 
 
@@ -69,7 +98,7 @@ def read_cas(
 # ========================================
 
 @router.get("/count", response_model=dict)
-def count_cas(
+async def count_cas(
     maladie_id: Optional[int] = Query(None),
     district_id: Optional[int] = Query(None),
     statut: Optional[str] = Query(None),
@@ -77,12 +106,118 @@ def count_cas(
     date_symptomes_fin: Optional[date] = Query(None),
     date_declaration_debut: Optional[date] = Query(None),
     date_declaration_fin: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    exact: bool = Query(False, description="COUNT(*) exact au lieu de l'estimation"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    """🔢 Compter le nombre de cas selon les filtres"""
-    count = crud_cas.count_by_filters(
+    """
+    🔢 Compter le nombre de cas selon les filtres
+
+    Par défaut le nombre est estimé (statistiques du planificateur sans
+    filtre, agrégats journaliers cas_daily_agg avec filtres) ; `exact=true` force
+    un COUNT(*). La réponse indique `exact` et la `source` du nombre.
+    """
+    filters = dict(
+        maladie_id=maladie_id,
+        district_id=district_id,
+        statut=statut,
+        date_symptomes_debut=date_symptomes_debut,
+        date_symptomes_fin=date_symptomes_fin,
+        date_declaration_debut=date_declaration_debut,
+        date_declaration_fin=date_declaration_fin
+    )
+    if exact:
+        count, source = await crud_cas.count_by_filters_async(db, **filters), "exact"
+    else:
+        count, source = await crud_cas.estimate_by_filters_async(db, **filters)
+    return {"count": count, "exact": source == "exact", "source": source}
+
+
+# ========================================
+# 🔄 GET - SYNCHRONISATION DIFFÉRENTIELLE
+# ========================================
+
+# Champs envoyés aux terminaux : colonnes du cas, sans les relations
+# (les référentiels maladies/districts/centres sont déjà sur le terminal)
+CHAMPS_SYNC = ",".join(
+    nom for nom in CasResponse.model_fields if nom not in ("maladie", "district", "centre_sante")
+)
+
+
+@router.get("/changes")
+async def read_cas_changes(
+    since: Optional[str] = Query(None, description="next_cursor de la synchronisation précédente"),
+    limit: int = Query(500, ge=1, le=settings.CAS_SYNC_MAX_LIGNES),
+    fields: Optional[str] = Query(None, description="Champs renvoyés (par défaut toutes les colonnes du cas)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    🔄 Cas créés, modifiés ou supprimés depuis `since` (terminaux des CSB)
+
+    Sans `since` : synchronisation initiale (tous les cas du périmètre, par pages).
+    Réponse : `cas` (créés ou modifiés), `supprimes` (id, numero_cas : cas supprimés ou archivés), `next_cursor`
+    à repasser dans `since`, `has_more` tant qu'il reste des pages.
+
+    Le périmètre est celui de l'utilisateur : son centre de santé, sinon son
+    district, sinon toute la région. La réponse est compressée (gzip) si le
+    client l'accepte.
+    """
+    query, serialiser = projection(Cas, CasResponse, fields or CHAMPS_SYNC)
+    changes = await crud_cas.get_changes_async(
+        db,
+        query,
+        curseur=decode_sync_cursor(since) if since else None,
+        limit=limit,
+        district_id=current_user.district_id,
+        centre_sante_id=current_user.centre_sante_id
+    )
+    return Response(
+        content=dumps({
+            "cas": [serialiser(ligne) for ligne in changes["cas"]],
+            "supprimes": [
+                {"id": ligne.id, "numero_cas": ligne.numero_cas, "supprime_le": ligne.supprime_le}
+                for ligne in changes["supprimes"]
+            ],
+            "next_cursor": encode_sync_cursor(changes["curseur"]),
+            "has_more": changes["suite"],
+        }),
+        media_type="application/json"
+    )
+
+
+# ========================================
+# 🔎 GET - RECHERCHE
+# ========================================
+
+@router.get("/search", response_model=List[CasRechercheResponse])
+async def search_cas(
+    response: Response,
+    q: str = Query(..., min_length=3, max_length=200, description="Nom du patient, fragment de numéro ou texte des observations"),
+    limit: int = Query(50, ge=1, le=200),
+    maladie_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    statut: Optional[str] = Query(None),
+    date_symptomes_debut: Optional[date] = Query(None),
+    date_symptomes_fin: Optional[date] = Query(None),
+    date_declaration_debut: Optional[date] = Query(None),
+    date_declaration_fin: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None, description="Curseur X-Next-Cursor de la page précédente"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    🔎 Rechercher des cas par nom (approché), numéro (fragment) ou observations
+
+    Résultats classés par pertinence (`score`), mêmes filtres que GET /cas.
+    Au moins 3 caractères : en deçà les index trigrammes ne servent plus.
+    Page suivante : repasser l'en-tête X-Next-Cursor dans `cursor`.
+    """
+    resultats = await crud_cas.search_async(
         db,
+        q.strip(),
+        limit=limit,
+        apres=decode_rank_cursor(cursor) if cursor else None,
         maladie_id=maladie_id,
         district_id=district_id,
         statut=statut,
@@ -91,7 +226,13 @@ def count_cas(
         date_declaration_debut=date_declaration_debut,
         date_declaration_fin=date_declaration_fin
     )
-    return {"count": count}
+    if len(resultats) == limit:
+        cas, score = resultats[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_rank_cursor(score, cas.id)
+    return [
+        CasRechercheResponse(**CasResponse.model_validate(cas).model_dump(), score=round(score, 4))
+        for cas, score in resultats
+    ]
 
 
 # ========================================
@@ -102,7 +243,7 @@ def count_cas(
 def read_cas_by_id(
     cas_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """👁️ Récupérer un cas par ID"""
     cas = crud_cas.get(db, id=cas_id)
@@ -121,73 +262,176 @@ def read_cas_by_id(
 @router.post("", response_model=CasResponse, status_code=status.HTTP_201_CREATED)
 def create_cas(
     cas_in: CasCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     ➕ Créer un nouveau cas
     
     Le numéro de cas est généré automatiquement au format:
-    VAKIN-2025-00001
+    VAKIN-2025-00001 (compteur annuel, voir CRUDCas.allouer_numero)
+    La recherche de doublons probables se fait après la réponse.
     """
-    
-    # ========================================
-    # ✅ GÉNÉRATION AUTOMATIQUE DU NUMÉRO (CORRIGÉE)
-    # ========================================
-    annee = datetime.now().year
-    prefix = f"VAKIN-{annee}-"
-    
-    # Chercher le dernier numéro avec ce préfixe
-    dernier_cas = db.query(Cas).filter(
-        Cas.numero_cas.like(f"{prefix}%")
-    ).order_by(Cas.id.desc()).first()
-    
-    if dernier_cas and dernier_cas.numero_cas:
+    cas = crud_cas.create(db, obj_in=cas_in, created_by=current_user.id)
+    background_tasks.add_task(detecter_nouveaux_cas, [cas.id])
+    return cas
+
+
+
+# ========================================
+# 📦 POST - IMPORT EN LOT
+# ========================================
+
+def _lire_lignes(corps: bytes, content_type: str) -> List[Tuple[Optional[Any], Optional[str]]]:
+    """Découpe le corps (tableau JSON ou NDJSON) en (ligne brute, erreur de lecture)"""
+    if "ndjson" in content_type or "jsonl" in content_type:
+        lignes = []
+        for numero, brut in enumerate(corps.splitlines(), start=1):
+            if not brut.strip():
+                continue
+            try:
+                lignes.append((json.loads(brut), None))
+            except ValueError:
+                lignes.append((None, f"ligne {numero}: JSON invalide"))
+        return lignes
+
+    try:
+        donnees = json.loads(corps or b"null")
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Corps JSON invalide")
+    if not isinstance(donnees, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le corps doit être un tableau JSON de cas (ou du NDJSON)"
+        )
+    return [(ligne, None) for ligne in donnees]
+
+
+def _valider_lignes(corps: bytes, content_type: str) -> Tuple[int, Dict[int, CasCreate], Dict[int, List[str]]]:
+    """Lit et valide toutes les lignes du lot : (nombre de lignes, cas valides, erreurs par index)"""
+    lignes = _lire_lignes(corps, content_type)
+    if len(lignes) > settings.BULK_CAS_MAX_LIGNES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Maximum {settings.BULK_CAS_MAX_LIGNES} cas par requête"
+        )
+
+    valides: Dict[int, CasCreate] = {}
+    erreurs: Dict[int, List[str]] = {}
+    for index, (brut, erreur) in enumerate(lignes):
+        if erreur:
+            erreurs[index] = [erreur]
+            continue
         try:
-            # Extraire le numéro de la fin (ex: "VAKIN-2025-00012" -> 12)
-            dernier_num = int(dernier_cas.numero_cas.split('-')[-1])
-            nouveau_num = dernier_num + 1
-        except (ValueError, IndexError):
-            # Si erreur de parsing, on recommence à 1
-            nouveau_num = 1
-    else:
-        # Pas de cas existant, on commence à 1
-        nouveau_num = 1
-    
-    # Générer le numéro au format VAKIN-2025-00001
-    numero_cas = f"{prefix}{nouveau_num:05d}"
-    
-    # ✅ Vérifier que le numéro n'existe pas déjà (sécurité supplémentaire)
-    while db.query(Cas).filter(Cas.numero_cas == numero_cas).first():
-        nouveau_num += 1
-        numero_cas = f"{prefix}{nouveau_num:05d}"
-    
-    # ========================================
-    # 📝 CRÉATION DU CAS
-    # ========================================
-    db_cas = Cas(
-        numero_cas=numero_cas,
-        nom=cas_in.nom,
-        maladie_id=cas_in.maladie_id,
-        centre_sante_id=cas_in.centre_sante_id,
-        district_id=cas_in.district_id,
-        date_symptomes=cas_in.date_symptomes,
-        date_declaration=cas_in.date_declaration,
-        age=cas_in.age,
-        sexe=cas_in.sexe,
-        statut=cas_in.statut,
-        latitude=cas_in.latitude,
-        longitude=cas_in.longitude,
-        observations=cas_in.observations,
-        created_by=current_user.id
+            valides[index] = CasCreate.model_validate(brut)
+        except ValidationError as exc:
+            erreurs[index] = [
+                f"{'.'.join(str(part) for part in e['loc']) or 'ligne'}: {e['msg']}" for e in exc.errors()
+            ]
+    return len(lignes), valides, erreurs
+
+
+@router.post("/bulk", response_model=CasBulkResultat)
+async def create_cas_bulk(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    tout_ou_rien: bool = Query(False, description="N'insérer aucun cas si une ligne est rejetée"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_data_entry_agent)
+):
+    """
+    📦 Créer des cas en lot (listes linéaires hebdomadaires des districts)
+
+    Corps : tableau JSON de cas (format de POST /cas) ou NDJSON
+    (Content-Type: application/x-ndjson), un cas par ligne.
+
+    - Toutes les lignes sont validées avant toute écriture
+    - maladie_id, district_id et centre_sante_id sont contrôlés contre les référentiels
+    - Les numéros sont attribués en un bloc, l'insertion se fait en une transaction
+    - Le rapport contient une entrée par ligne : cree / rejete (avec erreurs) /
+      non_importe (ligne valide écartée par tout_ou_rien)
+    - Les doublons probables des cas créés sont recherchés après la réponse
+    """
+    # Lecture et validation (jusqu'à BULK_CAS_MAX_LIGNES lignes) hors event loop
+    total, valides, erreurs = await run_in_threadpool(
+        _valider_lignes, await request.body(), request.headers.get("content-type", "")
     )
-    
-    db.add(db_cas)
-    db.commit()
-    db.refresh(db_cas)
-    
-    return db_cas
 
+    def enregistrer() -> Dict[int, Tuple[int, str]]:
+        erreurs.update(crud_cas.verifier_references(db, valides))
+        a_creer = [index for index in valides if index not in erreurs]
+        if not a_creer or (tout_ou_rien and erreurs):
+            return {}
+        crees = crud_cas.create_bulk(
+            db, lignes=[valides[index] for index in a_creer], created_by=current_user.id
+        )
+        return dict(zip(a_creer, crees))
+
+    crees = await run_in_threadpool(enregistrer)
+    if crees:
+        background_tasks.add_task(detecter_nouveaux_cas, [cas_id for cas_id, _ in crees.values()])
+
+    rapport = []
+    for index in range(total):
+        if index in crees:
+            cas_id, numero_cas = crees[index]
+            rapport.append(CasBulkLigne(index=index, statut="cree", id=cas_id, numero_cas=numero_cas))
+        elif index in erreurs:
+            rapport.append(CasBulkLigne(index=index, statut="rejete", erreurs=erreurs[index]))
+        else:
+            rapport.append(CasBulkLigne(index=index, statut="non_importe"))
+
+    return CasBulkResultat(total=total, crees=len(crees), rejetes=len(erreurs), lignes=rapport)
+
+
+# ========================================
+# 📥 POST - IMPORT CSV / XLSX
+# ========================================
+
+@router.post("/import", response_model=CasImportResultat)
+def import_cas_fichier(
+    background_tasks: BackgroundTasks,
+    fichier: UploadFile = File(..., description="Fichier CSV (; ou ,) ou XLSX au format de l'export"),
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_data_entry_agent)
+):
+    """
+    📥 Importer des cas depuis un fichier CSV ou XLSX
+
+    Colonnes attendues : celles de /export/cas/excel et /export/cas/csv
+    (N° Cas, Nom Patient, Maladie, District, Centre de Santé, Date Symptômes,
+    Date Déclaration, Âge, Sexe, Statut, Observations), plus Latitude/Longitude
+    facultatives. Maladie, district et centre sont donnés par leur nom (ou code).
+
+    Le fichier est lu en flux et fusionné dans cas en une transaction ; les
+    numéros déjà présents sont ignorés, les lignes sans numéro en reçoivent un.
+    La fusion (jusqu'à IMPORT_CAS_STATEMENT_TIMEOUT_MS) passe par le pool
+    reporting, sur la primaire : elle n'occupe pas les connexions de la saisie.
+    Les doublons probables des cas importés sont recherchés après la réponse.
+    """
+    from app.services.import_service import FichierInvalide, import_service
+
+    nom_fichier = (fichier.filename or "").lower()
+    if nom_fichier.endswith(".xlsx") or "spreadsheetml" in (fichier.content_type or ""):
+        format_fichier = "xlsx"
+    elif nom_fichier.endswith((".csv", ".txt")) or "csv" in (fichier.content_type or ""):
+        format_fichier = "csv"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Format non supporté : CSV ou XLSX attendu"
+        )
+
+    db.use_primary()
+    try:
+        resultat, cas_ids = import_service.import_cas(db, fichier.file, format_fichier, created_by=current_user.id)
+    except FichierInvalide as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if cas_ids:
+        background_tasks.add_task(detecter_nouveaux_cas, cas_ids)
+    return resultat
 
 
 # ========================================
@@ -197,10 +441,16 @@ def create_cas(
 def update_cas(
     cas_id: int,
     cas_in: CasUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_data_entry_agent)
+    current_user: Principal = Depends(get_current_data_entry_agent)
 ):
-    """✏️ Mettre à jour un cas existant"""
+    """
+    ✏️ Mettre à jour un cas existant
+
+    Si le nom, la maladie, le district, la date des symptômes, l'âge ou le
+    sexe changent, les doublons probables sont recherchés après la réponse.
+    """
     
     # Vérifier que le cas existe
     cas = crud_cas.get(db, id=cas_id)
@@ -210,23 +460,10 @@ def update_cas(
             detail="Cas non trouvé"
         )
     
-    # ✅ MISE À JOUR DIRECTE DES CHAMPS
-    update_data = cas_in.dict(exclude_unset=True)
-    
-    # Ne pas permettre de modifier le numéro de cas
-    if 'numero_cas' in update_data:
-        del update_data['numero_cas']
-    
-    # Appliquer les modifications
-    for field, value in update_data.items():
-        setattr(cas, field, value)
-    
-    # Mettre à jour la date de modification
-    cas.updated_at = datetime.now()
-    
-    db.commit()
-    db.refresh(cas)
-    
+    # Champs modifiés (hors numéro de cas) et agrégats journaliers, en une transaction
+    cas = crud_cas.update(db, db_obj=cas, obj_in=cas_in)
+    if CHAMPS_BLOCAGE & cas_in.dict(exclude_unset=True).keys():
+        background_tasks.add_task(detecter_nouveaux_cas, [cas.id])
     return cas
 
 
@@ -238,9 +475,9 @@ def update_cas(
 def delete_cas(
     cas_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_data_entry_agent)
+    current_user: Principal = Depends(get_current_data_entry_agent)
 ):
-    """🗑️ Supprimer un cas définitivement"""
+    """🗑️ Supprimer un cas définitivement (trace conservée pour /cas/changes)"""
     cas = crud_cas.get(db, id=cas_id)
     if not cas:
         raise HTTPException(
@@ -248,5 +485,5 @@ def delete_cas(
             detail="Cas non trouvé"
         )
     
-    crud_cas.remove(db, id=cas_id)
+    crud_cas.remove(db, id=cas_id, supprime_par=current_user.id)
     return None
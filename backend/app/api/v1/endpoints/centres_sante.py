@@ -12,6 +12,7 @@ from app.api.deps import get_db, get_current_active_user, get_current_admin
 from app.crud import centre_sante as crud_centre
 from app.schemas.centre_sante import CentreSanteResponse, CentreSanteCreate, CentreSanteUpdate
 from app.models.user import User
+from app.core.principal import Principal
 from app.models.cas import Cas
 
 router = APIRouter()
@@ -24,7 +25,7 @@ def read_centres_sante(
     active_only: bool = Query(True, description="Afficher uniquement les centres actifs"),  # ✅ AJOUT
     district_id: int = Query(None, description="Filtrer par district"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     🏥 Récupérer la liste des centres de santé
@@ -53,7 +54,7 @@ def read_centres_sante(
 def read_centre_sante(
     centre_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """👁️ Récupérer un centre de santé par ID"""
     centre = crud_centre.get(db, id=centre_id)
@@ -69,7 +70,7 @@ def read_centre_sante(
 def create_centre_sante(
     centre_in: CentreSanteCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """➕ Créer un nouveau centre de santé (Admin uniquement)"""
     centre = crud_centre.create(db, obj_in=centre_in)
@@ -81,7 +82,7 @@ def update_centre_sante(
     centre_id: int,
     centre_in: CentreSanteUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """✏️ Mettre à jour un centre de santé (Admin uniquement)"""
     centre = crud_centre.get(db, id=centre_id)
@@ -99,7 +100,7 @@ def delete_centre_sante(
     centre_id: int,
     force: bool = Query(False, description="Forcer la suppression définitive"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     🗑️ Suppression intelligente d'un centre de santé (Admin uniquement)
@@ -183,7 +184,7 @@ def delete_centre_sante(
 def reactivate_centre_sante(
     centre_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """✅ Réactiver un centre de santé désactivé"""
     centre = crud_centre.get(db, id=centre_id)
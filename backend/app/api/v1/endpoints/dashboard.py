@@ -7,26 +7,32 @@
 from datetime import datetime, timedelta
 from typing import Dict, List
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 
-from app.api.deps import get_db, get_current_active_user
-from app.models.cas import Cas
+from app.api.deps import get_async_db, get_current_active_user
 from app.models.alerte import Alerte
+from app.models.cas_daily_agg import CasDailyAgg
 from app.models.district import District
 from app.models.maladie import Maladie
-from app.utils.enums import AlerteStatut
-from app.models.user import User
+from app.services.agregat_service import NOMBRE, conditions, nombre_si
+from app.utils.enums import AlerteStatut, CasStatut
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/statistics")
-def get_dashboard_statistics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_dashboard_statistics(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict:
-    """📊 Statistiques principales du dashboard"""
+    """
+    📊 Statistiques principales du dashboard
+
+    Deux requêtes : cas par statut avec les fenêtres 24h/7j/30j en
+    SUM ... FILTER sur cas_daily_agg, alertes actives par niveau.
+    """
     now = datetime.now()
     
     # Calcul des périodes
@@ -34,45 +40,36 @@ def get_dashboard_statistics(
     date_7j = now - timedelta(days=7)
     date_30j = now - timedelta(days=30)
     
-    # ✅ CORRECTION : Utiliser date_declaration au lieu de created_at
-    cas_24h = db.query(func.count(Cas.id)).filter(
-        Cas.date_declaration >= date_24h.date(),
-        Cas.date_declaration.isnot(None)
-    ).scalar() or 0
-    
-    cas_7j = db.query(func.count(Cas.id)).filter(
-        Cas.date_declaration >= date_7j.date(),
-        Cas.date_declaration.isnot(None)
-    ).scalar() or 0
-    
-    cas_30j = db.query(func.count(Cas.id)).filter(
-        Cas.date_declaration >= date_30j.date(),
-        Cas.date_declaration.isnot(None)
-    ).scalar() or 0
-    
-    # Total cas
-    total_cas = db.query(func.count(Cas.id)).scalar() or 0
+    # Cas par statut et nouveaux cas (date_declaration), en un seul parcours
+    cas_par_statut = (await db.execute(
+        select(
+            CasDailyAgg.statut,
+            NOMBRE.label('total'),
+            nombre_si(CasDailyAgg.jour >= date_24h.date()).label('cas_24h'),
+            nombre_si(CasDailyAgg.jour >= date_7j.date()).label('cas_7j'),
+            nombre_si(CasDailyAgg.jour >= date_30j.date()).label('cas_30j')
+        ).where(*conditions()).group_by(CasDailyAgg.statut)
+    )).all()
+    
+    total_cas = sum(r.total for r in cas_par_statut)
+    cas_24h = sum(r.cas_24h for r in cas_par_statut)
+    cas_7j = sum(r.cas_7j for r in cas_par_statut)
+    cas_30j = sum(r.cas_30j for r in cas_par_statut)
+    
+    # cas_daily_agg stocke le nom du statut : mêmes clés que l'énumération
+    statuts = {str(CasStatut[r.statut]): r.total for r in cas_par_statut}
     
     # Alertes actives par niveau
-    try:
-        alertes_actives = db.query(
-            Alerte.niveau,
+    alertes_actives = (await db.execute(
+        select(
+            Alerte.niveau_gravite,
             func.count(Alerte.id)
-        ).filter(
-            Alerte.statut.in_([AlerteStatut.ACTIVE, AlerteStatut.EN_COURS])
-        ).group_by(Alerte.niveau).all()
-        
-        alertes_par_niveau = {str(niveau): count for niveau, count in alertes_actives}
-    except:
-        alertes_par_niveau = {}
-    
-    # Cas par statut
-    cas_par_statut = db.query(
-        Cas.statut,
-        func.count(Cas.id)
-    ).group_by(Cas.statut).all()
-    
-    statuts = {str(statut): count for statut, count in cas_par_statut}
+        ).where(
+            Alerte.statut.in_([AlerteStatut.ACTIVE.value, AlerteStatut.EN_COURS.value])
+        ).group_by(Alerte.niveau_gravite)
+    )).all()
+    
+    alertes_par_niveau = {str(niveau): count for niveau, count in alertes_actives}
     
     return {
         "total_cas": total_cas,
@@ -88,30 +85,31 @@ def get_dashboard_statistics(
 
 
 @router.get("/top-districts")
-def get_top_districts(
+async def get_top_districts(
     limit: int = Query(5, ge=1, le=20),
     jours: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> List[Dict]:
     """🏆 Districts avec le plus de cas"""
     date_debut = datetime.now() - timedelta(days=jours)
     
     # ✅ CORRECTION : Utiliser date_declaration
-    results = db.query(
-        District.id,
-        District.nom,
-        func.count(Cas.id).label('nombre_cas')
-    ).join(
-        Cas, Cas.district_id == District.id
-    ).filter(
-        Cas.date_declaration >= date_debut.date(),
-        Cas.date_declaration.isnot(None)
-    ).group_by(
-        District.id, District.nom
-    ).order_by(
-        func.count(Cas.id).desc()
-    ).limit(limit).all()
+    results = (await db.execute(
+        select(
+            District.id,
+            District.nom,
+            NOMBRE.label('nombre_cas')
+        ).join(
+            CasDailyAgg, CasDailyAgg.district_id == District.id
+        ).where(
+            *conditions(date_debut=date_debut.date())
+        ).group_by(
+            District.id, District.nom
+        ).order_by(
+            NOMBRE.desc()
+        ).limit(limit)
+    )).all()
     
     return [
         {
@@ -124,35 +122,26 @@ def get_top_districts(
 
 
 @router.get("/evolution-temporelle")
-def get_evolution_temporelle(
+async def get_evolution_temporelle(
     jours: int = Query(30, ge=7, le=365),
     maladie_id: int = Query(None),
     district_id: int = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> List[Dict]:
     """📈 Évolution du nombre de cas par jour"""
     date_debut = datetime.now() - timedelta(days=jours)
     
-    query = db.query(
-        func.date(Cas.date_declaration).label('date'),
-        func.count(Cas.id).label('nombre_cas')
-    ).filter(
-        Cas.date_declaration >= date_debut.date(),
-        Cas.date_declaration.isnot(None)  # ✅ Important
-    )
-    
-    if maladie_id:
-        query = query.filter(Cas.maladie_id == maladie_id)
+    query = select(
+        CasDailyAgg.jour.label('date'),
+        NOMBRE.label('nombre_cas')
+    ).where(*conditions(
+        maladie_id=maladie_id, district_id=district_id, date_debut=date_debut.date()
+    ))
     
-    if district_id:
-        query = query.filter(Cas.district_id == district_id)
-    
-    results = query.group_by(
-        func.date(Cas.date_declaration)
-    ).order_by(
-        func.date(Cas.date_declaration)
-    ).all()
+    results = (await db.execute(
+        query.group_by(CasDailyAgg.jour).order_by(CasDailyAgg.jour)
+    )).all()
     
     return [
         {
@@ -164,35 +153,33 @@ def get_evolution_temporelle(
 
 
 @router.get("/repartition-maladies")
-def get_repartition_maladies(
+async def get_repartition_maladies(
     jours: int = Query(30, ge=1, le=365),
     district_id: int = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> List[Dict]:
     """🦠 Répartition des cas par maladie avec pourcentages"""
     date_debut = datetime.now() - timedelta(days=jours)
     
     # ✅ CORRECTION : Utiliser date_declaration
-    query = db.query(
+    query = select(
         Maladie.id,
         Maladie.nom,
-        func.count(Cas.id).label('nombre_cas')
+        NOMBRE.label('nombre_cas')
     ).join(
-        Cas, Cas.maladie_id == Maladie.id
-    ).filter(
-        Cas.date_declaration >= date_debut.date(),
-        Cas.date_declaration.isnot(None)
+        CasDailyAgg, CasDailyAgg.maladie_id == Maladie.id
+    ).where(
+        *conditions(district_id=district_id, date_debut=date_debut.date())
     )
     
-    if district_id:
-        query = query.filter(Cas.district_id == district_id)
-    
-    results = query.group_by(
-        Maladie.id, Maladie.nom
-    ).order_by(
-        func.count(Cas.id).desc()
-    ).all()
+    results = (await db.execute(
+        query.group_by(
+            Maladie.id, Maladie.nom
+        ).order_by(
+            NOMBRE.desc()
+        )
+    )).all()
     
     # Calcul du total pour les pourcentages
     total_cas = sum(r.nombre_cas for r in results) or 1
@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_active_user, get_current_admin
 from app.crud import district as crud_district
 from app.schemas.district import DistrictResponse, DistrictCreate, DistrictUpdate
-from app.models.user import User
+from app.core.principal import Principal
 from app.models.centre_sante import CentreSante
 from app.models.cas import Cas
 from app.models.district import District  # ✅ IMPORT du modèle
@@ -25,7 +25,7 @@ def read_districts(
     limit: int = 100,
     active_only: bool = Query(True, description="Afficher uniquement les districts actifs"),  # ✅ AJOUT
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     🗺️ Récupérer la liste des districts
@@ -50,7 +50,7 @@ def read_districts(
 def read_district(
     district_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """👁️ Récupérer un district par ID"""
     district = crud_district.get(db, id=district_id)
@@ -66,7 +66,7 @@ def read_district(
 def create_district(
     district_in: DistrictCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """➕ Créer un nouveau district (Admin uniquement)"""
     district = crud_district.create(db, obj_in=district_in)
@@ -78,7 +78,7 @@ def update_district(
     district_id: int,
     district_in: DistrictUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """✏️ Mettre à jour un district (Admin uniquement)"""
     district = crud_district.get(db, id=district_id)
@@ -96,7 +96,7 @@ def delete_district(
     district_id: int,
     force: bool = Query(False, description="Forcer la suppression définitive"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     🗑️ Suppression intelligente d'un district (Admin uniquement)
@@ -184,7 +184,7 @@ def delete_district(
 def reactivate_district(
     district_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """✅ Réactiver un district désactivé"""
     district = crud_district.get(db, id=district_id)
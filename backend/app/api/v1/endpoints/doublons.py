@@ -0,0 +1,133 @@
+"""
+📄 Fichier: app/api/v1/endpoints/doublons.py
+📝 Description: File de revue des cas probablement déclarés deux fois
+🎯 Usage: Liste des paires détectées, confirmation ou rejet par un agent
+"""
+
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from app.api.deps import get_db, get_current_active_user, get_current_data_entry_agent
+from app.core.principal import Principal
+from app.models.cas import Cas
+from app.models.doublon_cas import DoublonCas
+from app.schemas.doublon import CasDansDoublon, DoublonCasResponse, StatutDoublon
+
+router = APIRouter()
+
+COLONNES_CAS = list(CasDansDoublon.model_fields)
+
+
+def _lister(db: Session, *filtres, skip: int = 0, limit: int = 100) -> List[DoublonCasResponse]:
+    """
+    Paires avec le résumé des deux cas, lus en une requête (double jointure
+    sur cas) ; `filtres` peut porter sur DoublonCas ou sur le cas récent (Cas)
+    """
+    ancien = aliased(Cas)
+    query = (
+        select(
+            DoublonCas,
+            *(getattr(Cas, nom).label(f"cas__{nom}") for nom in COLONNES_CAS),
+            *(getattr(ancien, nom).label(f"doublon_de__{nom}") for nom in COLONNES_CAS),
+            Cas.maladie_id,
+            Cas.district_id,
+        )
+        .join(Cas, Cas.id == DoublonCas.cas_id)
+        .join(ancien, ancien.id == DoublonCas.doublon_de_id)
+        .where(*filtres)
+        .order_by(DoublonCas.score.desc(), DoublonCas.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+    resultats = []
+    for ligne in db.execute(query):
+        valeurs, paire = ligne._mapping, ligne.DoublonCas
+        resultats.append(DoublonCasResponse(
+            id=paire.id,
+            score=paire.score,
+            statut=paire.statut,
+            maladie_id=ligne.maladie_id,
+            district_id=ligne.district_id,
+            detecte_le=paire.detecte_le,
+            traite_par=paire.traite_par,
+            traite_le=paire.traite_le,
+            cas=CasDansDoublon(**{nom: valeurs[f"cas__{nom}"] for nom in COLONNES_CAS}),
+            doublon_de=CasDansDoublon(**{nom: valeurs[f"doublon_de__{nom}"] for nom in COLONNES_CAS}),
+        ))
+    return resultats
+
+
+# ========================================
+# 📋 GET - FILE DE REVUE
+# ========================================
+
+@router.get("", response_model=List[DoublonCasResponse])
+def read_doublons(
+    statut: StatutDoublon = Query("a_verifier", description="a_verifier, confirme ou rejete"),
+    maladie_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, le=500),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    📋 Paires de cas probablement doublons, du score le plus élevé au plus faible
+
+    Un utilisateur rattaché à un district ne voit que les paires de son district.
+    """
+    filtres = [DoublonCas.statut == statut]
+    if maladie_id:
+        filtres.append(Cas.maladie_id == maladie_id)
+    district_id = current_user.district_id or district_id
+    if district_id:
+        filtres.append(Cas.district_id == district_id)
+    return _lister(db, *filtres, skip=skip, limit=limit)
+
+
+# ========================================
+# ✅ POST - CONFIRMER / REJETER
+# ========================================
+
+def _traiter(db: Session, doublon_id: int, statut: StatutDoublon, current_user: Principal) -> DoublonCasResponse:
+    paire = db.get(DoublonCas, doublon_id)
+    if not paire:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paire de doublons non trouvée"
+        )
+    # Un des deux cas a pu quitter cas (suppression, archivage) : la jointure est vide
+    if not _lister(db, DoublonCas.id == doublon_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Un des cas de la paire n'existe plus"
+        )
+    paire.statut = statut
+    paire.traite_par = current_user.id
+    paire.traite_le = datetime.now()
+    db.commit()
+    return _lister(db, DoublonCas.id == doublon_id)[0]
+
+
+@router.post("/{doublon_id}/confirmer", response_model=DoublonCasResponse)
+def confirmer_doublon(
+    doublon_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_data_entry_agent)
+):
+    """✅ Confirmer le doublon : le cas récent n'est plus compté par check-thresholds"""
+    return _traiter(db, doublon_id, "confirme", current_user)
+
+
+@router.post("/{doublon_id}/rejeter", response_model=DoublonCasResponse)
+def rejeter_doublon(
+    doublon_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_data_entry_agent)
+):
+    """❌ Rejeter la paire : deux patients distincts"""
+    return _traiter(db, doublon_id, "rejete", current_user)
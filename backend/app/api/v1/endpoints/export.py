@@ -10,12 +10,15 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
-from app.services.export_service import export_service
-from app.models.user import User
+from app.api.deps import get_db_for, get_current_active_user
+from app.core.principal import Principal
+from app.utils.enums import WorkloadClass
 
 router = APIRouter()
 
+# Le service (pandas/openpyxl) est importé dans chaque endpoint, au premier appel,
+# pour ne pas alourdir le démarrage des workers.
+
 
 @router.get("/cas/excel")
 def export_cas_excel(
@@ -23,10 +26,11 @@ def export_cas_excel(
     date_fin: Optional[date] = Query(None),
     maladie_id: Optional[int] = Query(None),
     district_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """📊 Export des cas en Excel"""
+    from app.services.export_service import export_service
     
     excel_buffer = export_service.export_cas_excel(
         db=db,
@@ -51,10 +55,11 @@ def export_cas_csv(
     date_fin: Optional[date] = Query(None),
     maladie_id: Optional[int] = Query(None),
     district_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """📊 Export des cas en CSV"""
+    from app.services.export_service import export_service
     
     csv_buffer = export_service.export_cas_csv(
         db=db,
@@ -77,10 +82,11 @@ def export_cas_csv(
 def export_alertes_excel(
     date_debut: Optional[date] = Query(None),
     date_fin: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🚨 Export des alertes en Excel"""
+    from app.services.export_service import export_service
     
     excel_buffer = export_service.export_alertes_excel(
         db=db,
@@ -101,10 +107,11 @@ def export_alertes_excel(
 def export_interventions_excel(
     date_debut: Optional[date] = Query(None),
     date_fin: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🎯 Export des interventions en Excel"""
+    from app.services.export_service import export_service
     
     excel_buffer = export_service.export_interventions_excel(
         db=db,
@@ -4,20 +4,22 @@
 🎯 Usage: CRUD des interventions sanitaires (campagnes, formations, etc.)
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user, get_current_epidemiologist
 from app.crud import intervention as crud_intervention
 from app.schemas.intervention import InterventionResponse, InterventionCreate, InterventionUpdate
-from app.models.user import User
+from app.core.principal import Principal
+from app.utils.projection import json_response, projection
 from datetime import timedelta
 from app.services.ai_service import AIService
 from app.models.maladie import Maladie
 from app.models.district import District
 from app.models.cas import Cas
 from app.models.alerte import Alerte
+from app.models.intervention import Intervention
 from pydantic import BaseModel
 import json
 
@@ -28,15 +30,21 @@ router = APIRouter()
 def read_interventions(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Champs renvoyés, ex. id,titre,statut,date_planifiee"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     💼 Récupérer la liste des interventions
     
     Retourne toutes les interventions sanitaires planifiées ou en cours :
     campagnes de vaccination, sensibilisation, distribution de matériel, etc.
+    Avec `fields`, seules les colonnes demandées sont lues.
     """
+    if fields:
+        query, serialiser = projection(Intervention, InterventionResponse, fields)
+        return json_response(crud_intervention.get_multi_rows(db, query, skip=skip, limit=limit), serialiser)
+
     # ✅ CORRIGÉ : Suppression de .intervention
     interventions = crud_intervention.get_multi(db, skip=skip, limit=limit)
     return interventions
@@ -46,7 +54,7 @@ def read_interventions(
 def read_intervention(
     intervention_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     👁️ Récupérer une intervention par ID
@@ -68,7 +76,7 @@ def read_intervention(
 def create_intervention(
     intervention_in: InterventionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_epidemiologist)
+    current_user: Principal = Depends(get_current_epidemiologist)
 ):
     """
     ➕ Créer une nouvelle intervention (Épidémiologiste, Admin)
@@ -94,7 +102,7 @@ def update_intervention(
     intervention_id: int,
     intervention_in: InterventionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_epidemiologist)
+    current_user: Principal = Depends(get_current_epidemiologist)
 ):
     """
     ✏️ Mettre à jour une intervention (Épidémiologiste, Admin)
@@ -123,7 +131,7 @@ def update_intervention(
 def delete_intervention(
     intervention_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_epidemiologist)
+    current_user: Principal = Depends(get_current_epidemiologist)
 ):
     """
     🗑️ Supprimer une intervention (Épidémiologiste, Admin)
@@ -163,7 +171,7 @@ class CreateFromAIRequest(BaseModel):
 async def generer_recommandations_ia(
     request: AIRecommendationRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     🤖 Génère des recommandations d'interventions via IA Groq
@@ -282,7 +290,7 @@ async def generer_recommandations_ia(
 async def creer_intervention_depuis_ia(
     request: CreateFromAIRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_epidemiologist)
+    current_user: Principal = Depends(get_current_epidemiologist)
 ):
     """
     ➕ Créer une intervention depuis une recommandation IA
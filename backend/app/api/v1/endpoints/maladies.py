@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user, get_current_admin
-from app.models.user import User
+from app.core.principal import Principal
 from app.models.cas import Cas
 from app.models.maladie import Maladie
 
@@ -26,7 +26,7 @@ def read_maladies(
     limit: int = Query(100, le=1000),
     active_only: bool = Query(True, description="Afficher uniquement les maladies actives"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     🦠 Récupérer la liste des maladies sous surveillance
@@ -66,7 +66,7 @@ def read_maladies(
 def read_maladie(
     maladie_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     👁️ Récupérer une maladie par ID
@@ -112,7 +112,7 @@ def create_maladie(
     priorite_surveillance: int = 3,
     description: str = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     ➕ Créer une nouvelle maladie (Admin uniquement)
@@ -190,7 +190,7 @@ def update_maladie(
     description: str = None,
     is_active: bool = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     ✏️ Mettre à jour une maladie (Admin uniquement)
@@ -272,7 +272,7 @@ def delete_maladie(
     maladie_id: int,
     force: bool = Query(False, description="Forcer la suppression définitive"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     🗑️ Suppression intelligente d'une maladie (Admin uniquement)
@@ -354,7 +354,7 @@ def delete_maladie(
 def reactivate_maladie(
     maladie_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     ✅ Réactiver une maladie désactivée (Admin uniquement)
@@ -388,7 +388,7 @@ def reactivate_maladie(
 def get_maladie_stats(
     maladie_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     📊 Obtenir les statistiques d'une maladie
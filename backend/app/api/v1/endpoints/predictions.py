@@ -4,16 +4,21 @@
 📝 Description: Endpoints pour les prédictions IA
 """
 
+import logging
 from typing import Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from app.api.deps import get_db, get_current_active_user
-from app.services.prediction_service import prediction_service
-from app.models.user import User
+from app.api.deps import get_db_for, get_current_active_user
+from app.core.principal import Principal
+from app.utils.enums import WorkloadClass
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Le service (pandas/numpy/Prophet) est importé dans chaque endpoint, au premier appel,
+# pour ne pas alourdir le démarrage des workers.
 
 
 class PredictionRequest(BaseModel):
@@ -29,10 +34,11 @@ class PredictionRequest(BaseModel):
 @router.post("/generer", response_model=Dict)
 async def generer_predictions(
     request: PredictionRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🤖 Génère des prédictions avec Prophet"""
+    from app.services.prediction_service import prediction_service
     
     if request.horizon_jours not in [7, 14, 30]:
         raise HTTPException(
@@ -78,11 +84,8 @@ async def generer_predictions(
                 metriques=result["metriques"],
                 created_by=current_user.id
             )
-            print(f"✅ {len(result['predictions'])} prédictions sauvegardées")
-        except Exception as e:
-            print(f"⚠️ Erreur sauvegarde prédiction: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("⚠️ Erreur sauvegarde prédiction")
             # N'interrompt pas le processus même en cas d'erreur
     
     return result
@@ -94,8 +97,8 @@ def get_predictions_historique(
     maladie_id: int = Query(...),
     district_id: Optional[int] = Query(None),
     limit: int = Query(10, le=50),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Récupère l'historique des prédictions"""
     
@@ -10,23 +10,26 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
-from app.services.rapport_service import rapport_service
-from app.services.rapport_ia_service import rapport_ia_service
-from app.models.user import User
+from app.api.deps import get_db_for, get_current_active_user
+from app.core.principal import Principal
+from app.utils.enums import WorkloadClass
 
 router = APIRouter()
 
+# Le service (reportlab) est importé dans chaque endpoint, au premier appel,
+# pour ne pas alourdir le démarrage des workers.
+
 
 @router.get("/hebdomadaire/pdf")
 def rapport_hebdomadaire_pdf(
     date_debut: date = Query(...),
     date_fin: date = Query(...),
     district_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """📊 Rapport hebdomadaire PDF avec analyse IA"""
+    from app.services.rapport_service import rapport_service
     
     pdf_buffer = rapport_service.generate_rapport_hebdomadaire(
         db=db,
@@ -48,10 +51,11 @@ def rapport_hebdomadaire_pdf(
 def rapport_interventions_pdf(
     date_debut: date = Query(...),
     date_fin: date = Query(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🎯 Rapport des interventions avec analyse d'efficacité"""
+    from app.services.rapport_service import rapport_service
     
     pdf_buffer = rapport_service.generate_rapport_interventions(
         db=db,
@@ -72,10 +76,11 @@ def rapport_interventions_pdf(
 def rapport_predictions_pdf(
     maladie_id: int = Query(...),
     district_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """🤖 Rapport de prédictions IA avec analyses"""
+    from app.services.rapport_service import rapport_service
     
     pdf_buffer = rapport_service.generate_rapport_predictions(
         db=db,
@@ -96,10 +101,11 @@ def rapport_predictions_pdf(
 def rapport_global_pdf(
     annee: int = Query(..., ge=2020, le=2030),
     trimestre: Optional[int] = Query(None, ge=1, le=4),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_db_for(WorkloadClass.REPORTING)),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """📈 Rapport global du système avec statistiques complètes"""
+    from app.services.rapport_service import rapport_service
     
     pdf_buffer = rapport_service.generate_rapport_global(
         db=db,
@@ -1,33 +1,34 @@
 # app/api/v1/endpoints/statistiques.py
 from typing import Dict, List, Optional
-from datetime import date
+from datetime import date, datetime, timedelta
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_async_db, get_current_active_user
 from app.services.statistics_service import stats_service
-from app.models.user import User
-from app.models.cas import Cas
-from datetime import date, datetime, timedelta
+from app.core.principal import Principal
+from app.models.cas_daily_agg import CasDailyAgg
 from app.models.district import District
+from app.services.agregat_service import NOMBRE, conditions, nombre_si
+from app.utils.enums import CasStatut
 
 router = APIRouter()
 
 
 @router.get("/taux-incidence")
-def get_taux_incidence(
+async def get_taux_incidence(
     district_id: int = Query(..., description="ID du district (requis)"),
     maladie_id: Optional[int] = Query(None, description="ID de la maladie"),
     date_debut: Optional[date] = Query(None, description="Date de début"),
     date_fin: Optional[date] = Query(None, description="Date de fin"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict:
     """
     Calcul du taux d'incidence pour 100,000 habitants
     """
-    taux = stats_service.calculate_incidence_rate(
+    taux = await stats_service.calculate_incidence_rate(
         db=db,
         district_id=district_id,
         maladie_id=maladie_id,
@@ -46,18 +47,18 @@ def get_taux_incidence(
 
 
 @router.get("/taux-letalite")
-def get_taux_letalite(
+async def get_taux_letalite(
     maladie_id: Optional[int] = Query(None, description="ID de la maladie"),
     district_id: Optional[int] = Query(None, description="ID du district"),
     date_debut: Optional[date] = Query(None, description="Date de début"),
     date_fin: Optional[date] = Query(None, description="Date de fin"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict:
     """
     Calcul du taux de létalité (Case Fatality Rate)
     """
-    taux = stats_service.calculate_case_fatality_rate(
+    taux = await stats_service.calculate_case_fatality_rate(
         db=db,
         maladie_id=maladie_id,
         district_id=district_id,
@@ -76,18 +77,18 @@ def get_taux_letalite(
 
 
 @router.get("/taux-attaque")
-def get_taux_attaque(
+async def get_taux_attaque(
     district_id: int = Query(..., description="ID du district (requis)"),
     maladie_id: int = Query(..., description="ID de la maladie (requis)"),
     date_debut: date = Query(..., description="Date de début de l'épidémie"),
     date_fin: date = Query(..., description="Date de fin de l'épidémie"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict:
     """
     Calcul du taux d'attaque lors d'une épidémie
     """
-    taux = stats_service.calculate_attack_rate(
+    taux = await stats_service.calculate_attack_rate(
         db=db,
         district_id=district_id,
         maladie_id=maladie_id,
@@ -106,17 +107,17 @@ def get_taux_attaque(
 
 
 @router.get("/tendance")
-def get_tendance(
+async def get_tendance(
     maladie_id: Optional[int] = Query(None, description="ID de la maladie"),
     district_id: Optional[int] = Query(None, description="ID du district"),
     jours: int = Query(14, ge=7, le=90, description="Période de comparaison en jours"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict:
     """
     Analyse de la tendance d'évolution (croissance/décroissance)
     """
-    tendance = stats_service.calculate_trend(
+    tendance = await stats_service.calculate_trend(
         db=db,
         maladie_id=maladie_id,
         district_id=district_id,
@@ -127,18 +128,18 @@ def get_tendance(
 
 
 @router.get("/distribution-age", response_model=List[Dict])
-def get_distribution_age(
+async def get_distribution_age(
     maladie_id: Optional[int] = Query(None, description="ID de la maladie"),
     district_id: Optional[int] = Query(None, description="ID du district"),
     date_debut: Optional[date] = Query(None, description="Date de début"),
     date_fin: Optional[date] = Query(None, description="Date de fin"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Répartition des cas par tranche d'âge
     """
-    distribution = stats_service.get_age_distribution(
+    distribution = await stats_service.get_age_distribution(
         db=db,
         maladie_id=maladie_id,
         district_id=district_id,
@@ -150,16 +151,16 @@ def get_distribution_age(
 
 
 @router.get("/resume-hebdomadaire", response_model=List[Dict])
-def get_resume_hebdomadaire(
+async def get_resume_hebdomadaire(
     maladie_id: Optional[int] = Query(None, description="ID de la maladie"),
     semaines: int = Query(12, ge=4, le=52, description="Nombre de semaines"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Résumé hebdomadaire des cas
     """
-    resume = stats_service.get_weekly_summary(
+    resume = await stats_service.get_weekly_summary(
         db=db,
         maladie_id=maladie_id,
         semaines=semaines
@@ -172,100 +173,89 @@ def get_resume_hebdomadaire(
 # ========================================
 
 @router.get("/dashboard")
-def get_dashboard_stats(
+async def get_dashboard_stats(
     maladie_id: Optional[int] = Query(None, description="ID de la maladie"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Dict:
     """
     Statistiques complètes pour le dashboard
     Peut être filtré par maladie_id
+
+    Trois requêtes sur cas_daily_agg : compteurs par statut (fenêtres de 7
+    jours en SUM ... FILTER), répartition par district avec son nom, série
+    des 30 derniers jours.
     """
+    aujourd_hui = datetime.now().date()
+    date_7j = aujourd_hui - timedelta(days=7)
+    date_14j = aujourd_hui - timedelta(days=14)
+    date_30j = aujourd_hui - timedelta(days=30)
+    filtres = conditions(maladie_id=maladie_id)
     
-    # Query de base
-    query = db.query(Cas)
-    if maladie_id:
-        query = query.filter(Cas.maladie_id == maladie_id)
-    
-    # Total cas
-    total_cas = query.count()
+    # Compteurs par statut : total, 7 derniers jours, 7 jours précédents
+    par_statut = (await db.execute(
+        select(
+            CasDailyAgg.statut,
+            NOMBRE.label('count'),
+            nombre_si(CasDailyAgg.jour >= date_7j).label('sept_jours'),
+            nombre_si(CasDailyAgg.jour >= date_14j, CasDailyAgg.jour < date_7j).label('precedents')
+        ).where(*filtres).group_by(CasDailyAgg.statut)
+    )).all()
     
-    # ✅ CORRECTION: Utiliser les valeurs MAJUSCULES ou minuscules selon votre BD
-    # Si votre enum PostgreSQL est en MAJUSCULES, gardez comme ça
-    # Si c'est en minuscules, changez en ['suspect', 'probable', 'confirme']
-    
-    # Vérifier d'abord quelle valeur vous avez dans la BD
-    # Pour l'instant, j'utilise les MAJUSCULES
-    cas_actifs = query.filter(Cas.statut.in_(['SUSPECT', 'PROBABLE', 'CONFIRME'])).count()
-    cas_gueris = query.filter(Cas.statut == 'GUERI').count()
-    cas_decedes = query.filter(Cas.statut == 'DECEDE').count()
+    comptes = {s.statut: s.count for s in par_statut}
+    total_cas = sum(comptes.values())
+    cas_actifs = sum(
+        comptes.get(statut.name, 0) for statut in (CasStatut.SUSPECT, CasStatut.PROBABLE, CasStatut.CONFIRME)
+    )
+    cas_gueris = comptes.get(CasStatut.GUERI.name, 0)
+    cas_decedes = comptes.get(CasStatut.DECEDE.name, 0)
     
     # Taux de guérison et mortalité
     taux_guerison = (cas_gueris / total_cas * 100) if total_cas > 0 else 0
     taux_mortalite = (cas_decedes / total_cas * 100) if total_cas > 0 else 0
     
-    # ✅ CORRECTION: datetime maintenant importé
-    date_7j = datetime.now() - timedelta(days=7)
-    nouveaux_cas_7j = query.filter(Cas.date_declaration >= date_7j).count()
-    
     # Évolution
-    date_14j = datetime.now() - timedelta(days=14)
-    cas_7j_precedents = query.filter(
-        Cas.date_declaration >= date_14j,
-        Cas.date_declaration < date_7j
-    ).count()
+    nouveaux_cas_7j = sum(s.sept_jours for s in par_statut)
+    cas_7j_precedents = sum(s.precedents for s in par_statut)
     
     evolution_7j = 0
     if cas_7j_precedents > 0:
         evolution_7j = ((nouveaux_cas_7j - cas_7j_precedents) / cas_7j_precedents) * 100
     
-    # Répartition par district
-    cas_par_district_raw = db.query(
-        Cas.district_id,
-        func.count(Cas.id).label('count')
-    )
-    if maladie_id:
-        cas_par_district_raw = cas_par_district_raw.filter(Cas.maladie_id == maladie_id)
-    
-    cas_par_district_raw = cas_par_district_raw.group_by(Cas.district_id).all()
-    
-    # Récupérer les noms des districts
-    cas_par_district = []
-    for item in cas_par_district_raw:
-        district = db.query(District).filter(District.id == item.district_id).first()
-        cas_par_district.append({
-            "district": district.nom if district else f"District {item.district_id}",
+    # Répartition par district (nom joint dans la même requête)
+    cas_par_district = [
+        {
+            "district": item.nom or f"District {item.district_id}",
             "count": item.count
-        })
+        }
+        for item in (await db.execute(
+            select(
+                CasDailyAgg.district_id,
+                District.nom,
+                NOMBRE.label('count')
+            ).outerjoin(
+                District, District.id == CasDailyAgg.district_id
+            ).where(*filtres).group_by(CasDailyAgg.district_id, District.nom)
+        )).all()
+    ]
     
     # Répartition par statut
-    cas_par_statut_raw = db.query(
-        Cas.statut,
-        func.count(Cas.id).label('count')
-    )
-    if maladie_id:
-        cas_par_statut_raw = cas_par_statut_raw.filter(Cas.maladie_id == maladie_id)
-    
     cas_par_statut = [
         {"statut": s.statut.lower(), "count": s.count}  # ✅ Convertir en minuscules pour le frontend
-        for s in cas_par_statut_raw.group_by(Cas.statut).all()
+        for s in par_statut
     ]
     
     # Évolution temporelle (30 derniers jours)
-    date_30j = datetime.now() - timedelta(days=30)
-    evolution_temporelle_raw = db.query(
-        func.date(Cas.date_declaration).label('date'),
-        func.count(Cas.id).label('count')
-    ).filter(
-        Cas.date_declaration >= date_30j
-    )
-    
-    if maladie_id:
-        evolution_temporelle_raw = evolution_temporelle_raw.filter(Cas.maladie_id == maladie_id)
-    
     evolution_temporelle = [
         {"date": str(e.date), "count": e.count} 
-        for e in evolution_temporelle_raw.group_by(func.date(Cas.date_declaration)).order_by('date').all()
+        for e in (await db.execute(
+            select(
+                CasDailyAgg.jour.label('date'),
+                NOMBRE.label('count')
+            ).where(
+                *filtres, CasDailyAgg.jour >= date_30j
+            ).group_by(CasDailyAgg.jour).order_by(CasDailyAgg.jour)
+        )).all()
     ]
     
     return {
@@ -7,21 +7,25 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_active_user, get_current_admin
 from app.crud import user as crud_user  # ✅ L'import est correct
 from app.schemas.user import UserResponse, UserCreate, UserUpdate
-from app.models.user import User
+from app.core.principal import Principal, principal_cache
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-def read_user_me(current_user: User = Depends(get_current_active_user)):
+def read_user_me(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
     """Récupérer les informations de l'utilisateur connecté"""
-    return current_user
+    # Le principal ne porte que l'identité : profil complet lu en base
+    return crud_user.get(db, id=current_user.id)
 
 @router.get("/", response_model=List[UserResponse])
 def read_users(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Récupérer la liste des utilisateurs (Admin uniquement)"""
     users = crud_user.get_multi(db, skip=skip, limit=limit)  # ✅ Enlever ".user"
@@ -31,7 +35,7 @@ def read_users(
 def read_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Récupérer un utilisateur par ID (Admin uniquement)"""
     user = crud_user.get(db, id=user_id)  # ✅ Enlever ".user"
@@ -46,7 +50,7 @@ def read_user(
 def create_user(
     user_in: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Créer un nouvel utilisateur (Admin uniquement)"""
     existing_user = crud_user.get_by_email(db, email=user_in.email)  # ✅ Enlever ".user"
@@ -63,7 +67,7 @@ def update_user(
     user_id: int,
     user_in: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Mettre à jour un utilisateur (Admin uniquement)"""
     user = crud_user.get(db, id=user_id)  # ✅ Enlever ".user"
@@ -83,13 +87,14 @@ def update_user(
             )
     
     user = crud_user.update(db, db_obj=user, obj_in=user_in)  # ✅ Enlever ".user"
+    principal_cache.invalidate(user_id)  # rôle, district ou statut ont pu changer
     return user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Supprimer un utilisateur (Admin uniquement)"""
     user = crud_user.get(db, id=user_id)  # ✅ Enlever ".user"
@@ -99,4 +104,5 @@ def delete_user(
             detail="Utilisateur non trouvé"
         )
     crud_user.remove(db, id=user_id)  # ✅ Enlever ".user"
+    principal_cache.invalidate(user_id)
     return None
@@ -14,7 +14,9 @@ from app.api.v1.endpoints import (
     statistiques,
     rapports,
     export,
-    predictions
+    predictions,
+    doublons,
+    batch
 )
 
 api_router = APIRouter()
@@ -59,6 +61,13 @@ api_router.include_router(
     tags=["Cas"]
 )
 
+# Doublons probables (file de revue)
+api_router.include_router(
+    doublons.router,
+    prefix="/doublons",
+    tags=["Doublons"]
+)
+
 # Alertes
 api_router.include_router(
     alertes.router,
@@ -113,4 +122,11 @@ api_router.include_router(
     predictions.router,
     prefix="/predictions",
     tags=["Prédictions IA"]
+)
+
+# Lot de requêtes GET (chargement du SPA en un aller-retour)
+api_router.include_router(
+    batch.router,
+    prefix="/batch",
+    tags=["Batch"]
 )
\ No newline at end of file
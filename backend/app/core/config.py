@@ -6,18 +6,90 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "postgresql://postgres@localhost/sante_db"
+    # URL asyncpg (déduite de DATABASE_URL si absente)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Réplica en lecture (optionnel) : dashboard, statistiques, carto, rapports, exports
+    DATABASE_REPLICA_URL: Optional[str] = None
+    ASYNC_DATABASE_REPLICA_URL: Optional[str] = None
+    # Au-delà de ce retard de réplication, les lectures repassent sur la primaire
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+
+    # Journalisation SQL (désactivée par défaut, très verbeuse)
+    DB_ECHO: bool = False
+
+    # Pool OLTP : saisie des cas, authentification (petit, latence critique)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+
+    # Pool de lecture asynchrone : dashboard, statistiques, cartographie
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 10
+    ASYNC_DB_POOL_TIMEOUT: float = 10.0
+    ASYNC_DB_STATEMENT_TIMEOUT_MS: int = 15000
+
+    # Pool reporting : rapports PDF, exports (borné, requêtes longues)
+    REPORTING_DB_POOL_SIZE: int = 2
+    REPORTING_DB_MAX_OVERFLOW: int = 1
+    REPORTING_DB_POOL_TIMEOUT: float = 30.0
+    REPORTING_DB_STATEMENT_TIMEOUT_MS: int = 120000
     
     # Security
     SECRET_KEY: str = "monsecret123"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Hashing des mots de passe : coût bcrypt (log2 des itérations) et
+    # nombre de processus dédiés
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    # Cache du principal (utilisateur résolu depuis le JWT) par worker.
+    # L'invalidation (désactivation, suppression, changement de rôle) n'agit
+    # que dans le worker qui traite la modification : les autres servent
+    # l'ancien principal jusqu'à l'expiration. Le TTL borne donc la durée
+    # pendant laquelle un compte retiré reste autorisé ; le garder court.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 5
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
 
     DEBUG: bool = True
     
+    # Instrumentation SQL par requête (Server-Timing + détection N+1)
+    SQL_INSTRUMENTATION: bool = True
+    # Avertissement si une même requête SQL est répétée plus de N fois par requête HTTP
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Import en lot des cas (POST /cas/bulk) : nombre maximum de lignes par requête
+    BULK_CAS_MAX_LIGNES: int = 10000
+    # Import de fichiers CSV/XLSX (POST /cas/import) : lignes par COPY, erreurs
+    # détaillées renvoyées au plus, timeout de la transaction d'import
+    IMPORT_CAS_TRANCHE: int = 5000
+    IMPORT_CAS_MAX_ERREURS: int = 1000
+    IMPORT_CAS_STATEMENT_TIMEOUT_MS: int = 300000
+
+    # Synchronisation des terminaux (GET /cas/changes) : taille maximale d'une page
+    CAS_SYNC_MAX_LIGNES: int = 2000
+    # Doublons probables : similarité minimale des noms normalisés (0 à 1)
+    DOUBLONS_SEUIL_SIMILARITE: float = 0.85
+    # Compression gzip des réponses au-delà de cette taille (octets)
+    GZIP_MINIMUM_SIZE: int = 1000
+    # Partitions annuelles de cas : années créées à l'avance au démarrage
+    CAS_PARTITIONS_AVANCE: int = 1
+    # Archives Parquet des cas clôturés (gueri, decede) : répertoire, ancienneté
+    # minimale (date de déclaration) et compression des fichiers
+    CAS_ARCHIVE_DIR: str = "archives/cas"
+    CAS_ARCHIVE_AGE_JOURS: int = 730
+    CAS_ARCHIVE_COMPRESSION: str = "zstd"
+    # POST /batch : sous-requêtes GET par lot et nombre exécutées en même temps
+    # (chacune prend une connexion du pool de sa route)
+    BATCH_MAX_REQUETES: int = 20
+    BATCH_CONCURRENCE: int = 6
+
     # API
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "DRSP Vakinakaratra - Surveillance Épidémiologique"
-    GROQ_API_KEY: str
+    # Clé Groq (optionnelle : sans clé, les endpoints IA renvoient les suggestions de secours)
+    GROQ_API_KEY: Optional[str] = None
     
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173"]
@@ -1,19 +1,165 @@
 # app/core/database.py
+from dataclasses import dataclass
+from typing import Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
 from app.core.config import settings
+from app.core.pool_stats import timed_pool_class
+from app.core.replica import ReplicaLagMonitor, RoutingSession
+from app.utils.enums import WorkloadClass
 
-# Création du moteur PostgreSQL
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=True  # Affiche les requêtes SQL (désactiver en prod)
-)
 
-# Session locale
+# ========================================
+# ⚙️ PROFILS DE POOL
+# ========================================
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Dimensionnement d'un pool de connexions pour une classe de charge"""
+    workload: WorkloadClass
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    statement_timeout_ms: int
+
+    @classmethod
+    def from_settings(cls, workload: WorkloadClass, prefix: str) -> "EngineProfile":
+        return cls(
+            workload=workload,
+            pool_size=getattr(settings, f"{prefix}_POOL_SIZE"),
+            max_overflow=getattr(settings, f"{prefix}_MAX_OVERFLOW"),
+            pool_timeout=getattr(settings, f"{prefix}_POOL_TIMEOUT"),
+            statement_timeout_ms=getattr(settings, f"{prefix}_STATEMENT_TIMEOUT_MS"),
+        )
+
+
+ENGINE_PROFILES: Dict[WorkloadClass, EngineProfile] = {
+    WorkloadClass.OLTP: EngineProfile.from_settings(WorkloadClass.OLTP, "DB"),
+    WorkloadClass.LECTURE: EngineProfile.from_settings(WorkloadClass.LECTURE, "ASYNC_DB"),
+    WorkloadClass.REPORTING: EngineProfile.from_settings(WorkloadClass.REPORTING, "REPORTING_DB"),
+}
+
+
+def build_async_url(url: str) -> str:
+    """Convertit une URL PostgreSQL synchrone en URL asyncpg"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def make_engine(profile: EngineProfile, url: str = None, name: str = None):
+    """Moteur synchrone (psycopg2) dimensionné selon le profil"""
+    return create_engine(
+        url or settings.DATABASE_URL,
+        poolclass=timed_pool_class(QueuePool, name or profile.workload.value),
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_pre_ping=True,
+        echo=settings.DB_ECHO,
+        connect_args={"options": f"-c statement_timeout={profile.statement_timeout_ms}"},
+    )
+
+
+def make_async_engine(profile: EngineProfile, url: str = None, name: str = None):
+    """Moteur asynchrone (asyncpg) dimensionné selon le profil"""
+    return create_async_engine(
+        url or settings.ASYNC_DATABASE_URL or build_async_url(settings.DATABASE_URL),
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool, name or profile.workload.value),
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_pre_ping=True,
+        echo=settings.DB_ECHO,
+        connect_args={"server_settings": {"statement_timeout": str(profile.statement_timeout_ms)}},
+    )
+
+
+# ========================================
+# 🔌 MOTEURS ET SESSIONS
+# ========================================
+
+# OLTP : saisie des cas, authentification
+engine = make_engine(ENGINE_PROFILES[WorkloadClass.OLTP])
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# OLTP asynchrone : connexion et inscription (bcrypt hors event loop), même
+# profil que la saisie (petit pool, timeout court), toujours sur la primaire,
+# jamais en concurrence avec les lectures du dashboard
+oltp_async_engine = make_async_engine(ENGINE_PROFILES[WorkloadClass.OLTP], name="oltp_async")
+AsyncOLTPSessionLocal = async_sessionmaker(
+    bind=oltp_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+# ========================================
+# 🪞 RÉPLICA EN LECTURE (OPTIONNEL)
+# ========================================
+# Les sessions de lecture (reporting, async) routent leurs SELECT vers le réplica
+# tant que son retard reste sous REPLICA_MAX_LAG_SECONDS ; sans réplica configuré,
+# elles utilisent la primaire comme avant.
+
+reporting_engine = make_engine(ENGINE_PROFILES[WorkloadClass.REPORTING])
+async_engine = make_async_engine(ENGINE_PROFILES[WorkloadClass.LECTURE])
+
+replica_reporting_engine = None
+replica_async_engine = None
+replica_monitor = None
+
+if settings.DATABASE_REPLICA_URL:
+    replica_reporting_engine = make_engine(
+        ENGINE_PROFILES[WorkloadClass.REPORTING],
+        url=settings.DATABASE_REPLICA_URL,
+        name="reporting_replica"
+    )
+    replica_async_engine = make_async_engine(
+        ENGINE_PROFILES[WorkloadClass.LECTURE],
+        url=settings.ASYNC_DATABASE_REPLICA_URL or build_async_url(settings.DATABASE_REPLICA_URL),
+        name="lecture_replica"
+    )
+    replica_monitor = ReplicaLagMonitor(
+        replica_reporting_engine,
+        max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+        interval_seconds=settings.REPLICA_LAG_CHECK_INTERVAL
+    )
+
+# Reporting : rapports PDF, exports Excel/CSV, préparation des prédictions
+# (pool borné, ne doit pas affamer l'OLTP)
+ReportingSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    primary_bind=reporting_engine,
+    replica_bind=replica_reporting_engine,
+    monitor=replica_monitor
+)
+
+# Lectures asynchrones : dashboard, statistiques, carto
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    primary_bind=async_engine.sync_engine,
+    replica_bind=replica_async_engine.sync_engine if replica_async_engine else None,
+    monitor=replica_monitor
+)
+
+# Fabriques de sessions synchrones par classe de charge
+SESSION_FACTORIES: Dict[WorkloadClass, sessionmaker] = {
+    WorkloadClass.OLTP: SessionLocal,
+    WorkloadClass.REPORTING: ReportingSessionLocal,
+}
+
 # Base pour les modèles
 Base = declarative_base()
 
@@ -24,4 +170,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
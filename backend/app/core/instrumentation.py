@@ -0,0 +1,147 @@
+# app/core/instrumentation.py
+"""
+📄 Fichier: app/core/instrumentation.py
+📝 Description: Comptage des requêtes SQL par requête HTTP et détection des N+1
+🎯 Usage: Middleware ASGI + écouteurs d'événements SQLAlchemy (tous les moteurs)
+
+Chaque requête HTTP reçoit un en-tête `Server-Timing` (temps SQL, nombre de
+requêtes, temps total) et un avertissement est journalisé quand une même forme
+de requête SQL est exécutée plus de N fois pendant la même requête HTTP.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class SQLStats:
+    """Statistiques SQL accumulées pendant une requête HTTP (ou un bloc capture_sql)"""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        # Le texte compilé contient des paramètres nommés, pas les valeurs :
+        # deux exécutions d'une même requête ORM ont la même forme
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Formes exécutées plus de `threshold` fois"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current_stats: ContextVar[Optional[SQLStats]] = ContextVar("sql_stats", default=None)
+
+
+# ========================================
+# 🎣 ÉCOUTEURS SQLALCHEMY
+# ========================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+_installed = False
+
+
+def install_sql_listeners():
+    """Écoute tous les moteurs (OLTP, reporting, async, réplicas) au niveau de la classe Engine"""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+@contextmanager
+def capture_sql() -> Iterator[SQLStats]:
+    """Capture les requêtes SQL d'un bloc de code (scripts, benchmarks)"""
+    install_sql_listeners()
+    stats = SQLStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# ========================================
+# 🧩 MIDDLEWARE ASGI
+# ========================================
+
+class SQLInstrumentationMiddleware:
+    """
+    Middleware ASGI pur (pas de BaseHTTPMiddleware : aucun buffering de la
+    réponse, compatible StreamingResponse).
+
+    Les requêtes exécutées après l'envoi des en-têtes (corps en streaming)
+    ne figurent pas dans Server-Timing mais comptent pour la détection N+1.
+    """
+
+    def __init__(self, app, repeat_threshold: int = 10):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        install_sql_listeners()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = SQLStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                value = (
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} requetes SQL", '
+                    f"app;dur={total_ms:.1f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", value.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            for shape, n in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    f"⚠️ N+1 probable sur {scope.get('method')} {scope.get('path')}: "
+                    f"{n} exécutions de « {' '.join(shape.split())[:200]} »"
+                )
@@ -0,0 +1,175 @@
+# app/core/metrics.py
+"""
+📄 Fichier: app/core/metrics.py
+📝 Description: Métriques Prometheus de l'API (exposées sur /metrics)
+🎯 Usage: Latence par route, pools de connexions, Prophet, Groq, génération PDF/Excel
+
+Avec plusieurs workers uvicorn, définir PROMETHEUS_MULTIPROC_DIR (répertoire
+vide, propre à l'instance) pour agréger les histogrammes de tous les workers.
+"""
+
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.core.pool_stats import POOL_STATS
+
+
+# ========================================
+# 📊 DÉFINITION DES MÉTRIQUES
+# ========================================
+
+HTTP_REQUEST_DURATION = Histogram(
+    "drsp_http_request_duration_seconds",
+    "Durée des requêtes HTTP par route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+PROPHET_FIT_DURATION = Histogram(
+    "drsp_prophet_fit_seconds",
+    "Durée d'entraînement d'un modèle Prophet",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+
+GROQ_REQUEST_DURATION = Histogram(
+    "drsp_groq_request_duration_seconds",
+    "Latence des appels à l'API Groq",
+    ["model", "status"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+
+GROQ_TOKENS = Counter(
+    "drsp_groq_tokens_total",
+    "Tokens consommés sur l'API Groq",
+    ["model", "kind"],
+)
+
+DOCUMENT_GENERATION_DURATION = Histogram(
+    "drsp_document_generation_seconds",
+    "Durée de génération des rapports et exports",
+    ["format", "document"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+
+# ========================================
+# 🔌 POOLS DE CONNEXIONS
+# ========================================
+
+class PoolStatsCollector:
+    """Expose les compteurs de app/core/pool_stats.py à chaque collecte"""
+
+    def collect(self):
+        checkouts = CounterMetricFamily(
+            "drsp_db_pool_checkouts", "Connexions obtenues du pool", labels=["pool"])
+        timeouts = CounterMetricFamily(
+            "drsp_db_pool_checkout_timeouts", "Attentes de connexion expirées", labels=["pool"])
+        wait = CounterMetricFamily(
+            "drsp_db_pool_wait_seconds", "Temps cumulé d'attente d'une connexion", labels=["pool"])
+        wait_max = GaugeMetricFamily(
+            "drsp_db_pool_wait_max_seconds", "Attente maximale observée", labels=["pool"])
+        size = GaugeMetricFamily(
+            "drsp_db_pool_size", "Taille configurée du pool", labels=["pool"])
+        in_use = GaugeMetricFamily(
+            "drsp_db_pool_checked_out", "Connexions en cours d'utilisation", labels=["pool"])
+        overflow = GaugeMetricFamily(
+            "drsp_db_pool_overflow", "Connexions en dépassement (overflow)", labels=["pool"])
+
+        for name, stats in POOL_STATS.items():
+            checkouts.add_metric([name], stats.checkouts)
+            timeouts.add_metric([name], stats.timeouts)
+            wait.add_metric([name], stats.total_wait)
+            wait_max.add_metric([name], stats.max_wait)
+            pool = stats.pool
+            if pool is not None and hasattr(pool, "checkedout"):
+                size.add_metric([name], pool.size())
+                in_use.add_metric([name], pool.checkedout())
+                overflow.add_metric([name], max(pool.overflow(), 0))
+
+        yield from (checkouts, timeouts, wait, wait_max, size, in_use, overflow)
+
+
+REGISTRY.register(PoolStatsCollector())
+
+
+# ========================================
+# ⏱️ AIDES DE MESURE
+# ========================================
+
+@contextmanager
+def observe(histogram: Histogram, **labels) -> Iterator[None]:
+    """Chronomètre un bloc et l'enregistre dans l'histogramme"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        target = histogram.labels(**labels) if labels else histogram
+        target.observe(time.perf_counter() - start)
+
+
+def timed_document(format: str, document: str):
+    """Décorateur : durée de génération d'un rapport ou d'un export"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe(DOCUMENT_GENERATION_DURATION, format=format, document=document):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> tuple:
+    """Corps et content-type de la réponse /metrics"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(PoolStatsCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# ========================================
+# 🧩 MIDDLEWARE ASGI
+# ========================================
+
+class MetricsMiddleware:
+    """
+    Latence par route : le libellé est le gabarit de la route
+    (`/api/v1/cas/{cas_id}`), pas le chemin réel, pour borner la cardinalité.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "non_route"),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
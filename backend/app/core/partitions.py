@@ -0,0 +1,116 @@
+# app/core/partitions.py
+"""
+📄 Fichier: app/core/partitions.py
+📝 Description: Partitions annuelles de la table cas (RANGE sur date_declaration)
+🎯 Usage: scripts.init_db et tâche annuelle (année courante + CAS_PARTITIONS_AVANCE) :
+          python -m scripts.partitions_cas courantes ; à l'import des cas
+
+Une partition par année, cas_AAAA, plus cas_defaut (DEFAULT) qui reçoit les
+dates sans partition : une insertion n'échoue jamais. Quand l'année d'une
+ligne de cas_defaut obtient sa partition, les lignes y sont déplacées.
+Une partition détachée devient une table autonome (archivage, suppression).
+Les créations sont sérialisées par un verrou consultatif : deux processus
+qui créent la même année ne se gênent pas.
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TABLE = "cas"
+PARTITION_DEFAUT = "cas_defaut"
+# Clé du verrou consultatif (transaction) des créations de partitions
+VERROU = "cas.partitions"
+
+
+def nom_partition(annee: int) -> str:
+    return f"{TABLE}_{annee}"
+
+
+def est_partitionnee(conn: Connection) -> bool:
+    """cas est-elle une table partitionnée (migration appliquée) ?"""
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"), {"table": TABLE}
+    ).scalar() or False
+
+
+def partitions(conn: Connection) -> List[dict]:
+    """Partitions attachées : nom, bornes (expression PostgreSQL), nombre de lignes estimé"""
+    return [dict(ligne) for ligne in conn.execute(text("""
+        SELECT c.relname AS nom, pg_get_expr(c.relpartbound, c.oid) AS bornes,
+               c.reltuples::bigint AS lignes_estimees
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+        ORDER BY c.relname
+    """), {"table": TABLE}).mappings()]
+
+
+def creer_partition(conn: Connection, annee: int) -> bool:
+    """
+    Crée cas_AAAA si elle n'existe pas ; les lignes de l'année déjà tombées
+    dans cas_defaut y sont déplacées avant l'attachement. Renvoie True si créée.
+    """
+    nom = nom_partition(annee)
+    existe = text("SELECT to_regclass(:nom) IS NOT NULL")
+    if conn.execute(existe, {"nom": nom}).scalar():
+        return False
+    # Nouvelle vérification sous verrou : un autre processus a pu la créer entre-temps
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:cle))"), {"cle": VERROU})
+    if conn.execute(existe, {"nom": nom}).scalar():
+        return False
+
+    bornes = {"debut": date(annee, 1, 1), "fin": date(annee + 1, 1, 1)}
+    defaut = conn.execute(text("SELECT to_regclass(:nom) IS NOT NULL"), {"nom": PARTITION_DEFAUT}).scalar()
+    if defaut:
+        # Aucune insertion dans cas_defaut entre le déplacement et l'attachement
+        conn.execute(text(f"LOCK TABLE {PARTITION_DEFAUT} IN ACCESS EXCLUSIVE MODE"))
+    conn.execute(text(f"CREATE TABLE {nom} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    if defaut:
+        deplaces = conn.execute(text(f"""
+            WITH deplaces AS (
+                DELETE FROM {PARTITION_DEFAUT}
+                WHERE date_declaration >= :debut AND date_declaration < :fin
+                RETURNING *
+            )
+            INSERT INTO {nom} SELECT * FROM deplaces
+        """), bornes).rowcount
+        if deplaces:
+            logger.info(f"🗂️ {deplaces} cas déplacés de {PARTITION_DEFAUT} vers {nom}")
+    # Les index de cas sont créés sur la partition à l'attachement
+    conn.execute(text(
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {nom} FOR VALUES FROM ('{bornes['debut']}') TO ('{bornes['fin']}')"
+    ))
+    logger.info(f"🗂️ Partition {nom} créée")
+    return True
+
+
+def assurer_partitions(conn: Connection, annees: Iterable[int]) -> List[str]:
+    """Crée les partitions manquantes des années données ; renvoie celles créées"""
+    return [nom_partition(annee) for annee in sorted(set(annees)) if creer_partition(conn, annee)]
+
+
+def assurer_partitions_courantes(conn: Connection, aujourd_hui: Optional[date] = None) -> List[str]:
+    """Année courante et CAS_PARTITIONS_AVANCE années suivantes (init_db, tâche annuelle)"""
+    if not est_partitionnee(conn):
+        return []
+    annee = (aujourd_hui or date.today()).year
+    return assurer_partitions(conn, range(annee, annee + settings.CAS_PARTITIONS_AVANCE + 1))
+
+
+def detacher_partition(conn: Connection, annee: int) -> str:
+    """
+    Détache cas_AAAA : la table reste en base, hors de cas (plus lue par les
+    requêtes), prête à être archivée puis supprimée
+    """
+    nom = nom_partition(annee)
+    conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {nom}"))
+    logger.info(f"🗂️ Partition {nom} détachée")
+    return nom
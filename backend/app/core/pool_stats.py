@@ -0,0 +1,93 @@
+# app/core/pool_stats.py
+"""
+📄 Fichier: app/core/pool_stats.py
+📝 Description: Mesure des temps d'attente des pools de connexions
+🎯 Usage: Classes de pool instrumentées + instantané exposé par /health/db
+"""
+
+import threading
+import time
+from typing import Dict, Type
+
+from sqlalchemy.pool import Pool
+
+
+class PoolStats:
+    """Compteurs d'attente d'un pool (thread-safe)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.pool: Pool = None
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.total_wait * 1000, 2),
+                "wait_max_ms": round(self.max_wait * 1000, 2),
+                "wait_moyen_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            }
+        pool = self.pool
+        if pool is not None and hasattr(pool, "checkedout"):
+            data.update({
+                "taille": pool.size(),
+                "en_cours": pool.checkedout(),
+                "disponibles": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return data
+
+
+# Registre global : nom du profil -> statistiques
+POOL_STATS: Dict[str, PoolStats] = {}
+
+
+def timed_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    Crée une sous-classe de `base` qui chronomètre l'attente d'une connexion.
+
+    Les statistiques sont portées par la classe pour survivre à
+    `pool.recreate()` (appelé par `engine.dispose()`).
+    """
+    stats = POOL_STATS.setdefault(name, PoolStats(name))
+
+    def __init__(self, *args, **kwargs):
+        base.__init__(self, *args, **kwargs)
+        stats.pool = self
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except Exception:
+            stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        stats.record(time.perf_counter() - start)
+        return connection
+
+    return type(f"Timed{base.__name__}", (base,), {
+        "__init__": __init__,
+        "_do_get": _do_get,
+        "stats": stats,
+    })
+
+
+def pools_snapshot() -> Dict[str, Dict]:
+    """Instantané de tous les pools enregistrés"""
+    return {name: stats.snapshot() for name, stats in POOL_STATS.items()}
@@ -0,0 +1,81 @@
+# app/core/principal.py
+"""
+📄 Fichier: app/core/principal.py
+📝 Description: Identité résolue de l'utilisateur authentifié (principal) et son cache
+🎯 Usage: get_current_user renvoie un Principal sans requête SQL tant que le cache est valide
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.enums import UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Ce dont les contrôles d'accès ont besoin, sans l'objet ORM User"""
+    id: int
+    role: UserRole
+    is_active: bool
+    district_id: Optional[int] = None
+    centre_sante_id: Optional[int] = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=bool(user.is_active),
+            district_id=user.district_id,
+            centre_sante_id=user.centre_sante_id,
+        )
+
+
+class PrincipalCache:
+    """
+    Cache TTL des principals, indexé par (sujet du token, version de l'utilisateur).
+
+    `invalidate` incrémente la version : les entrées précédentes deviennent
+    inaccessibles immédiatement dans ce processus. Les versions ne sont pas
+    partagées entre workers : ailleurs, l'entrée expire au plus tard après
+    PRINCIPAL_CACHE_TTL_SECONDS (quelques secondes), seule borne d'un
+    changement de rôle ou d'une désactivation.
+
+    La clé est prise avant la lecture en base et passée à `set` : un
+    chargement commencé avant un `invalidate` n'est pas mis en cache.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int):
+        self._cache = TTLCache(ttl_seconds, maxsize)
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def key(self, user_id: int) -> Tuple[int, int]:
+        return user_id, self._versions.get(user_id, 0)
+
+    def get(self, key: Tuple[int, int]) -> Optional[Principal]:
+        return self._cache.get(key)
+
+    def set(self, key: Tuple[int, int], principal: Principal):
+        """Stocke le principal lu sous `key`, sauf si la version a changé depuis"""
+        with self._lock:
+            if self.key(key[0]) == key:
+                self._cache.set(key, principal)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            old_key = self.key(user_id)
+            self._versions[user_id] = old_key[1] + 1
+        self._cache.pop(old_key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE
+)
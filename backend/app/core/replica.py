@@ -0,0 +1,136 @@
+# app/core/replica.py
+"""
+📄 Fichier: app/core/replica.py
+📝 Description: Routage lecture/écriture entre la base primaire et le réplica
+🎯 Usage: RoutingSession (SELECT -> réplica, écritures -> primaire) + surveillance du retard
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+# Retard de réplication en secondes (0 si le réplica a rejoué tout le WAL reçu)
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaLagMonitor:
+    """
+    Mesure périodique du retard du réplica (thread d'arrière-plan).
+
+    Le routage ne lit que la dernière mesure : aucune requête de contrôle
+    n'est faite sur le chemin d'une requête HTTP.
+    """
+
+    def __init__(self, engine: Engine, max_lag_seconds: float, interval_seconds: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.interval_seconds = interval_seconds
+        self.lag_seconds: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> Optional[float]:
+        """Mesure le retard maintenant (None si le réplica est injoignable)"""
+        try:
+            with self.engine.connect() as conn:
+                self.lag_seconds = float(conn.execute(LAG_QUERY).scalar() or 0)
+        except Exception as exc:
+            if self.lag_seconds is not None:
+                logger.warning(f"⚠️ Réplica injoignable, bascule sur la primaire: {exc}")
+            self.lag_seconds = None
+        return self.lag_seconds
+
+    @property
+    def healthy(self) -> bool:
+        """Réplica utilisable : mesure connue et retard sous le seuil"""
+        lag = self.lag_seconds
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def _run(self):
+        while not self._stop.is_set():
+            was_healthy = self.healthy
+            self.check()
+            if was_healthy and not self.healthy:
+                logger.warning(
+                    f"⚠️ Retard réplica {self.lag_seconds}s > {self.max_lag_seconds}s : lectures sur la primaire"
+                )
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-lag-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def snapshot(self) -> dict:
+        return {
+            "retard_secondes": self.lag_seconds,
+            "seuil_secondes": self.max_lag_seconds,
+            "utilise": self.healthy,
+        }
+
+
+class RoutingSession(Session):
+    """
+    Session qui envoie les SELECT au réplica et tout le reste à la primaire.
+
+    Dès qu'une session a écrit (flush, INSERT/UPDATE/DELETE, SQL brut), elle
+    reste collée à la primaire jusqu'à sa fermeture : les lectures qui suivent
+    une écriture voient donc leurs propres modifications.
+    """
+
+    def __init__(
+        self,
+        *args,
+        primary_bind: Engine = None,
+        replica_bind: Optional[Engine] = None,
+        monitor: Optional[ReplicaLagMonitor] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.primary_bind = primary_bind
+        self.replica_bind = replica_bind
+        self.monitor = monitor
+        self.sticky_primary = False
+
+    def use_primary(self) -> "RoutingSession":
+        """Force la primaire pour le reste de la session (lecture après écriture)"""
+        self.sticky_primary = True
+        return self
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.sticky_primary or self.replica_bind is None:
+            return self.primary_bind
+
+        if self._flushing or not getattr(clause, "is_select", False):
+            self.sticky_primary = True
+            return self.primary_bind
+
+        if self.monitor is not None and not self.monitor.healthy:
+            return self.primary_bind
+
+        return self.replica_bind
+
+    def close(self):
+        super().close()
+        self.sticky_primary = False
@@ -1,12 +1,25 @@
 # app/core/security.py
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Configuration du hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuration du hashing (un coût différent de BCRYPT_ROUNDS déclenche un rehash au login)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# Pool de processus dédié à bcrypt : le coût CPU reste borné à
+# PASSWORD_HASH_WORKERS cœurs et n'entre pas en concurrence avec l'event loop
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -19,6 +32,52 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Vérifie le mot de passe ; renvoie aussi un nouveau hash si le coût a changé"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    """
+    Pool créé au premier usage, dans le worker (jamais hérité d'un fork).
+    Processus lancés par forkserver : un fork du worker copierait l'état des
+    threads en cours (surveillance du réplica, pools de connexions).
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("forkserver")
+                )
+    return _hash_executor
+
+
+def shutdown_hash_executor():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Version non bloquante de verify_and_update_password (pool de processus)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_hash_executor(), verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Version non bloquante de get_password_hash (pool de processus)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_executor(), get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crée un token JWT"""
     to_encode = data.copy()
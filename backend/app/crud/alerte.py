@@ -1,16 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.engine import Row
 from app.crud.base import CRUDBase
 from app.models.alerte import Alerte
 from app.schemas.alerte import AlerteCreate, AlerteUpdate
 
 class CRUDAlertes(CRUDBase[Alerte, AlerteCreate, AlerteUpdate]):
     
-    def get_by_filters(
+    def _apply_filters(
         self,
-        db: Session,
+        query,
         *,
         statut: Optional[str] = None,
         niveau_gravite: Optional[str] = None,
@@ -19,11 +20,10 @@ class CRUDAlertes(CRUDBase[Alerte, AlerteCreate, AlerteUpdate]):
         date_debut: Optional[date] = None,
         date_fin: Optional[date] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Alerte]:
-        """Récupérer les alertes avec filtres"""
-        query = db.query(self.model)
-        
+        limit: int = 100,
+        apres: Optional[Tuple[date, int]] = None
+    ):
+        """Filtres et tri (date_detection DESC, id DESC) sur une Query ORM ou un select()"""
         if statut:
             query = query.filter(self.model.statut == statut)
         if niveau_gravite:
@@ -37,7 +37,26 @@ class CRUDAlertes(CRUDBase[Alerte, AlerteCreate, AlerteUpdate]):
         if date_fin:
             query = query.filter(self.model.date_detection <= date_fin)
         
-        return query.order_by(self.model.date_detection.desc()).offset(skip).limit(limit).all()
+        if apres is not None:
+            query = query.filter(tuple_(self.model.date_detection, self.model.id) < tuple_(*apres))
+            skip = 0
+        
+        return query.order_by(
+            self.model.date_detection.desc(), self.model.id.desc()
+        ).offset(skip).limit(limit)
+    
+    def get_by_filters(self, db: Session, **filters) -> List[Alerte]:
+        """
+        Récupérer les alertes avec filtres, triées (date_detection DESC, id DESC)
+
+        `apres` : clé (date_detection, id) de la dernière alerte de la page
+        précédente ; remplace l'OFFSET (pagination par curseur)
+        """
+        return self._apply_filters(db.query(self.model), **filters).all()
+    
+    def get_rows_by_filters(self, db: Session, query, **filters) -> List[Row]:
+        """get_by_filters pour un select() de colonnes (projection ?fields=)"""
+        return db.execute(self._apply_filters(query, **filters)).all()
     
     def count_active(self, db: Session) -> int:
         """Compter les alertes actives"""
@@ -35,6 +35,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """Récupérer plusieurs enregistrements"""
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_multi_rows(self, db: Session, query, *, skip: int = 0, limit: int = 100) -> List[Any]:
+        """get_multi pour un select() de colonnes (projection ?fields=)"""
+        return db.execute(query.offset(skip).limit(limit)).all()
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Créer un nouvel enregistrement"""
         obj_in_data = jsonable_encoder(obj_in)
@@ -1,65 +1,89 @@
 # app/crud/cas.py
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import date, datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func, extract, text
+from sqlalchemy import and_, delete, func, insert, literal_column, or_, text, select, tuple_
+from sqlalchemy.engine import Row
+from app.core.config import settings
 from app.crud.base import CRUDBase
-from app.models.cas import Cas
+from app.models.cas import Cas, OBSERVATIONS_TSVECTOR
+from app.models.cas_supprime import CasSupprime
+from app.models.centre_sante import CentreSante
+from app.models.compteur_cas import PREFIXE_NUMERO
+from app.models.district import District
+from app.models.doublon_cas import DoublonCas
+from app.models.maladie import Maladie
 from app.schemas.cas import CasCreate, CasUpdate
+from app.models.cas_daily_agg import AXE_DECLARATION, AXE_SYMPTOMES
+from app.services.agregat_service import (
+    COLONNES_CAS as COLONNES_AGREGATS, NOMBRE, agregat_service, conditions, instantane
+)
+from app.utils.enums import CasStatut
+from app.utils.pagination import SyncCursor
 
 
 class CRUDCas(CRUDBase[Cas, CasCreate, CasUpdate]):
     """CRUD operations pour les cas"""
     
     # ========================================
-    # ➕ CREATE - AVEC GÉNÉRATION NUMÉRO CORRIGÉE
+    # 🔢 NUMÉROTATION
     # ========================================
-    
-    def create(self, db: Session, *, obj_in: CasCreate, created_by: int) -> Cas:
+
+    @staticmethod
+    def allouer_numeros(db: Session, annee: int, nombre: int, prefixe: str = PREFIXE_NUMERO) -> List[str]:
         """
-        Créer un cas avec numéro auto-généré unique
-        ✅ CORRECTION : Gère correctement les doublons
+        Attribue un bloc de `nombre` numéros PREFIXE-AAAA-NNNNN consécutifs
+
+        Une seule requête dans le cas courant : l'UPDATE avance la ligne
+        (prefixe, annee) de compteurs_cas et renvoie la nouvelle valeur. Le
+        verrou de ligne est tenu jusqu'au commit de la transaction appelante,
+        donc deux créations concurrentes ne peuvent pas obtenir le même numéro.
+        Si la ligne n'existe pas encore, elle est créée après le plus grand
+        numéro déjà présent dans cas pour ce préfixe et cette année.
         """
-        current_year = datetime.now().year
-        
-        # ✅ Trouver le dernier cas de l'année
-        last_cas = db.query(Cas).filter(
-            extract('year', Cas.created_at) == current_year
-        ).order_by(Cas.id.desc()).first()
-        
-        if last_cas and last_cas.numero_cas:
-            # Extraire le dernier numéro (ex: CAS-2025-000007 → 7)
-            try:
-                last_number = int(last_cas.numero_cas.split('-')[-1])
-                next_number = last_number + 1
-            except (ValueError, IndexError):
-                # Si erreur de parsing, compter tous les cas
-                count = db.query(func.count(Cas.id)).filter(
-                    extract('year', Cas.created_at) == current_year
-                ).scalar()
-                next_number = (count or 0) + 1
-        else:
-            # Premier cas de l'année
-            next_number = 1
-        
-        # Générer le numéro
-        numero_cas = f"CAS-{current_year}-{str(next_number).zfill(6)}"
-        
-        # ✅ Vérification de sécurité : Si le numéro existe déjà, incrémenter
-        max_attempts = 100  # Éviter boucle infinie
-        attempts = 0
-        while db.query(Cas).filter(Cas.numero_cas == numero_cas).first() and attempts < max_attempts:
-            next_number += 1
-            numero_cas = f"CAS-{current_year}-{str(next_number).zfill(6)}"
-            attempts += 1
-        
-        if attempts >= max_attempts:
-            raise Exception("Impossible de générer un numéro de cas unique")
+        params = {"prefixe": prefixe, "annee": annee, "nombre": nombre}
+        dernier = db.execute(
+            text("""
+                UPDATE compteurs_cas SET dernier_numero = dernier_numero + :nombre
+                WHERE prefixe = :prefixe AND annee = :annee
+                RETURNING dernier_numero
+            """),
+            params
+        ).scalar()
+        if dernier is None:
+            dernier = db.execute(
+                text("""
+                    INSERT INTO compteurs_cas (prefixe, annee, dernier_numero)
+                    SELECT :prefixe, :annee, coalesce(max(split_part(numero_cas, '-', 3)::int), 0) + :nombre
+                    FROM cas
+                    WHERE numero_cas LIKE :motif AND numero_cas ~ '^[A-Z]+-[0-9]{4}-[0-9]{1,9}$'
+                    ON CONFLICT (prefixe, annee) DO UPDATE
+                    SET dernier_numero = compteurs_cas.dernier_numero + :nombre
+                    RETURNING dernier_numero
+                """),
+                {**params, "motif": f"{prefixe}-{annee}-%"}
+            ).scalar_one()
+        return [f"{prefixe}-{annee}-{numero:05d}" for numero in range(dernier - nombre + 1, dernier + 1)]
+
+    @classmethod
+    def allouer_numero(cls, db: Session, annee: int) -> str:
+        """Attribue le prochain numéro VAKIN-AAAA-NNNNN de l'année"""
+        return cls.allouer_numeros(db, annee, 1)[0]
+
+    # ========================================
+    # ➕ CREATE
+    # ========================================
+    
+    def create(self, db: Session, *, obj_in: CasCreate, created_by: int) -> Cas:
+        """Créer un cas avec numéro auto-généré unique (VAKIN-AAAA-NNNNN)"""
+        numero_cas = self.allouer_numero(db, datetime.now().year)
         
         # Créer le cas
         db_obj = Cas(
             numero_cas=numero_cas,
+            nom=obj_in.nom,
             maladie_id=obj_in.maladie_id,
             centre_sante_id=obj_in.centre_sante_id,
             district_id=obj_in.district_id,
@@ -75,12 +99,114 @@ class CRUDCas(CRUDBase[Cas, CasCreate, CasUpdate]):
         )
         
         db.add(db_obj)
+        db.flush()
+        agregat_service.ajouter(db, [db_obj])
         db.commit()
         db.refresh(db_obj)
         
         # Recharger avec relations
         return self.get(db, id=db_obj.id)
     
+    # ========================================
+    # 📦 CREATE EN LOT
+    # ========================================
+
+    def verifier_references(self, db: Session, lignes: Dict[int, CasCreate]) -> Dict[int, List[str]]:
+        """
+        Contrôle maladie, district et centre de chaque ligne contre les
+        référentiels chargés en trois requêtes ; renvoie les erreurs par ligne
+        """
+        maladies = set(db.scalars(select(Maladie.id)))
+        districts = set(db.scalars(select(District.id)))
+        centres = dict(db.execute(select(CentreSante.id, CentreSante.district_id)).all())
+
+        erreurs: Dict[int, List[str]] = {}
+        for index, ligne in lignes.items():
+            messages = []
+            if ligne.maladie_id not in maladies:
+                messages.append(f"maladie_id: maladie {ligne.maladie_id} inconnue")
+            if ligne.district_id not in districts:
+                messages.append(f"district_id: district {ligne.district_id} inconnu")
+            if ligne.centre_sante_id not in centres:
+                messages.append(f"centre_sante_id: centre {ligne.centre_sante_id} inconnu")
+            elif ligne.district_id in districts and centres[ligne.centre_sante_id] != ligne.district_id:
+                messages.append(
+                    f"centre_sante_id: le centre {ligne.centre_sante_id} "
+                    f"n'appartient pas au district {ligne.district_id}"
+                )
+            if messages:
+                erreurs[index] = messages
+        return erreurs
+
+    def create_bulk(self, db: Session, *, lignes: List[CasCreate], created_by: int) -> List[Tuple[int, str]]:
+        """
+        Insère des cas déjà validés en une transaction
+
+        Les numéros sont attribués en un bloc, l'insertion est un INSERT
+        multi-lignes (insertmanyvalues) ; renvoie (id, numero_cas) dans
+        l'ordre des lignes.
+        """
+        if not lignes:
+            return []
+        numeros = self.allouer_numeros(db, datetime.now().year, len(lignes))
+        valeurs = [
+            {**ligne.model_dump(), "numero_cas": numero, "created_by": created_by}
+            for ligne, numero in zip(lignes, numeros)
+        ]
+        resultat = db.execute(
+            insert(Cas).returning(
+                Cas.id, Cas.numero_cas, *(getattr(Cas, colonne) for colonne in COLONNES_AGREGATS),
+                sort_by_parameter_order=True
+            ),
+            valeurs
+        ).all()
+        agregat_service.ajouter(db, resultat)
+        crees = [(row.id, row.numero_cas) for row in resultat]
+        db.commit()
+        return crees
+
+    # ========================================
+    # ✏️ UPDATE
+    # ========================================
+
+    def update(self, db: Session, *, db_obj: Cas, obj_in: Union[CasUpdate, Dict[str, Any]]) -> Cas:
+        """Modifier un cas (numéro non modifiable) et déplacer ses agrégats journaliers"""
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+        update_data.pop("numero_cas", None)
+
+        avant = instantane(db_obj)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+        db.flush()
+        agregat_service.modifier(db, avant, db_obj)
+
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    # ========================================
+    # 🗑️ DELETE
+    # ========================================
+
+    def remove(self, db: Session, *, id: int, supprime_par: Optional[int] = None) -> Cas:
+        """
+        Supprimer un cas en laissant une trace (cas_supprimes) pour /cas/changes ;
+        ses paires de doublons sont retirées (pas de clé étrangère vers cas partitionnée)
+        """
+        obj = db.get(Cas, id)
+        db.execute(delete(DoublonCas).where(or_(DoublonCas.cas_id == id, DoublonCas.doublon_de_id == id)))
+        agregat_service.retirer(db, [obj])
+        db.add(CasSupprime(
+            id=obj.id,
+            numero_cas=obj.numero_cas,
+            district_id=obj.district_id,
+            centre_sante_id=obj.centre_sante_id,
+            supprime_par=supprime_par
+        ))
+        db.delete(obj)
+        db.commit()
+        return obj
+
     # ========================================
     # 📋 GET
     # ========================================
@@ -108,12 +234,12 @@ class CRUDCas(CRUDBase[Cas, CasCreate, CasUpdate]):
         ).offset(skip).limit(limit).all()
     
     # ========================================
-    # 🔍 GET BY FILTERS
+    # 🔍 FILTRES COMMUNS (sync et async)
     # ========================================
     
-    def get_by_filters(
-        self,
-        db: Session,
+    @staticmethod
+    def _apply_filters(
+        query,
         *,
         maladie_id: Optional[int] = None,
         district_id: Optional[int] = None,
@@ -123,20 +249,9 @@ class CRUDCas(CRUDBase[Cas, CasCreate, CasUpdate]):
         date_declaration_debut: Optional[date] = None,
         date_declaration_fin: Optional[date] = None,
         date_debut: Optional[date] = None,
-        date_fin: Optional[date] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Cas]:
-        """Récupérer les cas avec filtres avancés"""
-        
-        # Base query avec relations
-        query = db.query(Cas).options(
-            joinedload(Cas.maladie),
-            joinedload(Cas.district),
-            joinedload(Cas.centre_sante)
-        )
-        
-        # Filtres
+        date_fin: Optional[date] = None
+    ):
+        """Applique les filtres à une Query ORM ou à un select()"""
         if maladie_id:
             query = query.filter(Cas.maladie_id == maladie_id)
         
@@ -172,66 +287,260 @@ class CRUDCas(CRUDBase[Cas, CasCreate, CasUpdate]):
         if date_decl_fin:
             query = query.filter(Cas.date_declaration <= date_decl_fin)
         
-        # Tri et pagination
-        query = query.order_by(Cas.date_declaration.desc())
-        
-        return query.offset(skip).limit(limit).all()
+        return query
     
     # ========================================
-    # 🔢 COUNT BY FILTERS
+    # 🔍 GET BY FILTERS
     # ========================================
     
-    def count_by_filters(
+    @staticmethod
+    def _paginate(query, *, skip: int, limit: int, apres: Optional[Tuple[date, int]]):
+        """
+        Tri (date_declaration DESC, id DESC) puis OFFSET, ou filtre par clé
+        si `apres` (clé de la dernière ligne de la page précédente) est fourni
+        """
+        if apres is not None:
+            # Borne simple redondante : la comparaison de lignes seule
+            # n'élimine pas les partitions annuelles plus récentes
+            query = query.filter(
+                Cas.date_declaration <= apres[0],
+                tuple_(Cas.date_declaration, Cas.id) < tuple_(*apres)
+            )
+            skip = 0
+        query = query.order_by(Cas.date_declaration.desc(), Cas.id.desc())
+        return query.offset(skip).limit(limit)
+
+    def get_by_filters(
         self,
         db: Session,
         *,
-        maladie_id: Optional[int] = None,
-        district_id: Optional[int] = None,
-        statut: Optional[str] = None,
-        date_symptomes_debut: Optional[date] = None,
-        date_symptomes_fin: Optional[date] = None,
-        date_declaration_debut: Optional[date] = None,
-        date_declaration_fin: Optional[date] = None,
-        date_debut: Optional[date] = None,
-        date_fin: Optional[date] = None
-    ) -> int:
-        """Compter les cas selon les filtres"""
-        
-        query = db.query(func.count(Cas.id))
+        skip: int = 0,
+        limit: int = 100,
+        apres: Optional[Tuple[date, int]] = None,
+        **filters
+    ) -> List[Cas]:
+        """Récupérer les cas avec filtres avancés"""
         
-        if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
+        # Base query avec relations
+        query = db.query(Cas).options(
+            joinedload(Cas.maladie),
+            joinedload(Cas.district),
+            joinedload(Cas.centre_sante)
+        )
+        query = self._apply_filters(query, **filters)
         
-        if district_id:
-            query = query.filter(Cas.district_id == district_id)
+        return self._paginate(query, skip=skip, limit=limit, apres=apres).all()
+    
+    async def get_by_filters_async(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        apres: Optional[Tuple[date, int]] = None,
+        **filters
+    ) -> List[Cas]:
+        """Version asynchrone de get_by_filters"""
+        query = select(Cas).options(
+            joinedload(Cas.maladie),
+            joinedload(Cas.district),
+            joinedload(Cas.centre_sante)
+        )
+        query = self._apply_filters(query, **filters)
+        query = self._paginate(query, skip=skip, limit=limit, apres=apres)
         
+        result = await db.execute(query)
+        return list(result.scalars().all())
+    
+    async def get_rows_by_filters_async(
+        self,
+        db: AsyncSession,
+        query,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        apres: Optional[Tuple[date, int]] = None,
+        **filters
+    ) -> List[Row]:
+        """get_by_filters_async pour un select() de colonnes (projection ?fields=)"""
+        query = self._paginate(self._apply_filters(query, **filters), skip=skip, limit=limit, apres=apres)
+        return list((await db.execute(query)).all())
+    
+    # ========================================
+    # 🔎 RECHERCHE
+    # ========================================
+
+    async def search_async(
+        self,
+        db: AsyncSession,
+        q: str,
+        *,
+        limit: int = 50,
+        apres: Optional[Tuple[float, int]] = None,
+        **filters
+    ) -> List[Tuple[Cas, float]]:
+        """
+        Cas dont le nom ressemble à `q`, dont le numéro contient `q` ou dont les
+        observations correspondent à `q` (plein texte), classés par pertinence
+
+        Les trois conditions sont servies par les index GIN (trigrammes sur nom
+        et numero_cas, tsvector sur observations). Le score est le meilleur des
+        trois : similarité du nom, similarité du numéro, rang plein texte.
+        Pagination par clé (score DESC, id DESC).
+        """
+        echappe = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        motif = f"%{echappe}%"
+        observations = literal_column(OBSERVATIONS_TSVECTOR)
+        requete_texte = func.websearch_to_tsquery(literal_column("'french'"), q)
+        score = func.greatest(
+            func.similarity(func.coalesce(Cas.nom, ""), q),
+            func.word_similarity(q, Cas.numero_cas),
+            func.ts_rank(observations, requete_texte)
+        )
+
+        query = select(Cas, score.label("score")).where(or_(
+            Cas.nom.op("%")(q),
+            Cas.nom.ilike(motif),
+            Cas.numero_cas.ilike(motif),
+            observations.op("@@")(requete_texte)
+        ))
+        query = self._apply_filters(query, **filters)
+        if apres is not None:
+            query = query.where(tuple_(score, Cas.id) < tuple_(*apres))
+        query = query.order_by(score.desc(), Cas.id.desc()).limit(limit)
+
+        result = await db.execute(query)
+        return [(cas, float(pertinence)) for cas, pertinence in result.all()]
+
+    # ========================================
+    # 🔢 COUNT BY FILTERS
+    # ========================================
+    
+    def count_by_filters(self, db: Session, **filters) -> int:
+        """Compter les cas selon les filtres"""
+        query = self._apply_filters(db.query(func.count(Cas.id)), **filters)
+        return query.scalar()
+    
+    async def count_by_filters_async(self, db: AsyncSession, **filters) -> int:
+        """Version asynchrone de count_by_filters"""
+        query = self._apply_filters(select(func.count(Cas.id)), **filters)
+        return (await db.execute(query)).scalar()
+
+    async def estimate_by_filters_async(self, db: AsyncSession, **filters) -> Tuple[int, str]:
+        """
+        Nombre de cas approché, renvoyé avec sa source :
+        - "planner" : sans filtre, statistiques du planificateur (pg_class.reltuples
+          des partitions, toutes analysées)
+        - "journalier" : somme de cas_daily_agg sur l'axe de date filtré (les
+          cas clôturés archivés y restent comptés)
+        - "exact" : partition jamais analysée, ou filtres sur les deux axes de
+          date à la fois, COUNT(*) classique
+        """
+        decl_debut, debut = filters.pop("date_declaration_debut", None), filters.pop("date_debut", None)
+        decl_fin, fin = filters.pop("date_declaration_fin", None), filters.pop("date_fin", None)
+        debut, fin = decl_debut or debut, decl_fin or fin
+        symp_debut = filters.pop("date_symptomes_debut", None)
+        symp_fin = filters.pop("date_symptomes_fin", None)
+        filters = {cle: valeur for cle, valeur in filters.items() if valeur}
+        exact = dict(
+            filters, date_declaration_debut=debut, date_declaration_fin=fin,
+            date_symptomes_debut=symp_debut, date_symptomes_fin=symp_fin
+        )
+
+        if not filters and not any((debut, fin, symp_debut, symp_fin)):
+            # cas est partitionnée : somme des partitions, si toutes sont analysées
+            reltuples, non_analysee = (await db.execute(text("""
+                SELECT sum(c.reltuples)::bigint, bool_or(c.reltuples < 0) FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'cas'::regclass
+            """))).one()
+            if reltuples is not None and not non_analysee:
+                return int(reltuples), "planner"
+            return await self.count_by_filters_async(db, **exact), "exact"
+
+        statuts, statut = None, filters.get("statut")
         if statut:
-            from app.utils.enums import CasStatut
             try:
-                if isinstance(statut, str):
-                    statut_enum = CasStatut[statut.upper()]
-                    query = query.filter(Cas.statut == statut_enum)
-                else:
-                    query = query.filter(Cas.statut == statut)
+                statuts = [statut if isinstance(statut, CasStatut) else CasStatut[statut.upper()]]
             except (KeyError, AttributeError):
-                query = query.filter(Cas.statut == statut)
-        
-        if date_symptomes_debut:
-            query = query.filter(Cas.date_symptomes >= date_symptomes_debut)
-        
-        if date_symptomes_fin:
-            query = query.filter(Cas.date_symptomes <= date_symptomes_fin)
-        
-        date_decl_debut = date_declaration_debut or date_debut
-        date_decl_fin = date_declaration_fin or date_fin
-        
-        if date_decl_debut:
-            query = query.filter(Cas.date_declaration >= date_decl_debut)
-        
-        if date_decl_fin:
-            query = query.filter(Cas.date_declaration <= date_decl_fin)
-        
-        return query.scalar()
+                return await self.count_by_filters_async(db, **exact), "exact"
+        if (debut or fin) and (symp_debut or symp_fin):
+            return await self.count_by_filters_async(db, **exact), "exact"
+
+        axe = AXE_SYMPTOMES if symp_debut or symp_fin else AXE_DECLARATION
+        nombre = (await db.execute(select(NOMBRE).where(*conditions(
+            axe,
+            maladie_id=filters.get("maladie_id"),
+            district_id=filters.get("district_id"),
+            statuts=statuts,
+            date_debut=symp_debut or debut,
+            date_fin=symp_fin or fin
+        )))).scalar()
+        return int(nombre or 0), "journalier"
+
+
+    # ========================================
+    # 🔄 SYNCHRONISATION DIFFÉRENTIELLE
+    # ========================================
+
+    async def get_changes_async(
+        self,
+        db: AsyncSession,
+        query,
+        *,
+        curseur: Optional[SyncCursor] = None,
+        limit: int = 500,
+        district_id: Optional[int] = None,
+        centre_sante_id: Optional[int] = None
+    ) -> Dict:
+        """
+        Cas créés ou modifiés et cas supprimés depuis `curseur`
+
+        Deux flux triés par clé : (xid_modif, id) sur cas et (xid_suppression,
+        id) sur cas_supprimes, xid étant la transaction qui a écrit la ligne.
+        Seules les transactions antérieures au xmin de l'instantané courant
+        sont servies : elles sont toutes terminées, aucune ne peut plus
+        apparaître derrière le curseur. Une transaction longue (import)
+        retient le flux jusqu'à sa fin au lieu d'en être perdue.
+        Sans curseur (première synchronisation), aucune suppression n'est
+        renvoyée : le terminal n'a encore aucun cas.
+        """
+        borne = (await db.execute(
+            select(text("pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+        )).scalar()
+        position_cas, position_supprimes = curseur if curseur else (None, (borne, 0))
+
+        query = query.add_columns(Cas.xid_modif).where(Cas.xid_modif < borne)
+        supprimes = select(
+            CasSupprime.id, CasSupprime.numero_cas, CasSupprime.supprime_le, CasSupprime.xid_suppression
+        ).where(
+            CasSupprime.xid_suppression < borne,
+            tuple_(CasSupprime.xid_suppression, CasSupprime.id) > tuple_(*position_supprimes)
+        )
+        if position_cas is not None:
+            query = query.where(tuple_(Cas.xid_modif, Cas.id) > tuple_(*position_cas))
+        if centre_sante_id:
+            query = query.where(Cas.centre_sante_id == centre_sante_id)
+            supprimes = supprimes.where(CasSupprime.centre_sante_id == centre_sante_id)
+        elif district_id:
+            query = query.where(Cas.district_id == district_id)
+            supprimes = supprimes.where(CasSupprime.district_id == district_id)
+
+        lignes = (await db.execute(query.order_by(Cas.xid_modif, Cas.id).limit(limit))).all()
+        supprimes = (await db.execute(
+            supprimes.order_by(CasSupprime.xid_suppression, CasSupprime.id).limit(limit)
+        )).all()
+
+        if lignes:
+            position_cas = (lignes[-1].xid_modif, lignes[-1].id)
+        if supprimes:
+            position_supprimes = (supprimes[-1].xid_suppression, supprimes[-1].id)
+        return {
+            "cas": lignes,
+            "supprimes": supprimes,
+            "curseur": (position_cas, position_supprimes),
+            "suite": len(lignes) == limit or len(supprimes) == limit,
+        }
 
 
 # Instance du CRUD
@@ -5,15 +5,22 @@
 """
 
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.exc import IntegrityError
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import replica_monitor
+from app.core.instrumentation import SQLInstrumentationMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.core.security import shutdown_hash_executor
+from app.core.pool_stats import pools_snapshot
 from app.api.v1.router import api_router
 
 
@@ -28,9 +35,23 @@ logger = logging.getLogger(__name__)
 
 
 # ========================================
-# 🗄️ CRÉATION DES TABLES
+# 🔄 DÉMARRAGE / ARRÊT
 # ========================================
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Démarre la surveillance du retard du réplica (si configuré), libère le pool
+    bcrypt à l'arrêt. Aucun DDL ici : les partitions de cas sont créées par
+    scripts.init_db et la tâche annuelle scripts.partitions_cas courantes.
+    """
+    if replica_monitor is not None:
+        replica_monitor.check()
+        replica_monitor.start()
+        logger.info(f"🪞 Réplica en lecture actif (retard max {settings.REPLICA_MAX_LAG_SECONDS}s)")
+    yield
+    if replica_monitor is not None:
+        replica_monitor.stop()
+    shutdown_hash_executor()
 
 
 # ========================================
@@ -38,12 +59,32 @@ Base.metadata.create_all(bind=engine)
 # ========================================
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     description="API de Surveillance Épidémiologique - Vakinankaratra",
     version="1.0.0"
 )
 
 
+# ========================================
+# ⏱️ INSTRUMENTATION SQL (Server-Timing, N+1)
+# ========================================
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(SQLInstrumentationMiddleware, repeat_threshold=settings.N_PLUS_ONE_THRESHOLD)
+
+
+# ========================================
+# 📈 MÉTRIQUES PROMETHEUS (latence par route)
+# ========================================
+app.add_middleware(MetricsMiddleware)
+
+
+# ========================================
+# 🗜️ COMPRESSION GZIP (listes, flux de synchronisation)
+# ========================================
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
+
 # ========================================
 # 🌐 CONFIGURATION CORS
 # ========================================
@@ -53,6 +94,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lisibles par le SPA : curseur de pagination, temps serveur
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"],
 )
 
 
@@ -172,3 +215,25 @@ def health_check():
         "service": "DRSP API",
         "version": "1.0.0"
     }
+
+
+@app.get("/health/db")
+def health_db():
+    """
+    🔌 État des pools de connexions (OLTP, lecture, reporting)
+    Temps d'attente cumulés/max pour obtenir une connexion, timeouts, occupation
+    """
+    return {
+        "status": "healthy",
+        "pools": pools_snapshot(),
+        "replica": replica_monitor.snapshot() if replica_monitor is not None else None
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    📈 Métriques Prometheus : latence par route, pools, Prophet, Groq, PDF/Excel
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -8,4 +8,10 @@ from app.models.alerte import Alerte
 from app.models.intervention import Intervention
 from app.models.anomalie import Anomalie
 from app.models.prediction import Prediction
-from app.models.recommandation import Recommandation
\ No newline at end of file
+from app.models.recommandation import Recommandation
+from app.models.compteur_cas import CompteurCas
+from app.models.numero_cas import NumeroCas
+from app.models.cas_supprime import CasSupprime
+from app.models.doublon_cas import DoublonCas
+from app.models.cas_archive import CasArchive
+from app.models.cas_daily_agg import CasDailyAgg
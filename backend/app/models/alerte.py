@@ -1,11 +1,21 @@
 # app/models/alerte.py (MISE À JOUR)
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, Enum as SQLEnum, DateTime
+from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, Enum as SQLEnum, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 
 class Alerte(Base):
     __tablename__ = "alertes"
+    # Index dérivés des requêtes (migration 7c2d5e8f1a90) : alerte active
+    # par maladie/district, liste par date, alertes ouvertes du dashboard
+    __table_args__ = (
+        Index("ix_alertes_maladie_district_statut", "maladie_id", "district_id", "statut"),
+        Index("ix_alertes_date_detection_id", "date_detection", "id"),
+        Index(
+            "ix_alertes_ouvertes_niveau", "niveau_gravite",
+            postgresql_where=text("statut IN ('active', 'en_cours')")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     type_alerte = Column(String(100), nullable=False)
@@ -1,16 +1,55 @@
 # app/models/cas.py
 
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, Enum as SQLEnum, ForeignKey
+from sqlalchemy import (
+    DDL, BigInteger, Column, FetchedValue, Integer, String, Date, DateTime, Text, Float, Enum as SQLEnum,
+    ForeignKey, Index, event, text
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 from app.utils.enums import CasStatut, Sexe
 
+# Expression indexée pour la recherche plein texte (identique dans les requêtes)
+OBSERVATIONS_TSVECTOR = "to_tsvector('french', coalesce(observations, ''))"
+# Identifiant (64 bits) de la transaction courante, clé du flux /cas/changes
+XID_COURANT = "pg_current_xact_id()::text::bigint"
+
+
 class Cas(Base):
+    """
+    Cas déclaré ; table partitionnée par année de date_declaration
+    (cas_AAAA + cas_defaut, voir app.core.partitions). La clé primaire
+    inclut donc date_declaration et numero_cas n'a plus d'index unique :
+    son unicité est garantie en base par numeros_cas (déclencheur).
+    """
     __tablename__ = "cas"
+    # Index dérivés des requêtes des services (migration 7c2d5e8f1a90) :
+    # listes et fenêtres de dates, filtres maladie/district/statut, carto (GPS)
+    __table_args__ = (
+        Index("ix_cas_date_declaration_id", "date_declaration", "id"),
+        Index("ix_cas_maladie_date_declaration", "maladie_id", "date_declaration"),
+        Index("ix_cas_district_date_declaration", "district_id", "date_declaration"),
+        Index("ix_cas_statut_date_declaration", "statut", "date_declaration"),
+        Index("ix_cas_date_symptomes_maladie_district", "date_symptomes", "maladie_id", "district_id"),
+        Index(
+            "ix_cas_geolocalises_date_declaration", "date_declaration",
+            postgresql_where=text("latitude IS NOT NULL AND longitude IS NOT NULL")
+        ),
+        # Flux de synchronisation /cas/changes (migration 5b1d7f3a9c62)
+        Index("ix_cas_xid_modif_id", "xid_modif", "id"),
+        # Recherche /cas/search (migration d27b4e8a6f31) : trigrammes et plein texte
+        Index("ix_cas_nom_trgm", "nom", postgresql_using="gin", postgresql_ops={"nom": "gin_trgm_ops"}),
+        Index(
+            "ix_cas_numero_cas_trgm", "numero_cas",
+            postgresql_using="gin", postgresql_ops={"numero_cas": "gin_trgm_ops"}
+        ),
+        Index("ix_cas_observations_fts", text(OBSERVATIONS_TSVECTOR), postgresql_using="gin"),
+        # Partitionnement annuel (migration e6b1c9d4a852)
+        {"postgresql_partition_by": "RANGE (date_declaration)"},
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    numero_cas = Column(String, unique=True, nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    numero_cas = Column(String, nullable=False, index=True)
     nom = Column(String(200), nullable=True)
     
     maladie_id = Column(Integer, ForeignKey("maladies.id"), nullable=False)
@@ -18,7 +57,7 @@ class Cas(Base):
     district_id = Column(Integer, ForeignKey("districts.id"), nullable=False)
     
     date_symptomes = Column(Date, nullable=False)
-    date_declaration = Column(Date, nullable=False)
+    date_declaration = Column(Date, primary_key=True, nullable=False)
     
     age = Column(Integer, nullable=True)
     sexe = Column(SQLEnum(Sexe), nullable=True)
@@ -32,9 +71,44 @@ class Cas(Base):
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Transaction de la dernière écriture (déclencheur cas_xid_modif)
+    xid_modif = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
     
     # ✅ Relations (avec lazy='joined' pour charger automatiquement)
     maladie = relationship("Maladie", foreign_keys=[maladie_id], lazy='joined')
     centre_sante = relationship("CentreSante", foreign_keys=[centre_sante_id], lazy='joined')
     district = relationship("District", foreign_keys=[district_id], lazy='joined')
     created_by_user = relationship("User", foreign_keys=[created_by])
+
+    # L'identité ORM reste l'id seul : db.get(Cas, id), relations, curseurs
+    __mapper_args__ = {"primary_key": [id]}
+
+
+# Index trigrammes : l'extension doit exister avant la création de la table (create_all)
+event.listen(Cas.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+# Partition par défaut : une date sans partition annuelle ne fait jamais échouer l'insertion
+event.listen(
+    Cas.__table__, "after_create", DDL("CREATE TABLE IF NOT EXISTS cas_defaut PARTITION OF cas DEFAULT")
+)
+# Transaction de chaque création ou modification, pour /cas/changes
+event.listen(Cas.__table__, "after_create", DDL(f"""
+    CREATE OR REPLACE FUNCTION cas_xid_modif() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.xid_modif := {XID_COURANT};
+        RETURN NEW;
+    END
+    $$;
+    CREATE TRIGGER cas_xid_modif BEFORE INSERT OR UPDATE ON cas
+    FOR EACH ROW EXECUTE FUNCTION cas_xid_modif()
+"""))
+# Unicité de numero_cas pour toute la table (voir app.models.numero_cas)
+event.listen(Cas.__table__, "after_create", DDL("""
+    CREATE OR REPLACE FUNCTION cas_numero_unique() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO numeros_cas (numero_cas) VALUES (NEW.numero_cas);
+        RETURN NEW;
+    END
+    $$;
+    CREATE TRIGGER cas_numero_unique BEFORE INSERT ON cas
+    FOR EACH ROW EXECUTE FUNCTION cas_numero_unique()
+"""))
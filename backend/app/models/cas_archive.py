@@ -0,0 +1,30 @@
+# app/models/cas_archive.py
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CasArchive(Base):
+    """
+    Fichier Parquet de cas clôturés sortis de la table cas (manifeste)
+
+    Seuls les fichiers listés ici sont lus par la couche de lecture des
+    archives : la ligne est écrite dans la transaction qui supprime les cas,
+    un fichier dont la transaction a échoué n'est donc jamais compté.
+    """
+    __tablename__ = "cas_archives"
+    __table_args__ = (
+        Index("ix_cas_archives_maladie_dates", "maladie_id", "date_min", "date_max"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Chemin relatif à CAS_ARCHIVE_DIR (annee=AAAA/maladie_id=N/cas-....parquet)
+    chemin = Column(String, unique=True, nullable=False)
+    annee = Column(Integer, nullable=False)
+    maladie_id = Column(Integer, nullable=False)
+    lignes = Column(Integer, nullable=False)
+    # Période de déclaration couverte par le fichier
+    date_min = Column(Date, nullable=False)
+    date_max = Column(Date, nullable=False)
+    archive_le = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
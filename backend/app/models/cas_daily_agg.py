@@ -0,0 +1,37 @@
+# app/models/cas_daily_agg.py
+
+from sqlalchemy import Column, Integer, String, Date, Index
+from app.core.database import Base
+
+# Axes de date : chaque cas compte une fois par axe
+AXE_DECLARATION = "declaration"
+AXE_SYMPTOMES = "symptomes"
+# Sexe non renseigné (la clé primaire n'admet pas NULL)
+SEXE_INCONNU = "NR"
+
+
+class CasDailyAgg(Base):
+    """
+    Nombre de cas par jour et par dimension d'analyse, tenu à jour dans la
+    transaction de chaque création, modification ou suppression de cas
+    (app.services.agregat_service) ; reconstruit par python -m scripts.agreger_cas
+
+    Les cas archivés en Parquet restent comptés. statut et sexe sont les noms
+    des énumérations, comme dans cas.
+    """
+    __tablename__ = "cas_daily_agg"
+    __table_args__ = (
+        Index("ix_cas_daily_agg_maladie_jour", "axe", "maladie_id", "jour"),
+        Index("ix_cas_daily_agg_district_jour", "axe", "district_id", "jour"),
+    )
+
+    # "declaration" (date_declaration) ou "symptomes" (date_symptomes)
+    axe = Column(String(12), primary_key=True)
+    jour = Column(Date, primary_key=True)
+    maladie_id = Column(Integer, primary_key=True)
+    district_id = Column(Integer, primary_key=True)
+    centre_sante_id = Column(Integer, primary_key=True)
+    statut = Column(String(20), primary_key=True)
+    sexe = Column(String(20), primary_key=True)
+    tranche_age = Column(String(20), primary_key=True)
+    nombre = Column(Integer, nullable=False, default=0)
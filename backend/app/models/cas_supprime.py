@@ -0,0 +1,24 @@
+# app/models/cas_supprime.py
+
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.cas import XID_COURANT
+
+
+class CasSupprime(Base):
+    """Trace d'un cas supprimé (tombstone) pour la synchronisation différentielle /cas/changes"""
+    __tablename__ = "cas_supprimes"
+    __table_args__ = (
+        Index("ix_cas_supprimes_xid_suppression_id", "xid_suppression", "id"),
+    )
+
+    # id du cas supprimé (pas de clé étrangère : la ligne cas n'existe plus)
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    numero_cas = Column(String, nullable=False)
+    district_id = Column(Integer, nullable=False, index=True)
+    centre_sante_id = Column(Integer, nullable=False)
+    supprime_par = Column(Integer, nullable=True)
+    supprime_le = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Transaction de la suppression : clé du flux /cas/changes
+    xid_suppression = Column(BigInteger, server_default=text(XID_COURANT), nullable=False)
@@ -0,0 +1,16 @@
+# app/models/compteur_cas.py
+
+from sqlalchemy import Column, Integer, String
+from app.core.database import Base
+
+# Préfixe des numéros attribués par l'application
+PREFIXE_NUMERO = "VAKIN"
+
+
+class CompteurCas(Base):
+    """Dernier numéro de cas attribué par préfixe et par année (PREFIXE-AAAA-NNNNN)"""
+    __tablename__ = "compteurs_cas"
+
+    prefixe = Column(String(16), primary_key=True)
+    annee = Column(Integer, primary_key=True, autoincrement=False)
+    dernier_numero = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,31 @@
+# app/models/doublon_cas.py
+
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DoublonCas(Base):
+    """Paire de cas probablement doublons, en attente de vérification (file de revue)"""
+    __tablename__ = "doublons_cas"
+    __table_args__ = (
+        UniqueConstraint("cas_id", "doublon_de_id", name="uq_doublons_cas_paire"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Cas le plus récent de la paire et cas antérieur dont il serait le doublon.
+    # Pas de clé étrangère : cas.id seul n'est pas unique côté PostgreSQL (cas est
+    # partitionnée, clé (id, date_declaration)) ; CRUDCas.remove supprime les paires
+    cas_id = Column(Integer, nullable=False, index=True)
+    doublon_de_id = Column(Integer, nullable=False, index=True)
+    # Similarité des noms normalisés (0 à 1)
+    score = Column(Float, nullable=False)
+    statut = Column(
+        SQLEnum('a_verifier', 'confirme', 'rejete', name='statut_doublon'),
+        default='a_verifier',
+        nullable=False,
+        index=True
+    )
+    detecte_le = Column(DateTime(timezone=True), server_default=func.now())
+    traite_par = Column(Integer, ForeignKey("users.id"), nullable=True)
+    traite_le = Column(DateTime(timezone=True), nullable=True)
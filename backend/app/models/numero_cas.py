@@ -0,0 +1,19 @@
+# app/models/numero_cas.py
+
+from sqlalchemy import Column, String
+from app.core.database import Base
+
+
+class NumeroCas(Base):
+    """
+    Numéros de cas déjà utilisés, un par ligne (clé primaire : unicité en base)
+
+    cas est partitionnée : un index unique sur numero_cas devrait contenir
+    date_declaration. Le déclencheur cas_numero_unique remplit cette table à
+    chaque insertion dans cas, dans la même transaction ; un numéro répété
+    fait échouer l'insertion. Les numéros des cas supprimés ou archivés
+    restent réservés.
+    """
+    __tablename__ = "numeros_cas"
+
+    numero_cas = Column(String, primary_key=True)
@@ -0,0 +1,35 @@
+# app/schemas/batch.py
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+from app.core.config import settings
+
+
+class SousRequete(BaseModel):
+    """Une requête GET de l'API, chemin relatif à /api/v1 (query string comprise)"""
+    id: Optional[str] = None
+    url: str = Field(..., description="Ex: /statistiques/dashboard?maladie_id=2")
+
+    @field_validator("url")
+    @classmethod
+    def chemin_relatif(cls, url: str) -> str:
+        if not url.startswith("/") or url.startswith("//"):
+            raise ValueError("Chemin relatif à l'API attendu (ex: /dashboard/statistics)")
+        return url
+
+
+class BatchRequest(BaseModel):
+    requetes: List[SousRequete] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUETES)
+
+
+class SousReponse(BaseModel):
+    id: Optional[str] = None
+    url: str
+    status: int
+    body: Any = None
+    # En-têtes utiles au client (curseur de pagination)
+    headers: Dict[str, str] = {}
+
+
+class BatchResponse(BaseModel):
+    reponses: List[SousReponse]
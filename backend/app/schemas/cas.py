@@ -1,6 +1,6 @@
 # app/schemas/cas.py
 
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from pydantic import BaseModel, Field
 from app.utils.enums import CasStatut, Sexe
@@ -98,3 +98,44 @@ class CasResponse(BaseModel):
     class Config:
         from_attributes = True
         use_enum_values = True  # Convertir les Enums en valeurs string
+
+
+class CasRechercheResponse(CasResponse):
+    """Résultat de /cas/search : le cas et sa pertinence (0 à 1)"""
+    score: float
+
+
+# ========================================
+# 📦 SCHÉMAS DE L'IMPORT EN LOT
+# ========================================
+
+class CasBulkLigne(BaseModel):
+    """Résultat d'une ligne de l'import en lot"""
+    index: int
+    statut: str  # "cree" | "rejete" | "non_importe"
+    id: Optional[int] = None
+    numero_cas: Optional[str] = None
+    erreurs: List[str] = []
+
+
+class CasBulkResultat(BaseModel):
+    """Rapport de l'import en lot, une entrée par ligne reçue"""
+    total: int
+    crees: int
+    rejetes: int
+    lignes: List[CasBulkLigne]
+
+
+class CasImportErreur(BaseModel):
+    """Ligne rejetée d'un fichier importé (numéro de ligne du fichier, en-tête = 1)"""
+    ligne: int
+    erreurs: List[str]
+
+
+class CasImportResultat(BaseModel):
+    """Rapport de l'import d'un fichier CSV/XLSX"""
+    total_lignes: int
+    importes: int
+    ignores: int  # numéro de cas déjà présent en base
+    rejetes: int
+    erreurs: List[CasImportErreur]  # tronqué à IMPORT_CAS_MAX_ERREURS
@@ -0,0 +1,39 @@
+# app/schemas/doublon.py
+
+from typing import Literal, Optional
+from datetime import date, datetime
+from pydantic import BaseModel
+from app.utils.enums import CasStatut, Sexe
+
+# Statuts de la file de revue (énumération statut_doublon de doublons_cas)
+StatutDoublon = Literal["a_verifier", "confirme", "rejete"]
+
+
+class CasDansDoublon(BaseModel):
+    """Résumé d'un cas de la paire, pour la comparaison à l'écran"""
+    id: int
+    numero_cas: str
+    nom: Optional[str] = None
+    age: Optional[int] = None
+    sexe: Optional[Sexe] = None
+    statut: CasStatut
+    date_symptomes: date
+    date_declaration: date
+    centre_sante_id: int
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class DoublonCasResponse(BaseModel):
+    id: int
+    score: float
+    statut: StatutDoublon
+    maladie_id: int
+    district_id: int
+    detecte_le: Optional[datetime] = None
+    traite_par: Optional[int] = None
+    traite_le: Optional[datetime] = None
+    cas: CasDansDoublon
+    doublon_de: CasDansDoublon
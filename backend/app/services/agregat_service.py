@@ -0,0 +1,178 @@
+# app/services/agregat_service.py
+"""
+📄 Fichier: app/services/agregat_service.py
+📝 Description: Tenue de cas_daily_agg (nombre de cas par jour et par dimension)
+🎯 Usage: CRUDCas (création, modification, suppression), fusion des imports,
+          reconstruction : python -m scripts.agreger_cas
+
+Chaque cas compte dans deux lignes : axe "declaration" (date_declaration)
+et axe "symptomes" (date_symptomes). Les écritures sont des upserts
+incrémentaux (nombre = nombre + delta) exécutés avant le commit de
+l'appelant : le cas et ses agrégats sont validés ensemble. L'archivage
+Parquet ne les touche pas ; la reconstruction relit cas et les archives.
+"""
+
+import logging
+from collections import Counter
+from datetime import date
+from enum import Enum
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, and_, case, func, literal_column, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.cas_daily_agg import AXE_DECLARATION, AXE_SYMPTOMES, SEXE_INCONNU, CasDailyAgg
+from app.utils.enums import CasStatut
+
+logger = logging.getLogger(__name__)
+
+# Bornes supérieures (exclues) des tranches d'âge, au-delà : "65+ ans"
+TRANCHES_AGE = (
+    (1, "0-1 an"), (5, "1-4 ans"), (15, "5-14 ans"), (25, "15-24 ans"), (45, "25-44 ans"), (65, "45-64 ans")
+)
+AGE_MAX = "65+ ans"
+AGE_INCONNU = "Non renseigné"
+
+CLE = ("axe", "jour", "maladie_id", "district_id", "centre_sante_id", "statut", "sexe", "tranche_age")
+COLONNES_CAS = ("date_declaration", "date_symptomes", "maladie_id", "district_id", "centre_sante_id",
+                "statut", "sexe", "age")
+TAILLE_LOT = 5000
+
+
+def tranche_age(age: Optional[int]) -> str:
+    if age is None:
+        return AGE_INCONNU
+    for borne, tranche in TRANCHES_AGE:
+        if age < borne:
+            return tranche
+    return AGE_MAX
+
+
+def tranche_age_sql(colonne):
+    """Même découpage en expression SQL"""
+    return case(
+        *((colonne < borne, tranche) for borne, tranche in TRANCHES_AGE),
+        (colonne >= TRANCHES_AGE[-1][0], AGE_MAX),
+        else_=AGE_INCONNU
+    )
+
+
+# Nombre de cas d'une sélection de lignes agrégées
+NOMBRE = func.coalesce(func.sum(CasDailyAgg.nombre), 0)
+
+
+def nombre_si(*filtres):
+    """NOMBRE restreint aux lignes qui vérifient les filtres (SUM ... FILTER (WHERE ...))"""
+    return func.coalesce(func.sum(CasDailyAgg.nombre).filter(and_(*filtres)), 0)
+
+
+def conditions(
+    axe: str = AXE_DECLARATION,
+    *,
+    maladie_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    statuts: Optional[Sequence[CasStatut]] = None,
+    date_debut: Optional[date] = None,
+    date_fin: Optional[date] = None
+) -> List:
+    """Filtres des lecteurs de cas_daily_agg (bornes de dates incluses)"""
+    filtres = [CasDailyAgg.axe == axe]
+    if maladie_id:
+        filtres.append(CasDailyAgg.maladie_id == maladie_id)
+    if district_id:
+        filtres.append(CasDailyAgg.district_id == district_id)
+    if statuts:
+        filtres.append(CasDailyAgg.statut.in_([statut.name for statut in statuts]))
+    if date_debut:
+        filtres.append(CasDailyAgg.jour >= date_debut)
+    if date_fin:
+        filtres.append(CasDailyAgg.jour <= date_fin)
+    return filtres
+
+
+def _nom(valeur) -> Optional[str]:
+    return valeur.name if isinstance(valeur, Enum) else valeur
+
+
+def cles(cas) -> List[Tuple]:
+    """Clés cas_daily_agg d'un cas (objet ORM, ligne RETURNING ou ligne d'archive)"""
+    dimensions = (
+        cas.maladie_id, cas.district_id, cas.centre_sante_id,
+        _nom(cas.statut), _nom(cas.sexe) or SEXE_INCONNU, tranche_age(cas.age)
+    )
+    return [(AXE_DECLARATION, cas.date_declaration, *dimensions), (AXE_SYMPTOMES, cas.date_symptomes, *dimensions)]
+
+
+def instantane(cas) -> SimpleNamespace:
+    """Copie des dimensions d'un cas avant sa modification"""
+    return SimpleNamespace(**{colonne: getattr(cas, colonne) for colonne in COLONNES_CAS})
+
+
+class AgregatService:
+    """Mises à jour incrémentales et reconstruction de cas_daily_agg"""
+
+    @staticmethod
+    def appliquer(db: Session, deltas: Counter) -> None:
+        """Upsert des deltas par clé, dans l'ordre des clés (pas d'interblocage entre transactions)"""
+        lignes = [dict(zip(CLE, cle), nombre=delta) for cle, delta in sorted(deltas.items()) if delta]
+        for debut in range(0, len(lignes), TAILLE_LOT):
+            requete = insert(CasDailyAgg).values(lignes[debut:debut + TAILLE_LOT])
+            db.execute(requete.on_conflict_do_update(
+                index_elements=list(CLE),
+                set_={"nombre": CasDailyAgg.nombre + requete.excluded.nombre}
+            ))
+
+    def ajouter(self, db: Session, cas: Iterable, signe: int = 1) -> None:
+        deltas = Counter()
+        for un_cas in cas:
+            for cle in cles(un_cas):
+                deltas[cle] += signe
+        self.appliquer(db, deltas)
+
+    def retirer(self, db: Session, cas: Iterable) -> None:
+        self.ajouter(db, cas, signe=-1)
+
+    def modifier(self, db: Session, avant: SimpleNamespace, apres) -> None:
+        """Déplace le cas entre ses anciennes et nouvelles clés (rien si elles sont identiques)"""
+        deltas = Counter(cles(apres))
+        deltas.subtract(cles(avant))
+        self.appliquer(db, deltas)
+
+    def reconstruire(self, db: Session) -> Dict[str, int]:
+        """
+        Recalcule la table depuis cas et les archives Parquet, en une
+        transaction ; les écritures sur cas attendent la fin (verrou SHARE)
+        """
+        # pyarrow (via archive_service) n'est chargé que par la reconstruction
+        import pyarrow.parquet as pq
+
+        from app.services.archive_service import archive_service
+
+        db.execute(text("LOCK TABLE cas IN SHARE MODE"))
+        db.execute(text("LOCK TABLE cas_daily_agg IN EXCLUSIVE MODE"))
+        db.execute(text("DELETE FROM cas_daily_agg"))
+        tranche = tranche_age_sql(literal_column("age", Integer)).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        lignes = db.execute(text(f"""
+            INSERT INTO cas_daily_agg ({', '.join(CLE)}, nombre)
+            SELECT d.axe, d.jour, maladie_id, district_id, centre_sante_id,
+                   statut::text, coalesce(sexe::text, :sexe_inconnu), {tranche}, count(*)
+            FROM cas
+            CROSS JOIN LATERAL (VALUES (:declaration, date_declaration), (:symptomes, date_symptomes)) AS d(axe, jour)
+            GROUP BY 1, 2, 3, 4, 5, 6, 7, 8
+        """), {"sexe_inconnu": SEXE_INCONNU, "declaration": AXE_DECLARATION, "symptomes": AXE_SYMPTOMES}).rowcount
+
+        fichiers = archive_service.fichiers(db)
+        for fichier in fichiers:
+            table = pq.read_table(fichier, columns=list(COLONNES_CAS))
+            self.ajouter(db, (SimpleNamespace(**ligne) for ligne in table.to_pylist()))
+        db.commit()
+        logger.info(f"📊 cas_daily_agg reconstruite : {lignes} lignes depuis cas, {len(fichiers)} archive(s)")
+        return {"lignes_cas": lignes, "archives": len(fichiers)}
+
+
+agregat_service = AgregatService()
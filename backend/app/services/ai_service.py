@@ -4,24 +4,52 @@
 📝 Description: Service IA pour recommandations via Groq
 """
 
-from groq import Groq
-import os
+import logging
+import time
+from functools import lru_cache
 from typing import Dict, List, Optional
 import json
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.core.config import settings
+from app.core.metrics import GROQ_REQUEST_DURATION, GROQ_TOKENS
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise ValueError("❌ GROQ_API_KEY manquante dans .env")
-
-groq_client = Groq(api_key=GROQ_API_KEY)
+logger = logging.getLogger(__name__)
 
 # ✅ MODÈLE MIS À JOUR (novembre 2025)
 DEFAULT_MODEL = "llama-3.3-70b-versatile"  # Remplace l'ancien llama-3.1-70b
 MODEL_RAPIDE = "llama-3.1-8b-instant"      # Pour suggestions courtes
 
+
+@lru_cache(maxsize=1)
+def get_groq_client():
+    """
+    Client Groq créé au premier appel IA (import et clé vérifiés à ce moment-là,
+    pas au démarrage des workers)
+    """
+    if not settings.GROQ_API_KEY:
+        raise ValueError("❌ GROQ_API_KEY manquante dans .env")
+
+    from groq import Groq
+    return Groq(api_key=settings.GROQ_API_KEY)
+
+
+def chat_completion(model: str, **kwargs):
+    """Appel Groq chronométré (latence par modèle, tokens consommés)"""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        completion = get_groq_client().chat.completions.create(model=model, **kwargs)
+        status = "success"
+    finally:
+        GROQ_REQUEST_DURATION.labels(model=model, status=status).observe(time.perf_counter() - start)
+
+    usage = getattr(completion, "usage", None)
+    if usage is not None:
+        GROQ_TOKENS.labels(model=model, kind="prompt").inc(usage.prompt_tokens or 0)
+        GROQ_TOKENS.labels(model=model, kind="completion").inc(usage.completion_tokens or 0)
+    return completion
+
+
 class AIService:
     
     @staticmethod
@@ -83,7 +111,7 @@ Types valides: vaccination, sensibilisation, desinfection, distribution_medicame
 Réponds UNIQUEMENT en JSON pur, sans markdown."""
 
         try:
-            completion = groq_client.chat.completions.create(
+            completion = chat_completion(
                 messages=[
                     {
                         "role": "system",
@@ -111,7 +139,7 @@ Réponds UNIQUEMENT en JSON pur, sans markdown."""
             }
             
         except Exception as e:
-            print(f"❌ Erreur Groq: {str(e)}")
+            logger.error(f"❌ Erreur Groq: {str(e)}")
             return {
                 "success": False,
                 "error": str(e),
@@ -163,7 +191,7 @@ Format: "Action: [description]"
 """
 
         try:
-            completion = groq_client.chat.completions.create(
+            completion = chat_completion(
                 messages=[
                     {"role": "system", "content": "Expert santé publique. Réponses ultra-concises."},
                     {"role": "user", "content": prompt}
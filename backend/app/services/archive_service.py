@@ -0,0 +1,242 @@
+# app/services/archive_service.py
+"""
+📄 Fichier: app/services/archive_service.py
+📝 Description: Archives Parquet des cas clôturés anciens et lecture à travers elles
+🎯 Usage: Archivage : python -m scripts.archiver_cas
+          Lecture : RapportService.generate_rapport_global, AgregatService.reconstruire
+
+Les cas guéris ou décédés déclarés depuis plus de CAS_ARCHIVE_AGE_JOURS sont
+écrits en Parquet compressé, un fichier par année de déclaration, maladie et
+passage (CAS_ARCHIVE_DIR/annee=AAAA/maladie_id=N/), puis supprimés de cas
+dans la transaction qui enregistre le fichier dans cas_archives et leurs
+tombstones (cas_supprimes) : les terminaux les retirent. Un comptage
+dont la période recouvre des fichiers du manifeste leur ajoute leurs lignes ;
+une période récente ne lit aucun fichier. cas_daily_agg n'est pas modifiée :
+les cas archivés y restent comptés.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import Integer, bindparam, delete, extract, insert, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.cas import Cas
+from app.models.cas_archive import CasArchive
+from app.models.cas_supprime import CasSupprime
+from app.models.doublon_cas import DoublonCas
+from app.utils.enums import CasStatut
+
+logger = logging.getLogger(__name__)
+
+STATUTS_CLOTURES = (CasStatut.GUERI, CasStatut.DECEDE)
+
+# Colonnes de cas écrites dans les archives (énumérations par leur nom, comme en base)
+SCHEMA = pa.schema([
+    ("id", pa.int32()),
+    ("numero_cas", pa.string()),
+    ("nom", pa.string()),
+    ("maladie_id", pa.int32()),
+    ("centre_sante_id", pa.int32()),
+    ("district_id", pa.int32()),
+    ("date_symptomes", pa.date32()),
+    ("date_declaration", pa.date32()),
+    ("age", pa.int32()),
+    ("sexe", pa.string()),
+    ("statut", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("observations", pa.string()),
+    ("created_by", pa.int32()),
+    ("created_at", pa.timestamp("us", tz="UTC")),
+    ("updated_at", pa.timestamp("us", tz="UTC")),
+])
+COLONNES = [getattr(Cas, nom) for nom in SCHEMA.names]
+
+
+def _valeurs(ligne) -> Dict:
+    """Ligne SQL -> dict Parquet (Enum -> nom)"""
+    return {
+        nom: valeur.name if nom in ("sexe", "statut") and valeur is not None else valeur
+        for nom, valeur in ligne._mapping.items()
+    }
+
+
+def _filtre(
+    *,
+    maladie_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    statuts: Optional[Sequence[CasStatut]] = None,
+    date_debut: Optional[date] = None,
+    date_fin: Optional[date] = None
+) -> ds.Expression:
+    """Mêmes filtres que les services (période de déclaration incluse) en expression Arrow"""
+    expression = ds.scalar(True)
+    if maladie_id:
+        expression &= ds.field("maladie_id") == maladie_id
+    if district_id:
+        expression &= ds.field("district_id") == district_id
+    if statuts:
+        expression &= ds.field("statut").isin([statut.name for statut in statuts])
+    if date_debut:
+        expression &= ds.field("date_declaration") >= pa.scalar(date_debut, pa.date32())
+    if date_fin:
+        expression &= ds.field("date_declaration") <= pa.scalar(date_fin, pa.date32())
+    return expression
+
+
+class ArchiveService:
+    """Écriture des archives Parquet et comptages à travers le manifeste cas_archives"""
+
+    def __init__(self, repertoire: str, compression: str):
+        self.racine = Path(repertoire)
+        self.compression = compression
+
+    # ========================================
+    # 📦 ARCHIVAGE
+    # ========================================
+
+    def archiver(self, db: Session, avant: Optional[date] = None) -> Dict[str, int]:
+        """
+        Archive les cas clôturés déclarés avant `avant` (défaut : aujourd'hui
+        moins CAS_ARCHIVE_AGE_JOURS), une transaction par (année, maladie)
+        """
+        avant = avant or date.today() - timedelta(days=settings.CAS_ARCHIVE_AGE_JOURS)
+        annee = extract("year", Cas.date_declaration)
+        groupes = db.execute(
+            select(annee, Cas.maladie_id)
+            .where(Cas.statut.in_(STATUTS_CLOTURES), Cas.date_declaration < avant)
+            .group_by(annee, Cas.maladie_id)
+            .order_by(annee, Cas.maladie_id)
+        ).all()
+        db.rollback()
+
+        stats = {"fichiers": 0, "cas": 0}
+        for annee_groupe, maladie_id in groupes:
+            archives = self._archiver_groupe(db, int(annee_groupe), maladie_id, avant)
+            if archives:
+                stats["fichiers"] += 1
+                stats["cas"] += archives
+        return stats
+
+    def _archiver_groupe(self, db: Session, annee: int, maladie_id: int, avant: date) -> int:
+        # Bornes sur date_declaration : une seule partition annuelle lue et modifiée
+        filtres = (
+            Cas.statut.in_(STATUTS_CLOTURES),
+            Cas.maladie_id == maladie_id,
+            Cas.date_declaration >= date(annee, 1, 1),
+            Cas.date_declaration < min(date(annee + 1, 1, 1), avant),
+        )
+        # FOR UPDATE : un cas archivé ne peut pas changer avant sa suppression
+        lignes = db.execute(
+            select(*COLONNES).where(*filtres).order_by(Cas.date_declaration, Cas.id).with_for_update()
+        ).all()
+        if not lignes:
+            db.rollback()
+            return 0
+
+        chemin = f"annee={annee}/maladie_id={maladie_id}/cas-{datetime.now():%Y%m%dT%H%M%S%f}.parquet"
+        fichier = self.racine / chemin
+        fichier.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_pylist([_valeurs(ligne) for ligne in lignes], schema=SCHEMA),
+            fichier,
+            compression=self.compression
+        )
+        try:
+            ids = {"ids": [ligne.id for ligne in lignes]}
+            db.execute(
+                delete(Cas)
+                .where(*filtres, Cas.id == bindparam("ids", type_=ARRAY(Integer)).any_())
+                .execution_options(synchronize_session=False),
+                ids
+            )
+            # Paires de doublons des cas archivés (pas de clé étrangère vers cas, comme CRUDCas.remove)
+            ids_archives = bindparam("ids", type_=ARRAY(Integer)).any_()
+            db.execute(
+                delete(DoublonCas)
+                .where(or_(DoublonCas.cas_id == ids_archives, DoublonCas.doublon_de_id == ids_archives))
+                .execution_options(synchronize_session=False),
+                ids
+            )
+            # Tombstones : les terminaux retirent les cas archivés (/cas/changes)
+            db.execute(insert(CasSupprime), [
+                {"id": ligne.id, "numero_cas": ligne.numero_cas,
+                 "district_id": ligne.district_id, "centre_sante_id": ligne.centre_sante_id}
+                for ligne in lignes
+            ])
+            db.add(CasArchive(
+                chemin=chemin,
+                annee=annee,
+                maladie_id=maladie_id,
+                lignes=len(lignes),
+                date_min=lignes[0].date_declaration,
+                date_max=lignes[-1].date_declaration
+            ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            fichier.unlink(missing_ok=True)
+            raise
+        logger.info(f"📦 {len(lignes)} cas archivés dans {chemin}")
+        return len(lignes)
+
+    # ========================================
+    # 🔎 LECTURE À TRAVERS LES ARCHIVES
+    # ========================================
+
+    @staticmethod
+    def _requete_fichiers(maladie_id: Optional[int], date_debut: Optional[date], date_fin: Optional[date]):
+        """Fichiers du manifeste qui recouvrent la période (et la maladie)"""
+        query = select(CasArchive.chemin)
+        if maladie_id:
+            query = query.where(CasArchive.maladie_id == maladie_id)
+        if date_debut:
+            query = query.where(CasArchive.date_max >= date_debut)
+        if date_fin:
+            query = query.where(CasArchive.date_min <= date_fin)
+        return query
+
+    def fichiers(
+        self,
+        db: Session,
+        maladie_id: Optional[int] = None,
+        date_debut: Optional[date] = None,
+        date_fin: Optional[date] = None
+    ) -> List[str]:
+        return [str(self.racine / chemin) for chemin in db.scalars(self._requete_fichiers(maladie_id, date_debut, date_fin))]
+
+    @staticmethod
+    def compter(fichiers: List[str], **filtres) -> int:
+        """Nombre de cas archivés correspondant aux filtres"""
+        if not fichiers:
+            return 0
+        return ds.dataset(fichiers, format="parquet").count_rows(filter=_filtre(**filtres))
+
+    @staticmethod
+    def compter_par(fichiers: List[str], colonne: str, **filtres) -> Dict:
+        """Nombre de cas archivés par valeur d'une colonne (valeur nulle comprise)"""
+        if not fichiers:
+            return {}
+        table = ds.dataset(fichiers, format="parquet").to_table(columns=[colonne], filter=_filtre(**filtres))
+        comptes = pc.value_counts(table.column(colonne))
+        return dict(zip(comptes.field("values").to_pylist(), comptes.field("counts").to_pylist()))
+
+    @staticmethod
+    def distincts(fichiers: List[str], colonne: str, **filtres) -> Set:
+        """Valeurs distinctes d'une colonne parmi les cas archivés"""
+        if not fichiers:
+            return set()
+        table = ds.dataset(fichiers, format="parquet").to_table(columns=[colonne], filter=_filtre(**filtres))
+        return set(pc.unique(table.column(colonne)).to_pylist())
+
+
+archive_service = ArchiveService(settings.CAS_ARCHIVE_DIR, settings.CAS_ARCHIVE_COMPRESSION)
@@ -1,8 +1,8 @@
 # app/services/cartographie_service.py
 from typing import List, Dict, Optional
 from datetime import date
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select
 
 from app.models.cas import Cas
 from app.models.district import District
@@ -11,11 +11,11 @@ from app.models.maladie import Maladie
 
 
 class CartographieService:
-    """Service pour la génération de données cartographiques"""
+    """Service pour la génération de données cartographiques (session asynchrone)"""
     
     @staticmethod
-    def get_cas_markers(
-        db: Session,
+    async def get_cas_markers(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         district_id: Optional[int] = None,
         date_debut: Optional[date] = None,
@@ -25,7 +25,7 @@ class CartographieService:
         """
         Récupère les cas avec coordonnées GPS pour affichage sur carte
         """
-        query = db.query(
+        query = select(
             Cas.id,
             Cas.numero_cas,
             Cas.latitude,
@@ -43,7 +43,7 @@ class CartographieService:
             District, Cas.district_id == District.id
         ).join(
             CentreSante, Cas.centre_sante_id == CentreSante.id
-        ).filter(
+        ).where(
             and_(
                 Cas.latitude.isnot(None),
                 Cas.longitude.isnot(None)
@@ -51,15 +51,15 @@ class CartographieService:
         )
         
         if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
+            query = query.where(Cas.maladie_id == maladie_id)
         if district_id:
-            query = query.filter(Cas.district_id == district_id)
+            query = query.where(Cas.district_id == district_id)
         if date_debut:
-            query = query.filter(Cas.date_declaration >= date_debut)
+            query = query.where(Cas.date_declaration >= date_debut)
         if date_fin:
-            query = query.filter(Cas.date_declaration <= date_fin)
+            query = query.where(Cas.date_declaration <= date_fin)
         
-        results = query.limit(limit).all()
+        results = (await db.execute(query.limit(limit))).all()
         
         markers = []
         for r in results:
@@ -80,8 +80,8 @@ class CartographieService:
         return markers
     
     @staticmethod
-    def get_districts_choropleth(
-        db: Session,
+    async def get_districts_choropleth(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         date_debut: Optional[date] = None,
         date_fin: Optional[date] = None
@@ -89,7 +89,7 @@ class CartographieService:
         """
         Données pour carte choroplèthe (districts colorés selon nombre de cas)
         """
-        query = db.query(
+        query = select(
             District.id,
             District.nom,
             District.latitude,
@@ -101,19 +101,19 @@ class CartographieService:
         )
         
         if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
+            query = query.where(Cas.maladie_id == maladie_id)
         if date_debut:
-            query = query.filter(Cas.date_declaration >= date_debut)
+            query = query.where(Cas.date_declaration >= date_debut)
         if date_fin:
-            query = query.filter(Cas.date_declaration <= date_fin)
+            query = query.where(Cas.date_declaration <= date_fin)
         
-        results = query.group_by(
+        results = (await db.execute(query.group_by(
             District.id,
             District.nom,
             District.latitude,
             District.longitude,
             District.population
-        ).all()
+        ))).all()
         
         districts = []
         for r in results:
@@ -147,15 +147,15 @@ class CartographieService:
         return districts
     
     @staticmethod
-    def get_centres_sante_markers(
-        db: Session,
+    async def get_centres_sante_markers(
+        db: AsyncSession,
         district_id: Optional[int] = None,
         avec_laboratoire: Optional[bool] = None
     ) -> List[Dict]:
         """
         Récupère les centres de santé pour affichage sur carte
         """
-        query = db.query(
+        query = select(
             CentreSante.id,
             CentreSante.nom,
             CentreSante.type,
@@ -167,7 +167,7 @@ class CartographieService:
             District.nom.label('district_nom')
         ).join(
             District, CentreSante.district_id == District.id
-        ).filter(
+        ).where(
             and_(
                 CentreSante.latitude.isnot(None),
                 CentreSante.longitude.isnot(None)
@@ -175,11 +175,11 @@ class CartographieService:
         )
         
         if district_id:
-            query = query.filter(CentreSante.district_id == district_id)
+            query = query.where(CentreSante.district_id == district_id)
         if avec_laboratoire is not None:
-            query = query.filter(CentreSante.a_laboratoire == avec_laboratoire)
+            query = query.where(CentreSante.a_laboratoire == avec_laboratoire)
         
-        results = query.all()
+        results = (await db.execute(query)).all()
         
         centres = []
         for r in results:
@@ -198,8 +198,8 @@ class CartographieService:
         return centres
     
     @staticmethod
-    def get_heatmap_data(
-        db: Session,
+    async def get_heatmap_data(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         district_id: Optional[int] = None,
         date_debut: Optional[date] = None,
@@ -209,10 +209,10 @@ class CartographieService:
         Données pour heatmap (carte de chaleur)
         Format: [[lat, lng, intensité], ...]
         """
-        query = db.query(
+        query = select(
             Cas.latitude,
             Cas.longitude
-        ).filter(
+        ).where(
             and_(
                 Cas.latitude.isnot(None),
                 Cas.longitude.isnot(None)
@@ -220,15 +220,15 @@ class CartographieService:
         )
         
         if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
+            query = query.where(Cas.maladie_id == maladie_id)
         if district_id:
-            query = query.filter(Cas.district_id == district_id)
+            query = query.where(Cas.district_id == district_id)
         if date_debut:
-            query = query.filter(Cas.date_declaration >= date_debut)
+            query = query.where(Cas.date_declaration >= date_debut)
         if date_fin:
-            query = query.filter(Cas.date_declaration <= date_fin)
+            query = query.where(Cas.date_declaration <= date_fin)
         
-        results = query.all()
+        results = (await db.execute(query)).all()
         
         # Convertir en format heatmap [lat, lng, intensity]
         heatmap_data = []
@@ -242,8 +242,8 @@ class CartographieService:
         return heatmap_data
     
     @staticmethod
-    def detect_clusters(
-        db: Session,
+    async def detect_clusters(
+        db: AsyncSession,
         maladie_id: int,
         district_id: Optional[int] = None,
         jours: int = 14,
@@ -258,14 +258,14 @@ class CartographieService:
         
         date_debut = datetime.now().date() - timedelta(days=jours)
         
-        query = db.query(
+        query = select(
             Cas.latitude,
             Cas.longitude,
             Cas.district_id,
             District.nom.label('district_nom')
         ).join(
             District, Cas.district_id == District.id
-        ).filter(
+        ).where(
             and_(
                 Cas.maladie_id == maladie_id,
                 Cas.latitude.isnot(None),
@@ -275,9 +275,9 @@ class CartographieService:
         )
         
         if district_id:
-            query = query.filter(Cas.district_id == district_id)
+            query = query.where(Cas.district_id == district_id)
         
-        results = query.all()
+        results = (await db.execute(query)).all()
         
         # Regroupement simple par district
         clusters_by_district = {}
@@ -0,0 +1,205 @@
+# app/services/doublon_service.py
+"""
+📄 Fichier: app/services/doublon_service.py
+📝 Description: Détection des cas probablement déclarés deux fois (CSB puis CHD)
+🎯 Usage: À chaque création, import ou modification de cas (tâche de fond) et en lot
+          sur l'historique (python -m scripts.detecter_doublons)
+
+Pas de comparaison de toutes les paires : les cas sont répartis en blocs
+(maladie, district, semaine des symptômes, tranche d'âge, préfixe d'un mot
+du nom normalisé) et seuls les cas d'un même bloc sont comparés, par
+similarité des noms. Les paires retenues alimentent la file de revue
+doublons_cas ; un doublon confirmé n'est plus compté par check_thresholds.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.cas import Cas
+from app.models.doublon_cas import DoublonCas
+from app.utils.texte import normaliser
+
+logger = logging.getLogger(__name__)
+
+# Largeur des tranches d'âge (années) et longueur des préfixes de mots du nom
+TRANCHE_AGE = 5
+PREFIXE_NOM = 3
+
+COLONNES = (Cas.id, Cas.nom, Cas.maladie_id, Cas.district_id, Cas.date_symptomes, Cas.age, Cas.sexe)
+# Champs d'un cas qui entrent dans les blocs ou la similarité : leur
+# modification relance la détection
+CHAMPS_BLOCAGE = frozenset(colonne.key for colonne in COLONNES if colonne.key != "id")
+
+
+def nom_normalise(nom: Optional[str]) -> str:
+    """Nom sans accents ni casse, mots triés (nom/prénom inversés comparables)"""
+    return " ".join(sorted(normaliser(nom).replace("-", " ").split())) if nom else ""
+
+
+def semaine(jour: date) -> date:
+    """Lundi de la semaine d'un jour"""
+    return jour - timedelta(days=jour.weekday())
+
+
+def cles_blocage(ligne, decalages: Sequence[int] = (0,)) -> Set[Tuple]:
+    """
+    Blocs d'un cas : un par mot du nom (préfixe), pour qu'une faute de frappe
+    dans un seul mot ne sépare pas les deux déclarations. `decalages` (en
+    semaines) place aussi le cas dans les blocs des semaines voisines.
+    """
+    nom = nom_normalise(ligne.nom)
+    tranche = ligne.age // TRANCHE_AGE if ligne.age is not None else None
+    lundi = semaine(ligne.date_symptomes)
+    return {
+        (ligne.maladie_id, ligne.district_id, lundi + timedelta(weeks=decalage), tranche, mot[:PREFIXE_NOM])
+        for decalage in decalages
+        for mot in nom.split() if len(mot) >= 2
+    }
+
+
+def similarite(a, b) -> float:
+    """Similarité des noms normalisés ; 0 si les sexes renseignés diffèrent"""
+    if a.sexe is not None and b.sexe is not None and a.sexe != b.sexe:
+        return 0.0
+    return SequenceMatcher(None, nom_normalise(a.nom), nom_normalise(b.nom)).ratio()
+
+
+class DoublonService:
+    """Regroupement par blocs, comparaison des candidats, alimentation de la file de revue"""
+
+    def __init__(self, seuil: float):
+        self.seuil = seuil
+
+    def paires(self, lignes: Sequence, nouveaux: Optional[Set[int]] = None) -> Dict[Tuple[int, int], float]:
+        """
+        Paires (cas récent, cas antérieur) -> score au-dessus du seuil, comparées
+        uniquement à l'intérieur des blocs ; avec `nouveaux`, seules les paires
+        impliquant un de ces cas sont évaluées, et ces cas sont aussi placés
+        dans les blocs des semaines voisines (déclaration CSB un dimanche, CHD
+        le lundi suivant)
+        """
+        blocs: Dict[Tuple, List] = defaultdict(list)
+        for ligne in lignes:
+            decalages = (-1, 0, 1) if nouveaux is not None and ligne.id in nouveaux else (0,)
+            for cle in cles_blocage(ligne, decalages):
+                blocs[cle].append(ligne)
+
+        resultats: Dict[Tuple[int, int], float] = {}
+        for membres in blocs.values():
+            for a, b in combinations(membres, 2):
+                recent, ancien = (a, b) if a.id > b.id else (b, a)
+                paire = (recent.id, ancien.id)
+                if paire in resultats or (nouveaux is not None and not {a.id, b.id} & nouveaux):
+                    continue
+                score = similarite(a, b)
+                if score >= self.seuil:
+                    resultats[paire] = round(score, 3)
+        return resultats
+
+    @staticmethod
+    def enregistrer(db: Session, paires: Dict[Tuple[int, int], float]) -> int:
+        """Ajoute les paires à la file de revue (une paire déjà connue est ignorée)"""
+        if not paires:
+            return 0
+        resultat = db.execute(
+            insert(DoublonCas)
+            .values([
+                {"cas_id": cas_id, "doublon_de_id": doublon_de_id, "score": score, "statut": "a_verifier"}
+                for (cas_id, doublon_de_id), score in paires.items()
+            ])
+            .on_conflict_do_nothing(constraint="uq_doublons_cas_paire")
+        )
+        return resultat.rowcount
+
+    def detecter_nouveaux(self, db: Session, cas_ids: Iterable[int]) -> int:
+        """
+        Détection incrémentale : chaque nouveau cas est comparé aux cas de même
+        maladie et district dont la semaine des symptômes est la sienne ou
+        une semaine voisine
+        """
+        nouveaux = db.execute(select(*COLONNES).where(Cas.id.in_(list(cas_ids)), Cas.nom.isnot(None))).all()
+        groupes = {(c.maladie_id, c.district_id, semaine(c.date_symptomes)) for c in nouveaux}
+        total = 0
+        for maladie_id, district_id, lundi in groupes:
+            lignes = db.execute(select(*COLONNES).where(
+                Cas.maladie_id == maladie_id,
+                Cas.district_id == district_id,
+                Cas.date_symptomes.between(lundi - timedelta(weeks=1), lundi + timedelta(days=13)),
+                Cas.nom.isnot(None)
+            )).all()
+            total += self.enregistrer(db, self.paires(lignes, {c.id for c in nouveaux}))
+        db.commit()
+        return total
+
+    def detecter_historique(
+        self,
+        db: Session,
+        date_debut: Optional[date] = None,
+        date_fin: Optional[date] = None,
+        taille_lot: int = 10000
+    ) -> Dict[str, int]:
+        """
+        Détection en lot : les cas sont lus en flux, triés par (maladie,
+        district, date des symptômes) ; chaque groupe (maladie, district,
+        semaine) est traité dès qu'il est complet, la mémoire reste bornée
+        """
+        query = select(*COLONNES).where(Cas.nom.isnot(None))
+        if date_debut:
+            query = query.where(Cas.date_symptomes >= semaine(date_debut))
+        if date_fin:
+            query = query.where(Cas.date_symptomes <= date_fin)
+        query = query.order_by(Cas.maladie_id, Cas.district_id, Cas.date_symptomes)
+
+        lecture = db.connection().execution_options(stream_results=True, yield_per=taille_lot)
+        stats = {"cas": 0, "groupes": 0, "paires": 0}
+        groupe, cle_groupe = [], None
+        a_enregistrer: Dict[Tuple[int, int], float] = {}
+
+        def traiter():
+            a_enregistrer.update(self.paires(groupe))
+            stats["groupes"] += 1
+
+        for ligne in lecture.execute(query):
+            cle = (ligne.maladie_id, ligne.district_id, semaine(ligne.date_symptomes))
+            if cle != cle_groupe and groupe:
+                traiter()
+                groupe = []
+            cle_groupe = cle
+            groupe.append(ligne)
+            stats["cas"] += 1
+        if groupe:
+            traiter()
+
+        # Écriture après la lecture : le curseur serveur reste seul sur la connexion
+        paires = list(a_enregistrer.items())
+        for debut in range(0, len(paires), taille_lot):
+            stats["paires"] += self.enregistrer(db, dict(paires[debut:debut + taille_lot]))
+        db.commit()
+        return stats
+
+    @staticmethod
+    def cas_doublons_confirmes():
+        """Sous-requête des cas confirmés comme doublons (à exclure des comptages)"""
+        return select(DoublonCas.cas_id).where(DoublonCas.statut == "confirme")
+
+
+doublon_service = DoublonService(settings.DOUBLONS_SEUIL_SIMILARITE)
+
+
+def detecter_nouveaux_cas(cas_ids: List[int]):
+    """Tâche de fond après création, import ou modification (BackgroundTasks) : session OLTP dédiée"""
+    try:
+        with SessionLocal() as db:
+            doublon_service.detecter_nouveaux(db, cas_ids)
+    except Exception:
+        logger.exception("Détection des doublons échouée pour %d cas", len(cas_ids))
@@ -17,12 +17,18 @@ from app.models.intervention import Intervention
 from app.models.maladie import Maladie
 from app.models.district import District
 from app.models.centre_sante import CentreSante
+from app.utils.enums import WorkloadClass
+from app.core.metrics import timed_document
 
 
 class ExportService:
     """Service pour les exports de données"""
+
+    # Requêtes longues : pool reporting (voir app/core/database.py)
+    workload = WorkloadClass.REPORTING
     
     @staticmethod
+    @timed_document("xlsx", "cas")
     def export_cas_excel(
         db: Session,
         date_debut: Optional[date] = None,
@@ -118,6 +124,7 @@ class ExportService:
         return buffer
     
     @staticmethod
+    @timed_document("csv", "cas")
     def export_cas_csv(
         db: Session,
         date_debut: Optional[date] = None,
@@ -187,6 +194,7 @@ class ExportService:
         return buffer
     
     @staticmethod
+    @timed_document("xlsx", "alertes")
     def export_alertes_excel(
         db: Session,
         date_debut: Optional[date] = None,
@@ -261,6 +269,7 @@ class ExportService:
         return buffer
     
     @staticmethod
+    @timed_document("xlsx", "interventions")
     def export_interventions_excel(
         db: Session,
         date_debut: Optional[date] = None,
@@ -0,0 +1,378 @@
+# app/services/import_service.py
+"""
+📄 Fichier: app/services/import_service.py
+📝 Description: Import des cas depuis un fichier CSV ou XLSX (inverse de l'export)
+"""
+
+import csv
+import io
+import re
+from datetime import date, datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.cas import CRUDCas
+from app.models.cas import Cas
+from app.models.centre_sante import CentreSante
+from app.models.compteur_cas import PREFIXE_NUMERO
+from app.models.district import District
+from app.models.maladie import Maladie
+from app.schemas.cas import CasCreate
+from app.services.agregat_service import COLONNES_CAS as COLONNES_AGREGATS, agregat_service
+from app.utils.enums import CasStatut, Sexe
+from app.utils.texte import normaliser
+
+
+# En-têtes de ExportService.export_cas_excel / export_cas_csv (+ coordonnées GPS),
+# normalisés (minuscules, sans accents)
+COLONNES = {
+    "n° cas": "numero_cas",
+    "nom patient": "nom",
+    "maladie": "maladie",
+    "district": "district",
+    "centre de sante": "centre_sante",
+    "date symptomes": "date_symptomes",
+    "date declaration": "date_declaration",
+    "age": "age",
+    "sexe": "sexe",
+    "statut": "statut",
+    "observations": "observations",
+    "latitude": "latitude",
+    "longitude": "longitude",
+}
+COLONNES_REQUISES = {"maladie", "district", "centre_sante", "date_symptomes", "date_declaration"}
+
+COLONNES_STAGING = [
+    "ligne", "numero_cas", "nom", "maladie_id", "centre_sante_id", "district_id",
+    "date_symptomes", "date_declaration", "age", "sexe", "statut", "latitude", "longitude", "observations",
+]
+
+NUMERO_CAS = re.compile(r"^VAKIN-\d{4}-\d+$")
+VIDES = {"", "n/a", "na", "none", "null", "-"}
+
+
+class FichierInvalide(ValueError):
+    """Fichier illisible ou en-têtes obligatoires absents"""
+
+
+class ReferentielCas:
+    """Correspondances nom/code -> id des maladies, districts et centres, chargées une fois"""
+
+    def __init__(self, db: Session):
+        self.maladies: Dict[str, int] = {}
+        for id_, nom, code in db.execute(select(Maladie.id, Maladie.nom, Maladie.code)):
+            self.maladies[normaliser(nom)] = id_
+            if code:
+                self.maladies.setdefault(normaliser(code), id_)
+
+        self.districts: Dict[str, int] = {}
+        for id_, nom, code in db.execute(select(District.id, District.nom, District.code)):
+            self.districts[normaliser(nom)] = id_
+            if code:
+                self.districts.setdefault(normaliser(code), id_)
+
+        # Un même nom de centre peut exister dans deux districts : clé (district, nom)
+        self.centres: Dict[Tuple[int, str], int] = {}
+        for id_, nom, district_id in db.execute(
+            select(CentreSante.id, CentreSante.nom, CentreSante.district_id)
+        ):
+            self.centres[(district_id, normaliser(nom))] = id_
+
+
+class ImportService:
+    """Import de cas en flux : lecture par tranches, COPY en table de staging, fusion dans cas"""
+
+    @staticmethod
+    def lire_csv(fichier: IO[bytes]) -> Iterator[List]:
+        """Lignes d'un CSV (séparateur ; ou , détecté sur l'en-tête), BOM toléré"""
+        flux = io.TextIOWrapper(fichier, encoding="utf-8-sig", newline="")
+        try:
+            entete = flux.readline()
+            delimiteur = ";" if entete.count(";") >= entete.count(",") else ","
+            yield next(csv.reader([entete], delimiter=delimiteur), [])
+            yield from csv.reader(flux, delimiter=delimiteur)
+        except UnicodeDecodeError:
+            raise FichierInvalide("Fichier CSV illisible : encodage UTF-8 attendu")
+        except csv.Error as exc:
+            raise FichierInvalide(f"Fichier CSV illisible : {exc}")
+
+    @staticmethod
+    def lire_xlsx(fichier: IO[bytes]) -> Iterator[List]:
+        """Lignes de la première feuille, en mode lecture seule (pas de chargement complet)"""
+        import zlib
+        from xml.etree.ElementTree import ParseError
+        from zipfile import BadZipFile
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+
+        # Archive ZIP ou XML abîmés : à l'ouverture comme pendant la lecture (mode lecture seule)
+        erreurs_xlsx = (BadZipFile, InvalidFileException, KeyError, IndexError, zlib.error, ParseError)
+        try:
+            classeur = load_workbook(fichier, read_only=True, data_only=True)
+        except erreurs_xlsx:
+            raise FichierInvalide("Fichier XLSX illisible")
+        try:
+            for ligne in classeur.worksheets[0].iter_rows(values_only=True):
+                yield list(ligne)
+        except erreurs_xlsx:
+            raise FichierInvalide("Fichier XLSX illisible")
+        finally:
+            classeur.close()
+
+    # ========================================
+    # 🔎 CONVERSION D'UNE LIGNE
+    # ========================================
+
+    @staticmethod
+    def _vide(valeur) -> bool:
+        return valeur is None or (isinstance(valeur, str) and valeur.strip().lower() in VIDES)
+
+    @staticmethod
+    def _date(valeur) -> date:
+        if isinstance(valeur, datetime):
+            return valeur.date()
+        if isinstance(valeur, date):
+            return valeur
+        texte = str(valeur).strip()
+        for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
+            try:
+                return datetime.strptime(texte, fmt).date()
+            except ValueError:
+                continue
+        raise ValueError(f"date illisible « {texte} »")
+
+    @staticmethod
+    def _enum(enum_cls, valeur):
+        """Accepte la valeur (masculin), le nom (MASCULIN), Sexe.MASCULIN ou l'initiale"""
+        cle = normaliser(valeur).split(".")[-1]
+        for membre in enum_cls:
+            if cle in (membre.value, membre.name.lower()):
+                return membre
+        for membre in enum_cls:
+            if len(cle) == 1 and membre.value.startswith(cle):
+                return membre
+        raise ValueError(f"valeur « {valeur} » inconnue")
+
+    def convertir(self, brut: Dict, referentiel: ReferentielCas) -> Tuple[Optional[str], CasCreate]:
+        """Ligne brute (colonnes normalisées) -> (numéro éventuel, CasCreate) ; ValueError sinon"""
+        erreurs = []
+        valeurs = {}
+
+        def champ(nom, conversion):
+            brute = brut.get(nom)
+            if self._vide(brute):
+                return
+            try:
+                valeurs[nom] = conversion(brute)
+            except (ValueError, TypeError) as exc:
+                erreurs.append(f"{nom}: {exc}")
+
+        district_id = referentiel.districts.get(normaliser(brut.get("district") or ""))
+        if district_id is None:
+            erreurs.append(f"district: « {brut.get('district')} » inconnu")
+        maladie_id = referentiel.maladies.get(normaliser(brut.get("maladie") or ""))
+        if maladie_id is None:
+            erreurs.append(f"maladie: « {brut.get('maladie')} » inconnue")
+        centre_id = referentiel.centres.get((district_id, normaliser(brut.get("centre_sante") or "")))
+        if centre_id is None:
+            erreurs.append(f"centre_sante: « {brut.get('centre_sante')} » inconnu dans ce district")
+
+        champ("date_symptomes", self._date)
+        champ("date_declaration", self._date)
+        champ("age", lambda v: int(float(v)))
+        champ("sexe", lambda v: self._enum(Sexe, v))
+        champ("statut", lambda v: self._enum(CasStatut, v))
+        champ("latitude", lambda v: float(str(v).replace(",", ".")))
+        champ("longitude", lambda v: float(str(v).replace(",", ".")))
+        champ("nom", lambda v: str(v).strip())
+        champ("observations", lambda v: str(v).strip())
+
+        numero = None
+        if not self._vide(brut.get("numero_cas")):
+            numero = str(brut["numero_cas"]).strip()
+            if not NUMERO_CAS.match(numero):
+                erreurs.append(f"numero_cas: « {numero} » n'est pas au format VAKIN-AAAA-NNNNN")
+
+        if erreurs:
+            raise ValueError(erreurs)
+        try:
+            cas = CasCreate(
+                maladie_id=maladie_id, district_id=district_id, centre_sante_id=centre_id, **valeurs
+            )
+        except ValidationError as exc:
+            raise ValueError([
+                f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()
+            ])
+        return numero, cas
+
+    # ========================================
+    # 📥 IMPORT
+    # ========================================
+
+    def import_cas(self, db: Session, fichier: IO[bytes], format: str, created_by: int) -> Tuple[Dict, List[int]]:
+        """
+        Importe un fichier de cas en une transaction ; renvoie le rapport et
+        les id des cas insérés (détection des doublons)
+
+        Les lignes sont lues et converties par tranches de IMPORT_CAS_TRANCHE,
+        copiées (COPY) dans une table temporaire, puis fusionnées dans cas :
+        - numéro présent et déjà en base : ligne ignorée
+        - numéro présent et nouveau : conservé, compteur de l'année relevé
+        - sans numéro : numéro attribué en un bloc (CRUDCas.allouer_numeros)
+        """
+        lignes = self.lire_xlsx(fichier) if format == "xlsx" else self.lire_csv(fichier)
+        entete = [COLONNES.get(normaliser(c)) if c is not None else None for c in next(lignes, [])]
+        manquantes = COLONNES_REQUISES - set(entete)
+        if manquantes:
+            raise FichierInvalide(f"Colonnes obligatoires absentes : {', '.join(sorted(manquantes))}")
+
+        referentiel = ReferentielCas(db)
+        db.execute(text(f"SET LOCAL statement_timeout = {int(settings.IMPORT_CAS_STATEMENT_TIMEOUT_MS)}"))
+        db.execute(text("""
+            CREATE TEMP TABLE import_cas (
+                ligne integer, numero_cas text, nom text, maladie_id integer,
+                centre_sante_id integer, district_id integer, date_symptomes date,
+                date_declaration date, age integer, sexe text, statut text,
+                latitude double precision, longitude double precision, observations text
+            ) ON COMMIT DROP
+        """))
+        curseur = db.connection().connection.cursor()
+
+        total, rejetes, erreurs = 0, 0, []
+        tampon, writer, en_tampon = None, None, 0
+        # La 1re ligne de données est la ligne 2 du fichier (après l'en-tête)
+        for numero_ligne, valeurs in enumerate(lignes, start=2):
+            if all(self._vide(v) for v in valeurs):
+                continue
+            total += 1
+            brut = {nom: v for nom, v in zip(entete, valeurs) if nom}
+            try:
+                numero, cas = self.convertir(brut, referentiel)
+            except ValueError as exc:
+                rejetes += 1
+                if len(erreurs) < settings.IMPORT_CAS_MAX_ERREURS:
+                    erreurs.append({"ligne": numero_ligne, "erreurs": exc.args[0]})
+                continue
+
+            if tampon is None:
+                tampon = io.StringIO()
+                writer = csv.writer(tampon)
+            writer.writerow([
+                numero_ligne, numero, cas.nom, cas.maladie_id, cas.centre_sante_id, cas.district_id,
+                cas.date_symptomes.isoformat(), cas.date_declaration.isoformat(), cas.age,
+                cas.sexe.name if cas.sexe else None, cas.statut.name,
+                cas.latitude, cas.longitude, cas.observations,
+            ])
+            en_tampon += 1
+            if en_tampon >= settings.IMPORT_CAS_TRANCHE:
+                self._copier(curseur, tampon)
+                tampon, en_tampon = None, 0
+        if tampon is not None:
+            self._copier(curseur, tampon)
+
+        cas_ids, ignores = self._fusionner(db, created_by)
+        db.commit()
+        return {
+            "total_lignes": total,
+            "importes": len(cas_ids),
+            "ignores": ignores,
+            "rejetes": rejetes,
+            "erreurs": erreurs,
+        }, cas_ids
+
+    @staticmethod
+    def _copier(curseur, tampon: io.StringIO):
+        tampon.seek(0)
+        curseur.copy_expert(
+            f"COPY import_cas ({', '.join(COLONNES_STAGING)}) FROM STDIN WITH (FORMAT csv)", tampon
+        )
+
+    @staticmethod
+    def _numeroter(db: Session) -> None:
+        """
+        Relève les compteurs au-dessus des numéros importés et numérote les
+        lignes qui n'en ont pas. Les compteurs sont modifiés dans une courte
+        transaction séparée (pool OLTP), validée aussitôt : la fusion qui suit
+        ne garde pas leur verrou et ne bloque pas la saisie. Si l'import échoue
+        ensuite, les numéros attribués sont perdus (trou dans la séquence).
+        """
+        maximums = [dict(ligne) for ligne in db.execute(text("""
+            SELECT split_part(numero_cas, '-', 1) AS prefixe, split_part(numero_cas, '-', 2)::int AS annee,
+                   max(split_part(numero_cas, '-', 3)::int) AS dernier_numero
+            FROM import_cas WHERE numero_cas IS NOT NULL
+            GROUP BY 1, 2
+        """)).mappings()]
+        sans_numero = db.execute(text("SELECT count(*) FROM import_cas WHERE numero_cas IS NULL")).scalar_one()
+        if not maximums and not sans_numero:
+            return
+
+        annee = datetime.now().year
+        with SessionLocal() as compteurs:
+            # Les numéros importés ne doivent pas être réattribués plus tard
+            if maximums:
+                compteurs.execute(text("""
+                    INSERT INTO compteurs_cas (prefixe, annee, dernier_numero)
+                    VALUES (:prefixe, :annee, :dernier_numero)
+                    ON CONFLICT (prefixe, annee) DO UPDATE
+                    SET dernier_numero = GREATEST(compteurs_cas.dernier_numero, EXCLUDED.dernier_numero)
+                """), sorted(maximums, key=lambda m: (m["prefixe"], m["annee"])))
+            premier = (
+                int(CRUDCas.allouer_numeros(compteurs, annee, sans_numero)[0].rsplit("-", 1)[1])
+                if sans_numero else None
+            )
+            compteurs.commit()
+
+        if sans_numero:
+            db.execute(text("""
+                UPDATE import_cas AS s
+                SET numero_cas = :prefixe || '-' || :annee || '-' || lpad(n.numero::text, greatest(5, length(n.numero::text)), '0')
+                FROM (
+                    SELECT ligne, :premier + row_number() OVER (ORDER BY ligne) - 1 AS numero
+                    FROM import_cas WHERE numero_cas IS NULL
+                ) AS n
+                WHERE s.ligne = n.ligne
+            """), {"prefixe": PREFIXE_NUMERO, "annee": annee, "premier": premier})
+
+    def _fusionner(self, db: Session, created_by: int) -> Tuple[List[int], int]:
+        """
+        Fusionne import_cas dans cas ; renvoie (id des cas insérés, ignorés). Les dates
+        sans partition annuelle vont dans cas_defaut (partitions créées par
+        init_db et la tâche annuelle, pas pendant l'import).
+        """
+        en_attente = db.execute(text("SELECT count(*) FROM import_cas")).scalar_one()
+        if not en_attente:
+            return [], 0
+        self._numeroter(db)
+
+        # cas est partitionnée : pas d'ON CONFLICT sur numero_cas. Un numéro
+        # déjà attribué (numeros_cas, y compris les cas archivés ou supprimés)
+        # ou répété dans le fichier est ignoré ; le verrou consultatif
+        # sérialise les fusions, le déclencheur de numeros_cas garantit le reste.
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('cas.numero_cas'))"))
+        type_sexe = Cas.__table__.c.sexe.type.name
+        type_statut = Cas.__table__.c.statut.type.name
+        importes = db.execute(text(f"""
+            INSERT INTO cas (numero_cas, nom, maladie_id, centre_sante_id, district_id, date_symptomes,
+                             date_declaration, age, sexe, statut, latitude, longitude, observations, created_by)
+            SELECT numero_cas, nom, maladie_id, centre_sante_id, district_id, date_symptomes,
+                   date_declaration, age, sexe::{type_sexe}, statut::{type_statut},
+                   latitude, longitude, observations, :created_by
+            FROM (
+                SELECT DISTINCT ON (numero_cas) * FROM import_cas s
+                WHERE NOT EXISTS (SELECT 1 FROM numeros_cas n WHERE n.numero_cas = s.numero_cas)
+                ORDER BY numero_cas, ligne
+            ) AS nouveaux
+            ORDER BY ligne
+            RETURNING id, {', '.join(COLONNES_AGREGATS)}
+        """), {"created_by": created_by}).all()
+        agregat_service.ajouter(db, importes)
+        return [ligne.id for ligne in importes], en_attente - len(importes)
+
+
+# Instance globale
+import_service = ImportService()
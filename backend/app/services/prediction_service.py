@@ -4,21 +4,28 @@
 📝 Description: Service de prédiction épidémiologique avec Prophet et analyse IA
 """
 
+import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta, date
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 import pandas as pd
-from prophet import Prophet
 import numpy as np
 
-from app.models.cas import Cas
+from app.models.cas_daily_agg import AXE_SYMPTOMES, CasDailyAgg
 from app.models.prediction import Prediction
+from app.services.agregat_service import NOMBRE, conditions
+from app.utils.enums import WorkloadClass
+from app.core.metrics import PROPHET_FIT_DURATION, observe
+
+logger = logging.getLogger(__name__)
 
 
 class PredictionService:
     """Service de prédiction avec Prophet et analyse IA"""
     
+    # Historique lu sur le réplica si disponible, prédiction écrite sur la primaire
+    workload = WorkloadClass.REPORTING
+
     @staticmethod
     def preparer_donnees_prophet(
         db: Session,
@@ -33,17 +40,13 @@ class PredictionService:
         date_debut = datetime.now().date() - timedelta(days=jours_historique)
         
         query = db.query(
-            func.date(Cas.date_symptomes).label('date'),
-            func.count(Cas.id).label('cas')
-        ).filter(
-            Cas.maladie_id == maladie_id,
-            Cas.date_symptomes >= date_debut
-        )
-        
-        if district_id:
-            query = query.filter(Cas.district_id == district_id)
+            CasDailyAgg.jour.label('date'),
+            NOMBRE.label('cas')
+        ).filter(*conditions(
+            AXE_SYMPTOMES, maladie_id=maladie_id, district_id=district_id, date_debut=date_debut
+        ))
         
-        resultats = query.group_by(func.date(Cas.date_symptomes)).order_by('date').all()
+        resultats = query.group_by(CasDailyAgg.jour).order_by(CasDailyAgg.jour).all()
         
         # Conversion en DataFrame Prophet
         df = pd.DataFrame([
@@ -86,6 +89,9 @@ class PredictionService:
             }
         
         try:
+            # Import à la demande : Prophet (et cmdstan) coûte plusieurs secondes
+            from prophet import Prophet
+
             # 2. Créer et entraîner le modèle Prophet
             model = Prophet(
                 daily_seasonality=True,
@@ -95,7 +101,8 @@ class PredictionService:
                 interval_width=0.95
             )
             
-            model.fit(df)
+            with observe(PROPHET_FIT_DURATION):
+                model.fit(df)
             
             # 3. Créer le DataFrame de prédiction
             future = model.make_future_dataframe(periods=horizon_jours)
@@ -274,79 +281,52 @@ class PredictionService:
                 "horizon_prediction": f"{metriques['horizon_jours']} jours"
             }
         }
-    
-
 
-@staticmethod
-def sauvegarder_prediction(
-    db: Session,
-    maladie_id: int,
-    district_id: int,
-    predictions: List[Dict],
-    metriques: Dict,
-    created_by: int
-):
-    """Sauvegarde les prédictions dans la BD avec logs détaillés"""
-    
-    print("="*80)
-    print(f"🔵 DÉBUT SAUVEGARDE PRÉDICTIONS")
-    print(f"   📊 Nombre de prédictions: {len(predictions)}")
-    print(f"   🦠 Maladie ID: {maladie_id}")
-    print(f"   📍 District ID: {district_id}")
-    print(f"   👤 Créé par: {created_by}")
-    print("="*80)
-    
-    if not predictions:
-        print("❌ ERREUR: Aucune prédiction à sauvegarder")
-        return
-    
-    saved_count = 0
-    for i, pred in enumerate(predictions, 1):
-        try:
-            print(f"\n📝 Prédiction {i}/{len(predictions)}")
-            print(f"   Date: {pred['date']}")
-            print(f"   Cas prédits: {pred['cas_predits']}")
-            
-            prediction_db = Prediction(
-                maladie_id=maladie_id,
-                district_id=district_id,
-                date_prediction=datetime.strptime(pred['date'], '%Y-%m-%d').date(),
-                horizon_jours=metriques['horizon_jours'],
-                cas_predits=pred['cas_predits'],
-                intervalle_min=pred['intervalle_min'],
-                intervalle_max=pred['intervalle_max'],
-                confiance_score=metriques['confiance_score'],
-                modele_utilise="Prophet",
-                parametres=str(metriques),
-                created_by=created_by
-            )
-            
-            db.add(prediction_db)
-            saved_count += 1
-            print(f"   ✅ Ajouté à la session")
-            
-        except Exception as e:
-            print(f"   ❌ ERREUR sur prédiction {i}: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    print(f"\n💾 Tentative de COMMIT de {saved_count} prédictions...")
-    
-    try:
-        db.commit()
-        print(f"✅ ✅ ✅ COMMIT RÉUSSI - {saved_count} prédictions sauvegardées")
+    @staticmethod
+    def sauvegarder_prediction(
+        db: Session,
+        maladie_id: int,
+        district_id: int,
+        predictions: List[Dict],
+        metriques: Dict,
+        created_by: int
+    ):
+        """Sauvegarde les prédictions dans la BD"""
+        if not predictions:
+            logger.warning(f"Aucune prédiction à sauvegarder (maladie {maladie_id}, district {district_id})")
+            return
         
-        # Vérifie dans la BD
-        count = db.query(Prediction).filter(Prediction.maladie_id == maladie_id).count()
-        print(f"🔍 Vérification: {count} prédictions totales pour maladie {maladie_id}")
+        saved_count = 0
+        for i, pred in enumerate(predictions, 1):
+            try:
+                prediction_db = Prediction(
+                    maladie_id=maladie_id,
+                    district_id=district_id,
+                    date_prediction=datetime.strptime(pred['date'], '%Y-%m-%d').date(),
+                    horizon_jours=metriques['horizon_jours'],
+                    cas_predits=pred['cas_predits'],
+                    intervalle_min=pred['intervalle_min'],
+                    intervalle_max=pred['intervalle_max'],
+                    confiance_score=metriques['confiance_score'],
+                    modele_utilise="Prophet",
+                    parametres=str(metriques),
+                    created_by=created_by
+                )
+                db.add(prediction_db)
+                saved_count += 1
+            except Exception:
+                logger.exception(f"❌ Prédiction {i}/{len(predictions)} ignorée ({pred.get('date')})")
         
-    except Exception as e:
-        print(f"❌ ❌ ❌ ERREUR COMMIT: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    
-    print("="*80)
-    print(f"🔵 FIN SAUVEGARDE PRÉDICTIONS")
-    print("="*80)
+        try:
+            db.commit()
+        except Exception:
+            logger.exception(f"❌ Échec du commit des prédictions (maladie {maladie_id})")
+            db.rollback()
+            raise
+        
+        logger.info(
+            f"💾 {saved_count} prédictions sauvegardées "
+            f"(maladie {maladie_id}, district {district_id}, par {created_by})"
+        )
+
+prediction_service = PredictionService()
@@ -7,12 +7,11 @@
 from typing import Dict, List
 from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-import numpy as np
 
-from app.models.cas import Cas
+from app.models.cas_daily_agg import AXE_DECLARATION, CasDailyAgg
 from app.models.alerte import Alerte
 from app.models.intervention import Intervention
+from app.services.agregat_service import NOMBRE, conditions
 from app.utils.enums import CasStatut, AlerteNiveau
 
 
@@ -73,20 +72,16 @@ Avec {deces} décès enregistrés, le taux de létalité s'établit à {taux_let
         periode_precedente_debut = date_debut - timedelta(days=duree)
         
         # Période actuelle
-        query_actuel = db.query(func.count(Cas.id)).filter(
-            Cas.date_declaration >= date_debut,
-            Cas.date_declaration <= date_fin
-        )
+        query_actuel = db.query(NOMBRE).filter(*conditions(
+            district_id=district_id, date_debut=date_debut, date_fin=date_fin
+        ))
         
         # Période précédente
-        query_precedent = db.query(func.count(Cas.id)).filter(
-            Cas.date_declaration >= periode_precedente_debut,
-            Cas.date_declaration < date_debut
-        )
-        
-        if district_id:
-            query_actuel = query_actuel.filter(Cas.district_id == district_id)
-            query_precedent = query_precedent.filter(Cas.district_id == district_id)
+        query_precedent = db.query(NOMBRE).filter(*conditions(
+            district_id=district_id,
+            date_debut=periode_precedente_debut,
+            date_fin=date_debut - timedelta(days=1)
+        ))
         
         cas_actuel = query_actuel.scalar() or 0
         cas_precedent = query_precedent.scalar() or 0
@@ -187,12 +182,13 @@ Avec {deces} décès enregistrés, le taux de létalité s'établit à {taux_let
         districts_data = db.query(
             District.nom,
             District.population,
-            func.count(Cas.id).label('cas')
+            NOMBRE.label('cas')
         ).outerjoin(
-            Cas,
-            (Cas.district_id == District.id) &
-            (Cas.date_declaration >= date_debut) &
-            (Cas.date_declaration <= date_fin)
+            CasDailyAgg,
+            (CasDailyAgg.district_id == District.id) &
+            (CasDailyAgg.axe == AXE_DECLARATION) &
+            (CasDailyAgg.jour >= date_debut) &
+            (CasDailyAgg.jour <= date_fin)
         ).group_by(District.id, District.nom, District.population).all()
         
         analyse = []
@@ -27,12 +27,17 @@ from app.models.maladie import Maladie
 from app.models.alerte import Alerte
 from app.models.intervention import Intervention
 from app.models.prediction import Prediction
-from app.utils.enums import CasStatut
+from app.utils.enums import CasStatut, WorkloadClass
+from app.core.metrics import timed_document
 from app.services.rapport_ia_service import rapport_ia_service
+from app.services.archive_service import archive_service
 
 
 class RapportService:
     """Service pour la génération de rapports PDF intelligents"""
+
+    # Requêtes longues : pool reporting (voir app/core/database.py)
+    workload = WorkloadClass.REPORTING
     
     @staticmethod
     def _get_styles():
@@ -136,6 +141,7 @@ class RapportService:
         elements.append(Spacer(1, 1*cm))
     
     @staticmethod
+    @timed_document("pdf", "rapport_hebdomadaire")
     def generate_rapport_hebdomadaire(
         db: Session,
         date_debut: date,
@@ -374,6 +380,7 @@ class RapportService:
         return buffer
     
     @staticmethod
+    @timed_document("pdf", "rapport_interventions")
     def generate_rapport_interventions(
         db: Session,
         date_debut: date,
@@ -456,6 +463,7 @@ Statut: {intervention.statut} | Score d'efficacité: {intervention.efficacite_sc
     # app/services/rapport_service.py (SUITE - AJOUTE CES MÉTHODES)
 
     @staticmethod
+    @timed_document("pdf", "rapport_predictions")
     def generate_rapport_predictions(
         db: Session,
         maladie_id: int,
@@ -670,6 +678,7 @@ Elles doivent être utilisées comme outil d'aide à la décision et non comme c
         return buffer
     
     @staticmethod
+    @timed_document("pdf", "rapport_global")
     def generate_rapport_global(
         db: Session,
         annee: int,
@@ -712,11 +721,15 @@ de surveillance, d'intervention et d'analyse prédictive.
         elements.append(Paragraph(intro_text, styles['Justified']))
         elements.append(Spacer(1, 0.5*cm))
         
-        # STATISTIQUES GLOBALES DU SYSTÈME
+        # STATISTIQUES GLOBALES DU SYSTÈME (cas clôturés archivés compris)
+        archives = archive_service.fichiers(db, date_debut=date_debut, date_fin=date_fin)
+        periode = {"date_debut": date_debut, "date_fin": date_fin}
+        
         total_cas = db.query(func.count(Cas.id)).filter(
             Cas.date_declaration >= date_debut,
             Cas.date_declaration <= date_fin
         ).scalar() or 0
+        total_cas += archive_service.compter(archives, **periode)
         
         total_alertes = db.query(func.count(Alerte.id)).filter(
             Alerte.date_detection >= date_debut,
@@ -733,6 +746,14 @@ de surveillance, d'intervention et d'analyse prédictive.
             Cas.date_declaration <= date_fin,
             Cas.statut == CasStatut.DECEDE
         ).scalar() or 0
+        total_deces += archive_service.compter(archives, statuts=[CasStatut.DECEDE], **periode)
+        
+        centres_actifs = {
+            centre_id for (centre_id,) in db.query(Cas.centre_sante_id).filter(
+                Cas.date_declaration >= date_debut,
+                Cas.date_declaration <= date_fin
+            ).distinct()
+        } | archive_service.distincts(archives, "centre_sante_id", **periode)
         
         taux_letalite_global = (total_deces / total_cas * 100) if total_cas > 0 else 0
         
@@ -745,12 +766,7 @@ de surveillance, d'intervention et d'analyse prédictive.
             ['Interventions menées', str(total_interventions), '🎯'],
             ['Taux de létalité global', f"{taux_letalite_global:.2f}%", '⚕️'],
             ['Districts couverts', '7/7', '✅'],
-            ['Centres de santé actifs', 
-             str(db.query(func.count(func.distinct(Cas.centre_sante_id))).filter(
-                 Cas.date_declaration >= date_debut,
-                 Cas.date_declaration <= date_fin
-             ).scalar() or 0), 
-             '🏥']
+            ['Centres de santé actifs', str(len(centres_actifs)), '🏥']
         ]
         
         table_global = Table(data_global, colWidths=[9*cm, 4*cm, 2*cm])
@@ -770,13 +786,21 @@ de surveillance, d'intervention et d'analyse prédictive.
         # TOP 5 MALADIES
         elements.append(Paragraph("🦠 MALADIES LES PLUS SURVEILLÉES", styles['CustomSubtitle']))
         
-        top_maladies = db.query(
-            Maladie.nom,
-            func.count(Cas.id).label('cas')
-        ).join(Cas).filter(
+        cas_par_maladie = dict(db.query(
+            Cas.maladie_id,
+            func.count(Cas.id)
+        ).filter(
             Cas.date_declaration >= date_debut,
             Cas.date_declaration <= date_fin
-        ).group_by(Maladie.nom).order_by(func.count(Cas.id).desc()).limit(5).all()
+        ).group_by(Cas.maladie_id).all())
+        for maladie_id, cas in archive_service.compter_par(archives, "maladie_id", **periode).items():
+            cas_par_maladie[maladie_id] = cas_par_maladie.get(maladie_id, 0) + cas
+        noms_maladies = dict(db.query(Maladie.id, Maladie.nom).filter(Maladie.id.in_(cas_par_maladie)).all())
+        top_maladies = sorted(
+            ((noms_maladies.get(maladie_id, "?"), cas) for maladie_id, cas in cas_par_maladie.items()),
+            key=lambda item: item[1],
+            reverse=True
+        )[:5]
         
         data_maladies = [['Rang', 'Maladie', 'Nombre de cas', '% du total']]
         for i, (nom, cas) in enumerate(top_maladies, 1):
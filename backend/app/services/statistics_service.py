@@ -1,21 +1,26 @@
 # app/services/statistics_service.py
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta, date
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 
-from app.models.cas import Cas
+from app.models.cas_daily_agg import CasDailyAgg
 from app.models.district import District
-from app.models.maladie import Maladie
+from app.services.agregat_service import NOMBRE, conditions
 from app.utils.enums import CasStatut
 
 
 class StatisticsService:
-    """Service pour les calculs statistiques avancés"""
+    """
+    Service pour les calculs statistiques avancés (session asynchrone)
+
+    Les comptages somment cas_daily_agg (axe date de déclaration), qui
+    compte aussi les cas clôturés archivés en Parquet.
+    """
     
     @staticmethod
-    def calculate_incidence_rate(
-        db: Session,
+    async def calculate_incidence_rate(
+        db: AsyncSession,
         district_id: int,
         maladie_id: Optional[int] = None,
         date_debut: Optional[date] = None,
@@ -25,27 +30,22 @@ class StatisticsService:
         Calcul du taux d'incidence pour 100,000 habitants
         Formule : (Nombre de cas / Population) * 100,000
         """
-        district = db.query(District).filter(District.id == district_id).first()
+        district = await db.get(District, district_id)
         if not district or not district.population:
             return 0.0
         
-        query = db.query(func.count(Cas.id)).filter(Cas.district_id == district_id)
-        
-        if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
-        if date_debut:
-            query = query.filter(Cas.date_declaration >= date_debut)
-        if date_fin:
-            query = query.filter(Cas.date_declaration <= date_fin)
+        query = select(NOMBRE).where(*conditions(
+            district_id=district_id, maladie_id=maladie_id, date_debut=date_debut, date_fin=date_fin
+        ))
         
-        nombre_cas = query.scalar() or 0
+        nombre_cas = (await db.execute(query)).scalar() or 0
         
         taux_incidence = (nombre_cas / district.population) * 100000
         return round(taux_incidence, 2)
     
     @staticmethod
-    def calculate_case_fatality_rate(
-        db: Session,
+    async def calculate_case_fatality_rate(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         district_id: Optional[int] = None,
         date_debut: Optional[date] = None,
@@ -55,32 +55,25 @@ class StatisticsService:
         Calcul du taux de létalité
         Formule : (Nombre de décès / Nombre de cas confirmés) * 100
         """
-        query = db.query(Cas)
-        
-        if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
-        if district_id:
-            query = query.filter(Cas.district_id == district_id)
-        if date_debut:
-            query = query.filter(Cas.date_declaration >= date_debut)
-        if date_fin:
-            query = query.filter(Cas.date_declaration <= date_fin)
-        
-        total_cas = query.filter(
-            Cas.statut.in_([CasStatut.CONFIRME, CasStatut.GUERI, CasStatut.DECEDE])
-        ).count()
+        filtres = dict(maladie_id=maladie_id, district_id=district_id, date_debut=date_debut, date_fin=date_fin)
+        statuts_confirmes = [CasStatut.CONFIRME, CasStatut.GUERI, CasStatut.DECEDE]
+        total_cas = (await db.execute(
+            select(NOMBRE).where(*conditions(statuts=statuts_confirmes, **filtres))
+        )).scalar() or 0
         
         if total_cas == 0:
             return 0.0
         
-        deces = query.filter(Cas.statut == CasStatut.DECEDE).count()
+        deces = (await db.execute(
+            select(NOMBRE).where(*conditions(statuts=[CasStatut.DECEDE], **filtres))
+        )).scalar() or 0
         
         taux_letalite = (deces / total_cas) * 100
         return round(taux_letalite, 2)
     
     @staticmethod
-    def calculate_attack_rate(
-        db: Session,
+    async def calculate_attack_rate(
+        db: AsyncSession,
         district_id: int,
         maladie_id: int,
         date_debut: date,
@@ -90,25 +83,22 @@ class StatisticsService:
         Calcul du taux d'attaque lors d'une épidémie
         Formule : (Nombre de nouveaux cas / Population à risque) * 100
         """
-        district = db.query(District).filter(District.id == district_id).first()
+        district = await db.get(District, district_id)
         if not district or not district.population:
             return 0.0
         
-        nombre_cas = db.query(func.count(Cas.id)).filter(
-            and_(
-                Cas.district_id == district_id,
-                Cas.maladie_id == maladie_id,
-                Cas.date_declaration >= date_debut,
-                Cas.date_declaration <= date_fin
-            )
-        ).scalar() or 0
+        nombre_cas = (await db.execute(
+            select(NOMBRE).where(*conditions(
+                district_id=district_id, maladie_id=maladie_id, date_debut=date_debut, date_fin=date_fin
+            ))
+        )).scalar() or 0
         
         taux_attaque = (nombre_cas / district.population) * 100
         return round(taux_attaque, 2)
     
     @staticmethod
-    def calculate_trend(
-        db: Session,
+    async def calculate_trend(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         district_id: Optional[int] = None,
         jours: int = 14
@@ -121,32 +111,18 @@ class StatisticsService:
         date_milieu = date_fin - timedelta(days=jours)
         date_debut = date_milieu - timedelta(days=jours)
         
-        # Première période
-        query1 = db.query(func.count(Cas.id)).filter(
-            and_(
-                Cas.date_declaration >= date_debut,
-                Cas.date_declaration < date_milieu
-            )
-        )
-        
-        # Deuxième période
-        query2 = db.query(func.count(Cas.id)).filter(
-            and_(
-                Cas.date_declaration >= date_milieu,
-                Cas.date_declaration <= date_fin
-            )
-        )
-        
-        if maladie_id:
-            query1 = query1.filter(Cas.maladie_id == maladie_id)
-            query2 = query2.filter(Cas.maladie_id == maladie_id)
-        
-        if district_id:
-            query1 = query1.filter(Cas.district_id == district_id)
-            query2 = query2.filter(Cas.district_id == district_id)
-        
-        cas_periode1 = query1.scalar() or 0
-        cas_periode2 = query2.scalar() or 0
+        filtres = dict(maladie_id=maladie_id, district_id=district_id)
+        
+        # Première période [date_debut, date_milieu[
+        query1 = select(NOMBRE).where(*conditions(
+            date_debut=date_debut, date_fin=date_milieu - timedelta(days=1), **filtres
+        ))
+        
+        # Deuxième période [date_milieu, date_fin]
+        query2 = select(NOMBRE).where(*conditions(date_debut=date_milieu, date_fin=date_fin, **filtres))
+        
+        cas_periode1 = (await db.execute(query1)).scalar() or 0
+        cas_periode2 = (await db.execute(query2)).scalar() or 0
         
         if cas_periode1 == 0:
             pourcentage_variation = 100.0 if cas_periode2 > 0 else 0.0
@@ -171,38 +147,22 @@ class StatisticsService:
         }
     
     @staticmethod
-    def get_age_distribution(
-        db: Session,
+    async def get_age_distribution(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         district_id: Optional[int] = None,
         date_debut: Optional[date] = None,
         date_fin: Optional[date] = None
     ) -> List[Dict]:
         """Répartition des cas par tranche d'âge"""
-        query = db.query(
-            case(
-                (Cas.age < 1, "0-1 an"),
-                (and_(Cas.age >= 1, Cas.age < 5), "1-4 ans"),
-                (and_(Cas.age >= 5, Cas.age < 15), "5-14 ans"),
-                (and_(Cas.age >= 15, Cas.age < 25), "15-24 ans"),
-                (and_(Cas.age >= 25, Cas.age < 45), "25-44 ans"),
-                (and_(Cas.age >= 45, Cas.age < 65), "45-64 ans"),
-                (Cas.age >= 65, "65+ ans"),
-                else_="Non renseigné"
-            ).label("tranche_age"),
-            func.count(Cas.id).label("nombre_cas")
-        )
-        
-        if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
-        if district_id:
-            query = query.filter(Cas.district_id == district_id)
-        if date_debut:
-            query = query.filter(Cas.date_declaration >= date_debut)
-        if date_fin:
-            query = query.filter(Cas.date_declaration <= date_fin)
-        
-        results = query.group_by("tranche_age").all()
+        query = select(
+            CasDailyAgg.tranche_age,
+            NOMBRE.label("nombre_cas")
+        ).where(*conditions(
+            maladie_id=maladie_id, district_id=district_id, date_debut=date_debut, date_fin=date_fin
+        ))
+        
+        results = (await db.execute(query.group_by(CasDailyAgg.tranche_age))).all()
         
         return [
             {
@@ -213,8 +173,8 @@ class StatisticsService:
         ]
     
     @staticmethod
-    def get_weekly_summary(
-        db: Session,
+    async def get_weekly_summary(
+        db: AsyncSession,
         maladie_id: Optional[int] = None,
         semaines: int = 12
     ) -> List[Dict]:
@@ -222,17 +182,12 @@ class StatisticsService:
         date_fin = datetime.now().date()
         date_debut = date_fin - timedelta(weeks=semaines)
         
-        query = db.query(
-            func.date_trunc('week', Cas.date_declaration).label('semaine'),
-            func.count(Cas.id).label('nombre_cas')
-        ).filter(
-            Cas.date_declaration >= date_debut
-        )
-        
-        if maladie_id:
-            query = query.filter(Cas.maladie_id == maladie_id)
+        query = select(
+            func.date_trunc('week', CasDailyAgg.jour).label('semaine'),
+            NOMBRE.label('nombre_cas')
+        ).where(*conditions(maladie_id=maladie_id, date_debut=date_debut))
         
-        results = query.group_by('semaine').order_by('semaine').all()
+        results = (await db.execute(query.group_by('semaine').order_by('semaine'))).all()
         
         return [
             {
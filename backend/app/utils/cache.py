@@ -0,0 +1,59 @@
+# app/utils/cache.py
+"""
+📄 Fichier: app/utils/cache.py
+📝 Description: Cache mémoire à durée de vie limitée (TTL), thread-safe
+🎯 Usage: Données lues très souvent et rarement modifiées (principal JWT, référentiels)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache clé/valeur en mémoire de processus avec expiration.
+
+    Chaque worker uvicorn a son propre cache : une invalidation ne touche que
+    le processus qui la fait, les autres se resynchronisent à l'expiration.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -84,4 +84,11 @@ class ModeTransmission(str, Enum):
     ALIMENTAIRE = "alimentaire"
     EAU = "eau"
     SEXUELLE = "sexuelle"
-    SANGUINE = "sanguine"
\ No newline at end of file
+    SANGUINE = "sanguine"
+
+
+class WorkloadClass(str, Enum):
+    """Classe de charge : détermine le pool de connexions utilisé"""
+    OLTP = "oltp"
+    LECTURE = "lecture"
+    REPORTING = "reporting"
@@ -0,0 +1,103 @@
+# app/utils/pagination.py
+"""
+📄 Fichier: app/utils/pagination.py
+📝 Description: Curseurs opaques pour la pagination par clé (keyset)
+🎯 Usage: Listes triées sur (date DESC, id DESC) : /cas, /alertes
+
+Le curseur encode la clé de tri de la dernière ligne renvoyée ; la page
+suivante filtre `(date, id) < (date_curseur, id_curseur)` au lieu d'un
+OFFSET, ce qui garde un coût constant quelle que soit la profondeur.
+"""
+
+import base64
+import json
+from datetime import date
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+# En-tête portant le curseur de la page suivante (la réponse reste une liste)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Curseur de /cas/changes : positions (xid de transaction, id) dans cas (None
+# avant le premier cas reçu) et dans cas_supprimes
+SyncCursor = Tuple[Optional[Tuple[int, int]], Tuple[int, int]]
+
+
+def _encode(valeur: Any) -> str:
+    brut = json.dumps(valeur, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(brut).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def _invalide(message: str = "Curseur de pagination invalide") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+
+def encode_cursor(cle_date: date, cle_id: int) -> str:
+    """Clé (date, id) -> curseur opaque (base64 url-safe)"""
+    return _encode([cle_date.isoformat(), cle_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Curseur opaque -> clé (date, id) ; 400 si le curseur est invalide"""
+    try:
+        cle_date, cle_id = _decode(cursor)
+        return date.fromisoformat(cle_date), int(cle_id)
+    except (ValueError, TypeError):
+        raise _invalide()
+
+
+def encode_rank_cursor(score: float, cle_id: int) -> str:
+    """Clé (score, id) d'une liste classée par pertinence -> curseur opaque"""
+    return _encode([score, cle_id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Curseur opaque -> clé (score, id) ; 400 si le curseur est invalide"""
+    try:
+        score, cle_id = _decode(cursor)
+        return float(score), int(cle_id)
+    except (ValueError, TypeError):
+        raise _invalide()
+
+
+def encode_sync_cursor(curseur: SyncCursor) -> str:
+    """Positions du flux /cas/changes -> curseur opaque"""
+    position_cas, position_supprimes = curseur
+    return _encode([list(position_cas) if position_cas else None, list(position_supprimes)])
+
+
+def decode_sync_cursor(cursor: str) -> SyncCursor:
+    """Curseur opaque -> positions du flux /cas/changes ; 400 si le curseur est invalide"""
+    try:
+        position_cas, position_supprimes = _decode(cursor)
+        if position_cas is not None:
+            position_cas = _entiers(position_cas)
+        return position_cas, _entiers(position_supprimes)
+    except (ValueError, TypeError):
+        raise _invalide("Curseur de synchronisation invalide")
+
+
+def _entiers(position: Any) -> Tuple[int, int]:
+    """[xid, id] -> (xid, id), entiers stricts (un ancien curseur horodaté est refusé)"""
+    xid, cle_id = position
+    if type(xid) is not int or type(cle_id) is not int:
+        raise ValueError(position)
+    return xid, cle_id
+
+
+def set_next_cursor(response: Response, lignes: Sequence, limit: int, champ_date: str) -> Optional[str]:
+    """
+    Renseigne X-Next-Cursor si la page est pleine (il peut rester des lignes)
+    et renvoie le curseur
+    """
+    if not lignes or len(lignes) < limit:
+        return None
+    derniere = lignes[-1]
+    cursor = encode_cursor(getattr(derniere, champ_date), derniere.id)
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
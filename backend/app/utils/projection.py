@@ -0,0 +1,112 @@
+# app/utils/projection.py
+"""
+📄 Fichier: app/utils/projection.py
+📝 Description: Projection de colonnes (?fields=) pour les endpoints de liste
+🎯 Usage: /cas, /alertes, /interventions : select() des seules colonnes demandées
+
+Les champs autorisés sont ceux du schéma de réponse. Un champ relation
+(maladie, district...) ajoute une jointure externe sur la table liée,
+limitée aux colonnes du schéma imbriqué ; sans lui, aucune jointure. Les
+lignes sont sérialisées directement en JSON, sans objet ORM ni Pydantic.
+"""
+
+import json
+import typing
+from datetime import date, datetime
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import inspect, select
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+
+
+def _schema_imbrique(annotation) -> Optional[Type[BaseModel]]:
+    """Schéma Pydantic d'un champ relation (Optional[MaladieInCas] -> MaladieInCas)"""
+    for candidat in (annotation, *typing.get_args(annotation)):
+        if isinstance(candidat, type) and issubclass(candidat, BaseModel):
+            return candidat
+    return None
+
+
+def parse_fields(fields: str, schema: Type[BaseModel]) -> List[str]:
+    """'id,numero_cas' -> ['id', 'numero_cas'] ; 400 si un champ est inconnu"""
+    demandes = list(dict.fromkeys(nom.strip() for nom in fields.split(",") if nom.strip()))
+    inconnus = [nom for nom in demandes if nom not in schema.model_fields]
+    if not demandes or inconnus:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Champs invalides : {', '.join(inconnus) or 'aucun'}. "
+                   f"Disponibles : {', '.join(schema.model_fields)}"
+        )
+    return demandes
+
+
+def projection(
+    model,
+    schema: Type[BaseModel],
+    fields: str,
+    cles: Sequence[str] = ("id",)
+) -> Tuple[Select, Callable[[Row], Dict]]:
+    """
+    select() limité aux champs demandés et fonction ligne -> dict
+
+    `cles` : colonnes toujours lues (tri, curseur) mais renvoyées seulement
+    si elles sont demandées.
+    """
+    demandes = parse_fields(fields, schema)
+    relations = inspect(model).relationships
+    colonnes, jointures, imbriques = [], [], {}
+
+    for nom in dict.fromkeys([*demandes, *cles]):
+        imbrique = _schema_imbrique(schema.model_fields[nom].annotation) if nom in schema.model_fields else None
+        if imbrique is not None and nom in relations:
+            cible = relations[nom].mapper.class_
+            sous_champs = list(imbrique.model_fields)
+            colonnes.extend(getattr(cible, champ).label(f"{nom}__{champ}") for champ in sous_champs)
+            jointures.append(getattr(model, nom))
+            imbriques[nom] = sous_champs
+        else:
+            colonnes.append(getattr(model, nom).label(nom))
+
+    query = select(*colonnes)
+    for relation in jointures:
+        query = query.outerjoin(relation)
+
+    def serialiser(ligne: Row) -> Dict:
+        valeurs = ligne._mapping
+        resultat = {}
+        for nom in demandes:
+            if nom in imbriques:
+                sous = {champ: valeurs[f"{nom}__{champ}"] for champ in imbriques[nom]}
+                resultat[nom] = sous if sous.get("id") is not None else None
+            else:
+                resultat[nom] = valeurs[nom]
+        return resultat
+
+    return query, serialiser
+
+
+def _json_default(valeur):
+    if isinstance(valeur, Enum):
+        return valeur.value
+    if isinstance(valeur, (date, datetime)):
+        return valeur.isoformat()
+    raise TypeError(f"Type non sérialisable : {type(valeur).__name__}")
+
+
+def dumps(contenu) -> str:
+    """JSON des valeurs lues en base (Enum -> valeur, dates ISO 8601)"""
+    return json.dumps(contenu, default=_json_default, ensure_ascii=False)
+
+
+def json_response(lignes: Sequence[Row], serialiser: Callable[[Row], Dict], response: Optional[Response] = None) -> Response:
+    """Réponse JSON des lignes projetées (reprend les en-têtes déjà posés, ex. X-Next-Cursor)"""
+    sortie = Response(content=dumps([serialiser(ligne) for ligne in lignes]), media_type="application/json")
+    if response is not None:
+        for nom, valeur in response.headers.items():
+            if nom.lower() not in ("content-length", "content-type"):
+                sortie.headers[nom] = valeur
+    return sortie
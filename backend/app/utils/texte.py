@@ -0,0 +1,14 @@
+# app/utils/texte.py
+"""
+📄 Fichier: app/utils/texte.py
+📝 Description: Normalisation de texte pour les comparaisons (noms, référentiels)
+🎯 Usage: Import CSV/XLSX (correspondance des noms), détection des doublons (clés de blocs)
+"""
+
+import unicodedata
+
+
+def normaliser(valeur) -> str:
+    """Minuscules, sans accents ni espaces superflus (clé de recherche)"""
+    texte = unicodedata.normalize("NFKD", str(valeur).strip().lower())
+    return " ".join("".join(c for c in texte if not unicodedata.combining(c)).split())
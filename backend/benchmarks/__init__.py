@@ -0,0 +1 @@
+"""Benchmarks de performance (à lancer manuellement contre une instance de l'API)"""
@@ -0,0 +1,153 @@
+"""
+📄 Fichier: benchmarks/bench_concurrency.py
+📝 Description: Mesure de la concurrence sous charge des endpoints de lecture
+🎯 Usage: python -m benchmarks.bench_concurrency --base-url http://localhost:8000 \\
+              --email admin@drsp.mg --password admin123 --concurrency 10 50 100
+
+Lancer le même benchmark sur deux builds (avant/après, ex. `git stash` ou deux
+worktrees) avec le même nombre de workers uvicorn, puis comparer les JSON
+produits avec --compare.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+# Endpoints chauds du lundi matin (dashboard + listes)
+ENDPOINTS = [
+    "/api/v1/dashboard/statistics",
+    "/api/v1/dashboard/top-districts",
+    "/api/v1/dashboard/evolution-temporelle",
+    "/api/v1/statistiques/dashboard",
+    "/api/v1/cas?limit=50",
+    "/api/v1/cas/count",
+    "/api/v1/cartographie/markers?limit=500",
+]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentile simple (interpolation au plus proche rang)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    """Récupère un token JWT"""
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    token: str,
+    concurrency: int,
+    requests_per_worker: int
+) -> Dict:
+    """Lance `concurrency` clients simultanés qui parcourent les endpoints"""
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(worker_id: int):
+        nonlocal errors
+        for i in range(requests_per_worker):
+            path = ENDPOINTS[(worker_id + i) % len(ENDPOINTS)]
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 1) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "mean_ms": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+    }
+
+
+async def main_async(args) -> List[Dict]:
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        token = await login(client, args.email, args.password)
+
+        # Échauffement (pool de connexions, caches)
+        await run_level(client, token, 2, len(ENDPOINTS))
+
+        results = []
+        for level in args.concurrency:
+            result = await run_level(client, token, level, args.requests)
+            print(
+                f"c={level:4d}  {result['throughput_rps']:8.1f} req/s  "
+                f"p50={result['p50_ms']:7.1f}ms  p95={result['p95_ms']:7.1f}ms  "
+                f"erreurs={result['errors']}"
+            )
+            results.append(result)
+        return results
+
+
+def compare(before_path: str, after_path: str):
+    """Affiche le gain entre deux fichiers de résultats"""
+    with open(before_path) as f:
+        before = {r["concurrency"]: r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {r["concurrency"]: r for r in json.load(f)["results"]}
+
+    for level in sorted(set(before) & set(after)):
+        b, a = before[level], after[level]
+        gain = (a["throughput_rps"] / b["throughput_rps"] - 1) * 100 if b["throughput_rps"] else 0
+        print(
+            f"c={level:4d}  req/s {b['throughput_rps']:8.1f} -> {a['throughput_rps']:8.1f} ({gain:+.1f}%)  "
+            f"p95 {b['p95_ms']:7.1f} -> {a['p95_ms']:7.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de concurrence des endpoints de lecture")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@drsp.mg")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--requests", type=int, default=20, help="Requêtes par client virtuel")
+    parser.add_argument("--label", default="run", help="Libellé enregistré dans le JSON")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"), help="Compare deux fichiers JSON")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"label": args.label, "base_url": args.base_url, "results": results}, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+📄 Fichier: benchmarks/bench_dashboard_queries.py
+📝 Description: Budget de requêtes SQL des endpoints du dashboard
+🎯 Usage: python -m benchmarks.bench_dashboard_queries
+          python -m benchmarks.bench_dashboard_queries --output dashboard_sql.json
+
+Chaque endpoint est appelé directement (hors HTTP, authentification exclue)
+dans un bloc capture_sql, après un premier appel de chauffe qui ouvre la
+connexion. Le script échoue (code 1) si un endpoint dépasse son budget :
+le nombre de requêtes ne doit dépendre ni du nombre de districts ni des
+données. Fonctionne sur une base vide comme sur le jeu synthétique.
+Le même contrôle tourne dans la suite de tests (tests/test_dashboard_queries.py).
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from app.api.v1.endpoints.dashboard import get_dashboard_statistics
+from app.api.v1.endpoints.statistiques import get_dashboard_stats
+from app.core.database import AsyncSessionLocal
+from app.core.instrumentation import capture_sql
+
+# Nombre maximal de requêtes SQL par appel
+BUDGETS = {
+    "GET /dashboard/statistics": 2,
+    "GET /statistiques/dashboard": 3,
+    "GET /statistiques/dashboard?maladie_id": 3,
+}
+
+
+def appels(maladie_id: int) -> Dict:
+    """nom -> fabrique de coroutine (db)"""
+    return {
+        "GET /dashboard/statistics": lambda db: get_dashboard_statistics(db=db, current_user=None),
+        "GET /statistiques/dashboard": lambda db: get_dashboard_stats(maladie_id=None, db=db, current_user=None),
+        "GET /statistiques/dashboard?maladie_id": lambda db: get_dashboard_stats(
+            maladie_id=maladie_id, db=db, current_user=None
+        ),
+    }
+
+
+async def mesurer() -> List[Dict]:
+    results = []
+    async with AsyncSessionLocal() as db:
+        maladie_id = (await db.execute(text("SELECT min(id) FROM maladies"))).scalar() or 1
+        for nom, appel in appels(maladie_id).items():
+            await appel(db)
+            with capture_sql() as stats:
+                await appel(db)
+            results.append({
+                "endpoint": nom,
+                "requetes": stats.count,
+                "budget": BUDGETS[nom],
+                "duree_sql_ms": round(stats.duration * 1000, 2),
+                "ok": stats.count <= BUDGETS[nom],
+            })
+            etat = "OK " if results[-1]["ok"] else "ÉCHEC"
+            print(f"{etat} {nom:42s} {stats.count} requête(s) / budget {BUDGETS[nom]} "
+                  f"({stats.duration * 1000:.1f} ms SQL)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budget de requêtes SQL des endpoints du dashboard")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = asyncio.run(mesurer())
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+    echecs = [r["endpoint"] for r in results if not r["ok"]]
+    if echecs:
+        print(f"❌ Budget de requêtes dépassé : {', '.join(echecs)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+📄 Fichier: benchmarks/bench_endpoints.py
+📝 Description: Latence (p50/p95) et mémoire des endpoints chauds sur le jeu synthétique
+🎯 Usage: python -m scripts.generate_synthetic_data --cas 1000000 --seed 42 --date-fin 2025-12-31 --oui
+          python -m benchmarks.bench_endpoints --base-url http://localhost:8000 \\
+              --date-fin 2025-12-31 --output bench/endpoints_$(git rev-parse --short HEAD).json
+          python -m benchmarks.bench_endpoints --compare AVANT.json APRES.json
+
+Les requêtes sont envoyées une par une (aucune concurrence) pour isoler le
+coût propre de chaque endpoint. La mémoire est lue côté serveur sur /metrics
+(process_resident_memory_bytes) : lancer l'API avec un seul worker uvicorn et
+sans PROMETHEUS_MULTIPROC_DIR, sinon seule la latence est mesurée.
+
+⚠️ /alertes/check-thresholds crée des alertes : relancer le générateur avant
+une mesure de référence.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_concurrency import login, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Hausse de p95 au-delà de laquelle --compare signale une régression
+REGRESSION_THRESHOLD = 0.20
+
+
+def endpoints(date_fin: date) -> List[Dict]:
+    """Endpoints mesurés ; les fenêtres de dates suivent --date-fin du générateur"""
+    semaine = (date_fin - timedelta(days=6)).isoformat()
+    mois = (date_fin - timedelta(days=29)).isoformat()
+    fin = date_fin.isoformat()
+    return [
+        {"name": "dashboard_statistics", "method": "GET", "path": "/api/v1/dashboard/statistics"},
+        {"name": "statistiques_dashboard", "method": "GET", "path": "/api/v1/statistiques/dashboard"},
+        {"name": "cas_list", "method": "GET", "path": "/api/v1/cas?limit=50"},
+        {"name": "cas_count", "method": "GET", "path": "/api/v1/cas/count"},
+        {"name": "cas_count_filtre", "method": "GET",
+         "path": f"/api/v1/cas/count?maladie_id=1&date_declaration_debut={mois}&date_declaration_fin={fin}"},
+        {"name": "cas_count_exact", "method": "GET", "path": "/api/v1/cas/count?exact=true"},
+        {"name": "cas_search_nom", "method": "GET", "path": "/api/v1/cas/search?q=Ratsimba%20Njaka"},
+        {"name": "cas_search_numero", "method": "GET", "path": f"/api/v1/cas/search?q={date_fin.year}-0012"},
+        {"name": "cartographie_markers", "method": "GET", "path": "/api/v1/cartographie/markers?limit=1000"},
+        {"name": "cartographie_heatmap", "method": "GET",
+         "path": f"/api/v1/cartographie/heatmap?date_debut={mois}&date_fin={fin}"},
+        {"name": "alertes_check_thresholds", "method": "POST", "path": "/api/v1/alertes/check-thresholds"},
+        {"name": "export_cas_excel", "method": "GET",
+         "path": f"/api/v1/export/cas/excel?date_debut={mois}&date_fin={fin}", "heavy": True},
+        {"name": "rapport_hebdomadaire_pdf", "method": "GET",
+         "path": f"/api/v1/rapports/hebdomadaire/pdf?date_debut={semaine}&date_fin={fin}", "heavy": True},
+    ]
+
+
+async def server_rss(client: httpx.AsyncClient) -> Optional[int]:
+    """Mémoire résidente du worker (octets), None si /metrics ne l'expose pas"""
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return None
+    for line in response.text.splitlines():
+        if line.startswith("process_resident_memory_bytes "):
+            return int(float(line.split()[1]))
+    return None
+
+
+async def sample_rss(client: httpx.AsyncClient, stop: asyncio.Event, samples: List[int]):
+    """Relevé de la mémoire serveur toutes les 50 ms pendant la mesure"""
+    while not stop.is_set():
+        rss = await server_rss(client)
+        if rss is not None:
+            samples.append(rss)
+        await asyncio.sleep(0.05)
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    headers: Dict,
+    endpoint: Dict,
+    iterations: int,
+    warmup: int
+) -> Dict:
+    """`warmup` appels non comptés puis `iterations` appels séquentiels"""
+    for _ in range(warmup):
+        await client.request(endpoint["method"], endpoint["path"], headers=headers)
+
+    rss_before = await server_rss(client)
+    samples: List[int] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(client, stop, samples))
+
+    latencies: List[float] = []
+    sizes: List[int] = []
+    statuses: Dict[int, int] = {}
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = await client.request(endpoint["method"], endpoint["path"], headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(response.content))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    stop.set()
+    await sampler
+    rss_after = await server_rss(client)
+
+    result = {
+        "name": endpoint["name"],
+        "method": endpoint["method"],
+        "path": endpoint["path"],
+        "iterations": iterations,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "max_ms": round(max(latencies), 1),
+        "mean_ms": round(statistics.fmean(latencies), 1),
+        "response_bytes": int(statistics.median(sizes)),
+    }
+    if rss_before is not None:
+        peak = max(samples + [rss_before, rss_after or rss_before])
+        result["rss_before_mb"] = round(rss_before / 2**20, 1)
+        result["rss_peak_mb"] = round(peak / 2**20, 1)
+        result["rss_growth_mb"] = round((peak - rss_before) / 2**20, 1)
+    return result
+
+
+async def dataset_size(client: httpx.AsyncClient, headers: Dict) -> Optional[int]:
+    """Nombre de cas en base, enregistré avec les résultats"""
+    response = await client.get("/api/v1/cas/count?exact=true", headers=headers)
+    if response.status_code != 200:
+        return None
+    return response.json().get("count")
+
+
+async def main_async(args) -> Dict:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        token = await login(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        total_cas = await dataset_size(client, headers)
+        print(f"Jeu de données : {total_cas if total_cas is not None else '?'} cas")
+
+        results = []
+        for endpoint in endpoints(args.date_fin):
+            if args.only and endpoint["name"] not in args.only:
+                continue
+            iterations = args.heavy_iterations if endpoint.get("heavy") else args.iterations
+            result = await run_endpoint(client, headers, endpoint, iterations, args.warmup)
+            results.append(result)
+            memoire = f"  RSS pic {result['rss_peak_mb']:7.1f} Mo (+{result['rss_growth_mb']:.1f})" \
+                if "rss_peak_mb" in result else ""
+            print(
+                f"{result['name']:28s} p50={result['p50_ms']:8.1f}ms  p95={result['p95_ms']:8.1f}ms  "
+                f"{result['response_bytes'] / 1024:8.1f} Ko{memoire}  {result['statuses']}"
+            )
+        return {"total_cas": total_cas, "results": results}
+
+
+def git_commit() -> Optional[str]:
+    """Commit courant, pour relier les résultats à un build"""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(before_path: str, after_path: str) -> int:
+    """Affiche l'évolution p50/p95/mémoire ; code de retour 1 en cas de régression"""
+    with open(before_path) as f:
+        before_run = json.load(f)
+    with open(after_path) as f:
+        after_run = json.load(f)
+    before = {r["name"]: r for r in before_run["results"]}
+    after = {r["name"]: r for r in after_run["results"]}
+
+    if before_run.get("total_cas") != after_run.get("total_cas"):
+        print(f"⚠️  Jeux de données différents : {before_run.get('total_cas')} vs {after_run.get('total_cas')} cas")
+
+    regressions = 0
+    for name in [n for n in before if n in after]:
+        b, a = before[name], after[name]
+        evolution = (a["p95_ms"] / b["p95_ms"] - 1) if b["p95_ms"] else 0.0
+        flag = ""
+        if evolution > REGRESSION_THRESHOLD:
+            flag = "  ⚠️ RÉGRESSION"
+            regressions += 1
+        memoire = ""
+        if "rss_growth_mb" in b and "rss_growth_mb" in a:
+            memoire = f"  RSS +{b['rss_growth_mb']:.1f} -> +{a['rss_growth_mb']:.1f} Mo"
+        print(
+            f"{name:28s} p50 {b['p50_ms']:8.1f} -> {a['p50_ms']:8.1f}  "
+            f"p95 {b['p95_ms']:8.1f} -> {a['p95_ms']:8.1f} ms ({evolution * 100:+.1f}%){memoire}{flag}"
+        )
+
+    print(f"{before_run.get('commit')} -> {after_run.get('commit')} : {regressions} régression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latence des endpoints chauds")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@drsp.mg")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--date-fin", type=date.fromisoformat, default=date.today(),
+                        help="Même valeur que pour le générateur de données")
+    parser.add_argument("--iterations", type=int, default=30, help="Appels mesurés par endpoint")
+    parser.add_argument("--heavy-iterations", type=int, default=5, help="Appels mesurés pour PDF/Excel")
+    parser.add_argument("--warmup", type=int, default=2, help="Appels d'échauffement non comptés")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--only", nargs="+", metavar="NOM", help="Limiter à certains endpoints")
+    parser.add_argument("--label", default="run", help="Libellé enregistré dans le JSON")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"), help="Compare deux fichiers JSON")
+    args = parser.parse_args()
+
+    if args.compare:
+        raise SystemExit(compare(*args.compare))
+
+    run = asyncio.run(main_async(args))
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "label": args.label,
+                "commit": git_commit(),
+                "base_url": args.base_url,
+                "date_fin": args.date_fin.isoformat(),
+                **run,
+            }, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+📄 Fichier: benchmarks/bench_login.py
+📝 Description: Débit de connexion (bcrypt) et impact sur les autres requêtes
+🎯 Usage: python -m benchmarks.bench_login --base-url http://localhost:8000 \\
+              --email admin@drsp.mg --password admin123 --concurrency 5 20 50
+
+Simule une équipe de district qui se connecte en début de service : pendant
+la rafale de logins, une sonde appelle /health en continu pour mesurer la
+latence subie par le reste de l'API.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.bench_concurrency import percentile
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]):
+    """Requêtes légères en boucle pendant la rafale"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    email: str,
+    password: str,
+    concurrency: int,
+    logins_per_worker: int
+) -> Dict:
+    """`concurrency` clients se connectent `logins_per_worker` fois chacun"""
+    login_latencies: List[float] = []
+    probe_latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for _ in range(logins_per_worker):
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/v1/auth/login",
+                data={"username": email, "password": password}
+            )
+            login_latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, stop, probe_latencies))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+
+    return {
+        "concurrency": concurrency,
+        "logins": len(login_latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(len(login_latencies) / elapsed, 2) if elapsed else 0,
+        "login_p50_ms": round(percentile(login_latencies, 50), 2),
+        "login_p95_ms": round(percentile(login_latencies, 95), 2),
+        "probe_p50_ms": round(percentile(probe_latencies, 50), 2),
+        "probe_p95_ms": round(percentile(probe_latencies, 95), 2),
+        "probe_max_ms": round(max(probe_latencies), 2) if probe_latencies else 0,
+    }
+
+
+async def main_async(args) -> List[Dict]:
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 5)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+        results = []
+        for level in args.concurrency:
+            result = await run_level(client, args.email, args.password, level, args.logins)
+            results.append(result)
+            print(
+                f"c={level:4d}  {result['logins_per_s']:7.2f} logins/s  "
+                f"login p95 {result['login_p95_ms']:8.1f} ms  "
+                f"/health p95 {result['probe_p95_ms']:6.1f} ms (max {result['probe_max_ms']:.1f})  "
+                f"erreurs {result['errors']}"
+            )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du débit de connexion")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@drsp.mg")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--logins", type=int, default=4, help="Connexions par client virtuel")
+    parser.add_argument("--label", default="run", help="Libellé enregistré dans le JSON")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"label": args.label, "base_url": args.base_url, "results": results}, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+📄 Fichier: benchmarks/bench_numero_cas.py
+📝 Description: Test de charge de l'attribution des numéros de cas (doublons, trous, débit)
+🎯 Usage: python -m benchmarks.bench_numero_cas --threads 8 32 64 --allocations 200
+
+Chaque thread ouvre sa propre session et enchaîne des transactions
+courtes qui appellent CRUDCas.allouer_numero puis commitent ; une fraction
+des transactions est annulée pour vérifier que le compteur reste sans trou.
+Les numéros sont attribués sur une année réservée (--annee, 9999 par défaut)
+dont la ligne compteurs_cas est supprimée avant et après chaque palier.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.crud.cas import CRUDCas
+from benchmarks.bench_concurrency import percentile
+
+
+def reset_counter(SessionLocal, annee: int):
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM compteurs_cas WHERE annee = :annee"), {"annee": annee})
+        db.commit()
+
+
+def run_level(SessionLocal, annee: int, threads: int, allocations: int, rollback_ratio: float) -> Dict:
+    """`threads` threads attribuent chacun `allocations` numéros"""
+    reset_counter(SessionLocal, annee)
+    committed: List[str] = []
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local_numbers, local_latencies = [], []
+        with SessionLocal() as db:
+            barrier.wait()
+            for _ in range(allocations):
+                start = time.perf_counter()
+                try:
+                    numero = CRUDCas.allouer_numero(db, annee)
+                    if rng.random() < rollback_ratio:
+                        db.rollback()
+                    else:
+                        db.commit()
+                        local_numbers.append(numero)
+                except Exception as exc:  # noqa: BLE001 - remonté dans le rapport
+                    db.rollback()
+                    with lock:
+                        errors.append(repr(exc))
+                local_latencies.append((time.perf_counter() - start) * 1000)
+        with lock:
+            committed.extend(local_numbers)
+            latencies.extend(local_latencies)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    duplicates = [numero for numero, count in Counter(committed).items() if count > 1]
+    sequence = sorted(int(numero.rsplit("-", 1)[1]) for numero in set(committed))
+    gaps = len(sequence) and sequence[-1] - len(sequence)
+    reset_counter(SessionLocal, annee)
+
+    return {
+        "threads": threads,
+        "committed": len(committed),
+        "duplicates": len(duplicates),
+        "gaps": gaps,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "duration_s": round(duration, 3),
+        "allocations_per_s": round(len(latencies) / duration, 1) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de la numérotation des cas")
+    parser.add_argument("--threads", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--allocations", type=int, default=200, help="Numéros attribués par thread")
+    parser.add_argument("--rollback-ratio", type=float, default=0.1, help="Part de transactions annulées")
+    parser.add_argument("--annee", type=int, default=9999, help="Année réservée au test")
+    parser.add_argument("--label", default="run", help="Libellé enregistré dans le JSON")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    # Pool dédié : une connexion par thread, sans attente sur le pool OLTP de l'API
+    engine = create_engine(settings.DATABASE_URL, pool_size=max(args.threads), max_overflow=0)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    results = []
+    for level in args.threads:
+        result = run_level(SessionLocal, args.annee, level, args.allocations, args.rollback_ratio)
+        results.append(result)
+        print(
+            f"threads={level:4d}  {result['allocations_per_s']:8.1f} numéros/s  "
+            f"p95={result['p95_ms']:7.2f}ms  doublons={result['duplicates']}  "
+            f"trous={result['gaps']}  erreurs={result['errors']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"label": args.label, "results": results}, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+    if any(r["duplicates"] or r["gaps"] or r["errors"] for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+📄 Fichier: benchmarks/bench_partition_pruning.py
+📝 Description: Vérifie l'élagage des partitions annuelles de cas par les requêtes ORM
+🎯 Usage: python -m scripts.generate_synthetic_data --cas 1000000 --seed 42 --date-fin 2025-12-31 --oui
+          python -m benchmarks.bench_partition_pruning --output pruning.json
+
+Les méthodes de CRUDCas et CartographieService sont appelées avec une
+période de déclaration ; chaque requête SQL qu'elles émettent est capturée
+(texte et paramètres) puis rejouée en EXPLAIN sur la même connexion. Le script échoue (code 1) si une requête sur cas parcourt
+toutes les partitions. Les partitions écartées à l'exécution (paramètres
+d'une requête préparée) comptent comme élaguées ("Subplans Removed").
+StatisticsService lit cas_daily_agg et n'est plus concerné.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from datetime import timedelta
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import event, text
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.crud.cas import cas as crud_cas
+from app.services.cartographie_service import carto_service
+
+PARTITION = re.compile(r"^cas_(\d{4}|defaut)$")
+
+
+def partitions_lues(plan: Dict) -> Tuple[Set[str], int]:
+    """Partitions de cas parcourues dans un plan JSON, et nombre écartées à l'exécution"""
+    lues, retirees = set(), plan.get("Subplans Removed", 0)
+    if PARTITION.match(plan.get("Relation Name", "")):
+        lues.add(plan["Relation Name"])
+    for enfant in plan.get("Plans", []):
+        sous_lues, sous_retirees = partitions_lues(enfant)
+        lues |= sous_lues
+        retirees += sous_retirees
+    return lues, retirees
+
+
+def appels(fin, maladie_id: int, district_id: int) -> Dict:
+    """nom -> fabrique de coroutine (db) ; période des 30 derniers jours en base"""
+    debut = fin - timedelta(days=30)
+    return {
+        "crud_cas.get_by_filters_async": lambda db: crud_cas.get_by_filters_async(
+            db, limit=50, date_declaration_debut=debut, date_declaration_fin=fin
+        ),
+        "crud_cas.get_by_filters_async (curseur)": lambda db: crud_cas.get_by_filters_async(
+            db, limit=50, apres=(debut, 0)
+        ),
+        "crud_cas.count_by_filters_async": lambda db: crud_cas.count_by_filters_async(
+            db, maladie_id=maladie_id, date_debut=debut, date_fin=fin
+        ),
+        "carto.get_cas_markers": lambda db: carto_service.get_cas_markers(
+            db, maladie_id, district_id, debut, fin, 1000
+        ),
+        "carto.get_districts_choropleth": lambda db: carto_service.get_districts_choropleth(
+            db, maladie_id, debut, fin
+        ),
+        "carto.get_heatmap_data": lambda db: carto_service.get_heatmap_data(
+            db, maladie_id, district_id, debut, fin
+        ),
+        "carto.detect_clusters": lambda db: carto_service.detect_clusters(db, maladie_id, district_id),
+    }
+
+
+async def verifier() -> Tuple[List[Dict], List[str]]:
+    capturees: List[Tuple[str, object]] = []
+
+    def capturer(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            capturees.append((statement, parameters))
+
+    async with AsyncSessionLocal() as db:
+        toutes = list((await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'cas'::regclass ORDER BY 1"
+        ))).scalars())
+        if not toutes:
+            raise SystemExit("cas n'est pas partitionnée : appliquer la migration e6b1c9d4a852")
+        params = (await db.execute(text("""
+            SELECT max(date_declaration) AS fin,
+                   (SELECT id FROM maladies ORDER BY id LIMIT 1) AS maladie_id,
+                   (SELECT id FROM districts ORDER BY id LIMIT 1) AS district_id
+            FROM cas
+        """))).mappings().one()
+        if params["fin"] is None:
+            raise SystemExit("Table cas vide : lancer d'abord scripts.generate_synthetic_data")
+
+        results = []
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capturer)
+        try:
+            for nom, appel in appels(**params).items():
+                capturees.clear()
+                await appel(db)
+                for statement, parameters in list(capturees):
+                    if not re.search(r"\bFROM cas\b|\bJOIN cas\b", statement):
+                        continue
+                    plan = (await (await db.connection()).exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                    )).scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    lues, retirees = partitions_lues(plan[0]["Plan"])
+                    results.append({
+                        "appel": nom,
+                        "partitions_lues": sorted(lues),
+                        "elaguees_execution": retirees,
+                        "ok": len(lues) < len(toutes),
+                        "sql": " ".join(statement.split())[:200],
+                    })
+                    etat = "OK " if results[-1]["ok"] else "ÉCHEC"
+                    print(f"{etat} {nom:42s} {len(lues)}/{len(toutes)} partitions ({', '.join(sorted(lues))})")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capturer)
+    return results, toutes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Élagage des partitions de cas par les requêtes ORM")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results, toutes = asyncio.run(verifier())
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"partitions": toutes, "results": results}, f, indent=2, default=str)
+        print(f"Résultats enregistrés dans {args.output}")
+
+    echecs = sorted({r["appel"] for r in results if not r["ok"]})
+    if echecs:
+        print(f"❌ Toutes les partitions parcourues : {', '.join(echecs)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+📄 Fichier: benchmarks/bench_query_plans.py
+📝 Description: Régression des plans d'exécution des requêtes chaudes (EXPLAIN)
+🎯 Usage: python -m scripts.generate_synthetic_data --cas 1000000 --seed 42 --date-fin 2025-12-31 --oui
+          python -m benchmarks.bench_query_plans --output plans.json
+
+Chaque requête reprend la forme SQL d'un service ou endpoint (filtres, tri,
+regroupement). Le script échoue (code 1) si un plan parcourt séquentiellement
+cas ou alertes. Sur une table trop petite pour que le planificateur préfère
+un index (alertes du jeu synthétique, base de dev), le plan est recalculé
+avec enable_seqscan = off : on vérifie alors qu'un index utilisable existe.
+Les mêmes vérifications tournent dans la suite de tests (tests/test_query_plans.py).
+"""
+
+import argparse
+import json
+import re
+from typing import Dict, List
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+TABLES_SURVEILLEES = {"cas", "alertes"}
+# En dessous de ce nombre de lignes, le plan est vérifié avec enable_seqscan = off
+MIN_ROWS = 50000
+# Partitions annuelles de cas (cas_2024, cas_defaut) rapportées à cas
+PARTITION_CAS = re.compile(r"^cas_(\d{4}|defaut)$")
+
+# nom -> (table principale, SQL) ; :fin = dernière date de déclaration en base
+HOT_QUERIES: Dict[str, tuple] = {
+    # GET /cas (1re page puis page suivante par curseur)
+    "cas_liste": ("cas", """
+        SELECT * FROM cas ORDER BY date_declaration DESC, id DESC LIMIT 50
+    """),
+    "cas_liste_curseur": ("cas", """
+        SELECT * FROM cas WHERE (date_declaration, id) < (CAST(:fin AS date) - 90, 0)
+        ORDER BY date_declaration DESC, id DESC LIMIT 50
+    """),
+    # /dashboard/statistics : nouveaux cas 7 jours
+    "dashboard_nouveaux_cas_7j": ("cas", """
+        SELECT count(id) FROM cas WHERE date_declaration >= CAST(:fin AS date) - 7
+    """),
+    # statistics_service / cartographie : maladie ou district sur 30 jours
+    "stats_maladie_30j": ("cas", """
+        SELECT count(id) FROM cas
+        WHERE maladie_id = :maladie_id AND date_declaration BETWEEN CAST(:fin AS date) - 30 AND :fin
+    """),
+    "stats_district_30j": ("cas", """
+        SELECT count(id) FROM cas
+        WHERE district_id = :district_id AND date_declaration BETWEEN CAST(:fin AS date) - 30 AND :fin
+    """),
+    # Décès sur la période (statistics_service.get_indicateurs)
+    "deces_30j": ("cas", """
+        SELECT count(id) FROM cas
+        WHERE statut = 'DECEDE' AND date_declaration BETWEEN CAST(:fin AS date) - 30 AND :fin
+    """),
+    # POST /alertes/check-thresholds
+    "check_thresholds": ("cas", """
+        SELECT maladie_id, district_id, count(id) FROM cas
+        WHERE date_symptomes >= CAST(:fin AS date) - 7
+          AND maladie_id IS NOT NULL AND district_id IS NOT NULL
+          AND id NOT IN (SELECT cas_id FROM doublons_cas WHERE statut = 'confirme')
+        GROUP BY maladie_id, district_id
+    """),
+    # /cartographie/markers et /cartographie/heatmap
+    "carto_markers": ("cas", """
+        SELECT id, latitude, longitude FROM cas
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+          AND date_declaration >= CAST(:fin AS date) - 30
+        ORDER BY date_declaration DESC LIMIT 1000
+    """),
+    "carto_heatmap": ("cas", """
+        SELECT round(latitude::numeric, 2), round(longitude::numeric, 2), count(id) FROM cas
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+          AND date_declaration BETWEEN CAST(:fin AS date) - 30 AND :fin
+        GROUP BY 1, 2
+    """),
+    # GET /cas/search : nom approché, fragment de numéro, observations
+    "cas_recherche": ("cas", """
+        SELECT id FROM cas
+        WHERE nom % 'Ratsimba Njaka' OR nom ILIKE '%Ratsimba Njaka%'
+           OR numero_cas ILIKE '%Ratsimba Njaka%'
+           OR to_tsvector('french', coalesce(observations, '')) @@ websearch_to_tsquery('french', 'Ratsimba Njaka')
+        LIMIT 50
+    """),
+    "cas_recherche_numero": ("cas", """
+        SELECT id FROM cas WHERE numero_cas ILIKE '%-0012%' LIMIT 50
+    """),
+    # check-thresholds : alerte active d'un couple maladie/district
+    "alerte_active_couple": ("alertes", """
+        SELECT * FROM alertes
+        WHERE maladie_id = :maladie_id AND district_id = :district_id AND statut = 'active' LIMIT 1
+    """),
+    # GET /alertes
+    "alertes_liste": ("alertes", """
+        SELECT * FROM alertes ORDER BY date_detection DESC, id DESC LIMIT 100
+    """),
+    # /dashboard/statistics : alertes ouvertes par niveau
+    "alertes_ouvertes_par_niveau": ("alertes", """
+        SELECT niveau_gravite, count(id) FROM alertes
+        WHERE statut IN ('active', 'en_cours') GROUP BY niveau_gravite
+    """),
+}
+
+
+def seq_scans(plan: Dict) -> List[str]:
+    """Tables surveillées parcourues séquentiellement dans un plan JSON"""
+    trouvees = []
+    relation = plan.get("Relation Name", "")
+    table = "cas" if PARTITION_CAS.match(relation) else relation
+    if plan.get("Node Type") == "Seq Scan" and table in TABLES_SURVEILLEES:
+        trouvees.append(relation)
+    for enfant in plan.get("Plans", []):
+        trouvees.extend(seq_scans(enfant))
+    return trouvees
+
+
+def index_names(plan: Dict) -> List[str]:
+    """Index utilisés par un plan JSON"""
+    noms = [plan["Index Name"]] if "Index Name" in plan else []
+    for enfant in plan.get("Plans", []):
+        noms.extend(index_names(enfant))
+    return noms
+
+
+def explain(conn, sql: str, params: Dict, force_index: bool) -> Dict:
+    conn.execute(text(f"SET LOCAL enable_seqscan = {'off' if force_index else 'on'}"))
+    return conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()[0]["Plan"]
+
+
+def compter_lignes(conn) -> Dict[str, int]:
+    """Lignes estimées des tables surveillées (table partitionnée : somme des partitions analysées)"""
+    return {
+        table: conn.execute(text("""
+            SELECT coalesce(
+                (SELECT sum(c.reltuples) FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                 WHERE i.inhparent = to_regclass(:table) AND c.reltuples >= 0),
+                (SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table))
+            )::bigint
+        """), {"table": table}).scalar() or 0
+        for table in TABLES_SURVEILLEES
+    }
+
+
+def parametres(conn) -> Dict:
+    """Paramètres des requêtes : dernière date de déclaration (None si cas est vide), maladie, district"""
+    return dict(conn.execute(text("""
+        SELECT max(date_declaration) AS fin,
+               (SELECT id FROM maladies ORDER BY id LIMIT 1) AS maladie_id,
+               (SELECT id FROM districts ORDER BY id LIMIT 1) AS district_id
+        FROM cas
+    """)).mappings().one())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Régression des plans d'exécution des requêtes chaudes")
+    parser.add_argument("--min-rows", type=int, default=MIN_ROWS,
+                        help="En dessous, le plan est vérifié avec enable_seqscan = off")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as conn:
+        lignes = compter_lignes(conn)
+        params = parametres(conn)
+        if params["fin"] is None:
+            raise SystemExit("Table cas vide : lancer d'abord scripts.generate_synthetic_data")
+        # Fin de la transaction implicite : chaque EXPLAIN a la sienne (SET LOCAL)
+        conn.rollback()
+
+        results = []
+        for nom, (table, sql) in HOT_QUERIES.items():
+            force_index = lignes[table] < args.min_rows
+            with conn.begin():
+                plan = explain(conn, sql, params, force_index)
+            scans = seq_scans(plan)
+            results.append({
+                "query": nom,
+                "table": table,
+                "table_rows": lignes[table],
+                "seqscan_disabled": force_index,
+                "ok": not scans,
+                "seq_scans": scans,
+                "indexes": sorted(set(index_names(plan))),
+                "total_cost": plan.get("Total Cost"),
+            })
+            mode = " (enable_seqscan=off)" if force_index else ""
+            etat = "OK " if not scans else "ÉCHEC"
+            print(f"{etat} {nom:30s} {', '.join(results[-1]['indexes']) or 'aucun index'}{mode}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"table_rows": lignes, "results": results}, f, indent=2, default=str)
+        print(f"Résultats enregistrés dans {args.output}")
+
+    echecs = [r["query"] for r in results if not r["ok"]]
+    if echecs:
+        print(f"❌ Parcours séquentiels : {', '.join(echecs)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
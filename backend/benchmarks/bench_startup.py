@@ -0,0 +1,142 @@
+"""
+📄 Fichier: benchmarks/bench_startup.py
+📝 Description: Temps de démarrage à froid d'un worker (import de app.main + première requête)
+🎯 Usage: python -m benchmarks.bench_startup --runs 5 \\
+              --path /health --path /api/v1/export/cas/excel
+
+Chaque mesure est faite dans un interpréteur neuf (aucun module en cache).
+La première requête de chaque chemin inclut les imports paresseux qu'il
+déclenche (pandas, reportlab, Prophet...), la seconde sert de référence à chaud.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "reportlab", "openpyxl", "prophet", "groq")
+
+
+def child(paths: List[str], user_id: int):
+    """Exécuté dans le sous-processus : mesure et écrit un JSON sur stdout"""
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    start = time.perf_counter()
+    from app.main import app
+    import_ms = (time.perf_counter() - start) * 1000
+    heavy_after_import = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    from fastapi.testclient import TestClient
+    from app.core.security import create_access_token
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    requests = []
+
+    start = time.perf_counter()
+    with TestClient(app) as client:
+        lifespan_ms = (time.perf_counter() - start) * 1000
+        for path in paths:
+            timings = []
+            for _ in range(2):
+                t0 = time.perf_counter()
+                response = client.get(path, headers=headers)
+                timings.append((time.perf_counter() - t0) * 1000)
+            requests.append({
+                "path": path,
+                "status": response.status_code,
+                "first_ms": round(timings[0], 2),
+                "warm_ms": round(timings[1], 2),
+            })
+
+    print(json.dumps({
+        "import_ms": round(import_ms, 2),
+        "lifespan_ms": round(lifespan_ms, 2),
+        "heavy_modules_after_import": heavy_after_import,
+        "requests": requests,
+    }))
+
+
+def run_once(paths: List[str], user_id: int) -> Dict:
+    """Lance un interpréteur neuf et récupère ses mesures"""
+    cmd = [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--user-id", str(user_id)]
+    for path in paths:
+        cmd += ["--path", path]
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        cmd, cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    total_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr[-2000:])
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = round(total_ms, 2)
+    return result
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    """Médiane et maximum de chaque mesure"""
+    def stats(values: List[float]) -> Dict:
+        return {"median_ms": round(statistics.median(values), 2), "max_ms": round(max(values), 2)}
+
+    summary = {
+        "import": stats([r["import_ms"] for r in runs]),
+        "lifespan": stats([r["lifespan_ms"] for r in runs]),
+        "process": stats([r["process_ms"] for r in runs]),
+        "heavy_modules_after_import": runs[0]["heavy_modules_after_import"],
+        "requests": {},
+    }
+    for i, request in enumerate(runs[0]["requests"]):
+        summary["requests"][request["path"]] = {
+            "status": request["status"],
+            "first": stats([r["requests"][i]["first_ms"] for r in runs]),
+            "warm": stats([r["requests"][i]["warm_ms"] for r in runs]),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid de l'API")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre d'interpréteurs lancés")
+    parser.add_argument("--path", action="append", dest="paths", help="Chemin GET à appeler (répétable)")
+    parser.add_argument("--user-id", type=int, default=1, help="Utilisateur porté par le token de test")
+    parser.add_argument("--label", default="run", help="Libellé enregistré dans le JSON")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    paths = args.paths or ["/health"]
+    if args.child:
+        child(paths, args.user_id)
+        return
+
+    runs = [run_once(paths, args.user_id) for _ in range(args.runs)]
+    summary = summarize(runs)
+
+    print(f"Import app.main : {summary['import']['median_ms']:.0f} ms (max {summary['import']['max_ms']:.0f})")
+    print(f"Lifespan        : {summary['lifespan']['median_ms']:.0f} ms")
+    print(f"Processus total : {summary['process']['median_ms']:.0f} ms")
+    print(f"Modules lourds chargés à l'import : {summary['heavy_modules_after_import'] or 'aucun'}")
+    for path, data in summary["requests"].items():
+        print(
+            f"{path:45s} [{data['status']}] 1re requête {data['first']['median_ms']:8.1f} ms"
+            f"  à chaud {data['warm']['median_ms']:7.1f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"label": args.label, "summary": summary, "runs": runs}, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
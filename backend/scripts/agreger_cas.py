@@ -0,0 +1,40 @@
+# scripts/agreger_cas.py
+"""
+Reconstruction de cas_daily_agg depuis la table cas et les archives Parquet
+Exécuter : python -m scripts.agreger_cas
+
+La table est tenue à jour par l'API et les imports ; la reconstruire après
+une écriture directe en base (SQL manuel, restauration partielle) ou après
+une migration sur une base dont des cas sont déjà archivés. Les écritures
+sur cas attendent la fin de la reconstruction.
+"""
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+
+from sqlalchemy import event
+
+from app.core.database import SessionLocal
+from app.services.agregat_service import agregat_service
+
+
+def main():
+    debut = time.perf_counter()
+    with SessionLocal() as db:
+        # Agrégation de toute la table : pas de statement_timeout OLTP
+        event.listen(db, "after_begin", lambda session, transaction, connection: connection.exec_driver_sql(
+            "SET LOCAL statement_timeout = 0"
+        ))
+        stats = agregat_service.reconstruire(db)
+    print(
+        f"✅ cas_daily_agg reconstruite : {stats['lignes_cas']} lignes depuis cas, "
+        f"{stats['archives']} archive(s) relue(s) ({time.perf_counter() - debut:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# scripts/archiver_cas.py
+"""
+Archivage des cas clôturés (gueri, decede) anciens en Parquet compressé
+Exécuter : python -m scripts.archiver_cas
+           python -m scripts.archiver_cas --avant 2023-01-01
+
+Les fichiers sont écrits sous CAS_ARCHIVE_DIR (annee=AAAA/maladie_id=N/) et
+les cas correspondants supprimés de la table cas ; StatisticsService et le
+rapport global continuent de les compter. Le répertoire d'archives doit être
+sauvegardé comme la base.
+"""
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.archive_service import archive_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archivage Parquet des cas clôturés anciens")
+    parser.add_argument(
+        "--avant", type=date.fromisoformat,
+        help=f"Date de déclaration limite (défaut : aujourd'hui - {settings.CAS_ARCHIVE_AGE_JOURS} jours)"
+    )
+    args = parser.parse_args()
+    avant = args.avant or date.today() - timedelta(days=settings.CAS_ARCHIVE_AGE_JOURS)
+
+    debut = time.perf_counter()
+    with SessionLocal() as db:
+        # Lectures et suppressions longues : pas de statement_timeout OLTP
+        event.listen(db, "after_begin", lambda session, transaction, connection: connection.exec_driver_sql(
+            "SET LOCAL statement_timeout = 0"
+        ))
+        stats = archive_service.archiver(db, avant)
+    print(
+        f"✅ {stats['cas']} cas déclarés avant le {avant} archivés en {stats['fichiers']} fichier(s) "
+        f"sous {settings.CAS_ARCHIVE_DIR} ({time.perf_counter() - debut:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# scripts/detecter_doublons.py
+"""
+Détection en lot des cas probablement déclarés deux fois (historique)
+Exécuter : python -m scripts.detecter_doublons --date-debut 2024-01-01
+
+Les paires trouvées rejoignent la file de revue (GET /api/v1/doublons) ;
+une paire déjà présente, quel que soit son statut, n'est pas recréée. Les
+nouveaux cas sont traités au fil de l'eau par POST /cas et POST /cas/bulk.
+"""
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.services.doublon_service import doublon_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Détection des doublons probables sur l'historique")
+    parser.add_argument("--date-debut", type=date.fromisoformat, help="Date des symptômes minimale")
+    parser.add_argument("--date-fin", type=date.fromisoformat, help="Date des symptômes maximale")
+    parser.add_argument("--seuil", type=float, help="Similarité minimale des noms (défaut : configuration)")
+    args = parser.parse_args()
+
+    if args.seuil is not None:
+        doublon_service.seuil = args.seuil
+
+    debut = time.perf_counter()
+    with SessionLocal() as db:
+        # Lecture longue : lève le statement_timeout OLTP pour cette transaction
+        db.execute(text("SET LOCAL statement_timeout = 0"))
+        stats = doublon_service.detecter_historique(db, args.date_debut, args.date_fin)
+    print(
+        f"✅ {stats['cas']} cas en {stats['groupes']} groupes, "
+        f"{stats['paires']} nouvelle(s) paire(s) à vérifier ({time.perf_counter() - debut:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
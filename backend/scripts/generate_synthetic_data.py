@@ -0,0 +1,583 @@
+# scripts/generate_synthetic_data.py
+"""
+Générateur de données synthétiques à l'échelle de la production
+Exécuter : python -m scripts.generate_synthetic_data --cas 2000000 --seed 42 --date-fin 2025-12-31
+
+⚠️ Vide les tables métier (cas, alertes, interventions, référentiels, utilisateurs)
+avant de les remplir.
+
+- Référentiel : les 7 districts du Vakinankaratra, N centres de santé par district,
+  8 maladies avec des profils saisonniers distincts, un agent de saisie par district
+- Cas : courbes épidémiques par maladie et par district (saisonnalité + flambées),
+  délais de déclaration, coordonnées GPS dispersées autour du centre de santé
+- Alertes : une par flambée (semaines au-dessus du seuil), interventions associées
+- Chargement par COPY, par tranches mensuelles
+
+Deux exécutions avec les mêmes --seed, --cas, --annees, --date-fin et
+--centres-par-district produisent exactement les mêmes données.
+"""
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import io
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.partitions import assurer_partitions
+from app.core.security import get_password_hash
+from app.models.compteur_cas import PREFIXE_NUMERO
+from app.services.agregat_service import agregat_service
+from app.utils.enums import UserRole
+
+
+# ========================================
+# 🗺️ RÉFÉRENTIEL
+# ========================================
+
+DISTRICTS = [
+    # nom, code, population, latitude, longitude
+    ("Antsirabe I", "ATB-I", 257163, -19.8659, 47.0333),
+    ("Antsirabe II", "ATB-II", 514402, -19.8500, 47.0500),
+    ("Betafo", "BTF", 380250, -19.8333, 46.8500),
+    ("Antanifotsy", "ATF", 361340, -19.6500, 47.3167),
+    ("Faratsiho", "FRT", 189766, -19.4000, 46.9500),
+    ("Ambatolampy", "AMB", 275530, -19.3833, 47.4167),
+    ("Mandoto", "MDT", 173230, -19.5667, 46.2833),
+]
+
+# poids : part des cas | pic : jour de l'année | amplitude : saisonnalité (0-1)
+# flambees : nb moyen de flambées par an et par district | age : loi gamma (forme, échelle)
+# letalite : proportion de décès parmi les cas suivis
+MALADIES = [
+    {"nom": "Paludisme", "code": "PAL", "code_icd10": "B54", "priorite": 5, "poids": 0.42,
+     "pic": 45, "amplitude": 0.6, "flambees": 1.0, "age": (2.0, 12.0), "letalite": 0.002},
+    {"nom": "Infection respiratoire aiguë", "code": "IRA", "code_icd10": "J22", "priorite": 3, "poids": 0.20,
+     "pic": 200, "amplitude": 0.4, "flambees": 0.5, "age": (1.2, 15.0), "letalite": 0.004},
+    {"nom": "Diarrhée aiguë", "code": "DIA", "code_icd10": "A09", "priorite": 3, "poids": 0.15,
+     "pic": 15, "amplitude": 0.3, "flambees": 0.6, "age": (1.0, 6.0), "letalite": 0.003},
+    {"nom": "Tuberculose", "code": "TBC", "code_icd10": "A15", "priorite": 4, "poids": 0.08,
+     "pic": 0, "amplitude": 0.0, "flambees": 0.0, "age": (6.0, 6.5), "letalite": 0.03},
+    {"nom": "Rougeole", "code": "RGE", "code_icd10": "B05", "priorite": 4, "poids": 0.05,
+     "pic": 270, "amplitude": 0.2, "flambees": 0.5, "age": (2.5, 2.5), "letalite": 0.01},
+    {"nom": "Dengue", "code": "DEN", "code_icd10": "A90", "priorite": 3, "poids": 0.04,
+     "pic": 60, "amplitude": 0.5, "flambees": 0.4, "age": (3.0, 10.0), "letalite": 0.001},
+    {"nom": "Peste", "code": "PST", "code_icd10": "A20", "priorite": 5, "poids": 0.03,
+     "pic": 310, "amplitude": 0.8, "flambees": 0.3, "age": (3.0, 9.0), "letalite": 0.10},
+    {"nom": "Choléra", "code": "CHO", "code_icd10": "A00", "priorite": 5, "poids": 0.03,
+     "pic": 30, "amplitude": 0.3, "flambees": 0.2, "age": (2.5, 12.0), "letalite": 0.02},
+]
+
+# Interventions typiques par maladie (valeurs de TypeIntervention, stockées par nom)
+INTERVENTIONS_PAR_MALADIE = {
+    "Paludisme": ["DISTRIBUTION_MEDICAMENTS", "SENSIBILISATION", "DESINFECTION"],
+    "Infection respiratoire aiguë": ["SENSIBILISATION", "DISTRIBUTION_MEDICAMENTS"],
+    "Diarrhée aiguë": ["SENSIBILISATION", "DISTRIBUTION_MEDICAMENTS", "DESINFECTION"],
+    "Tuberculose": ["ENQUETE_TERRAIN", "DISTRIBUTION_MEDICAMENTS"],
+    "Rougeole": ["VACCINATION", "ENQUETE_TERRAIN"],
+    "Dengue": ["DESINFECTION", "SENSIBILISATION"],
+    "Peste": ["DESINFECTION", "ENQUETE_TERRAIN", "DISTRIBUTION_MEDICAMENTS"],
+    "Choléra": ["DESINFECTION", "SENSIBILISATION", "DISTRIBUTION_MEDICAMENTS"],
+}
+
+NOMS = [
+    "Rakoto", "Rabe", "Rasoa", "Randria", "Razafy", "Rakotomalala", "Rasolofo", "Andriamanana",
+    "Rajaonarison", "Ravelo", "Ranaivo", "Rakotondrabe", "Andrianarivelo", "Razanamparany",
+    "Ratsimba", "Rasoanaivo", "Andriambololona", "Rafidison", "Raharison", "Ramanantsoa",
+    "Rakotoarisoa", "Randrianasolo", "Rasamimanana", "Razafindrakoto", "Ravelomanana",
+]
+PRENOMS = [
+    "Jean", "Marie", "Hery", "Faly", "Voahangy", "Lalao", "Tiana", "Mialy", "Fara", "Njaka",
+    "Haja", "Lova", "Nirina", "Tahina", "Soa", "Fidy", "Rivo", "Zo", "Koto", "Bako",
+    "Andry", "Mamy", "Noro", "Hanitra", "Toky",
+]
+
+TABLES_A_VIDER = [
+    "interventions", "alertes", "predictions", "recommandations", "anomalies",
+    "cas", "cas_supprimes", "compteurs_cas", "numeros_cas", "cas_daily_agg", "cas_archives",
+    "users", "centres_sante", "maladies", "districts",
+]
+
+CAS_COLONNES = [
+    "numero_cas", "nom", "maladie_id", "centre_sante_id", "district_id", "date_symptomes",
+    "date_declaration", "age", "sexe", "statut", "latitude", "longitude", "created_by", "created_at",
+]
+
+
+# ========================================
+# 📈 COURBES ÉPIDÉMIQUES
+# ========================================
+
+def courbes_epidemiques(rng: np.random.Generator, jours: np.ndarray, total_cas: int) -> np.ndarray:
+    """
+    Nombre de cas par jour d'apparition des symptômes, forme (maladie, district, jour).
+
+    Intensité = poids maladie x population district x saisonnalité x tendance
+    + flambées (courbes gamma de 3 à 12 semaines), puis tirage de Poisson.
+    """
+    n_jours = len(jours)
+    doy = np.array([d.timetuple().tm_yday for d in jours], dtype=float)
+    annees = n_jours / 365.25
+    t = np.arange(n_jours, dtype=float)
+    populations = np.array([d[2] for d in DISTRICTS], dtype=float)
+    poids_districts = populations / populations.sum()
+    tendance = 1 + 0.05 * t / 365.25  # croissance démographique ~5 %/an
+
+    intensite = np.zeros((len(MALADIES), len(DISTRICTS), n_jours))
+    for m, maladie in enumerate(MALADIES):
+        saison = 1 + maladie["amplitude"] * np.cos(2 * np.pi * (doy - maladie["pic"]) / 365.25)
+        for d in range(len(DISTRICTS)):
+            # Hétérogénéité locale : chaque district a son propre niveau de base
+            base = maladie["poids"] * poids_districts[d] * rng.lognormal(0, 0.25)
+            courbe = base * saison * tendance
+            for _ in range(rng.poisson(maladie["flambees"] * annees)):
+                debut = rng.integers(0, n_jours)
+                duree = rng.integers(21, 84)
+                forme, echelle = 3.0, duree / 6.0
+                x = t[debut:debut + duree] - debut
+                pic = ((forme - 1) * echelle) ** (forme - 1) * np.exp(-(forme - 1))
+                profil = x ** (forme - 1) * np.exp(-x / echelle) / pic
+                courbe[debut:debut + duree] += base * rng.uniform(3, 15) * profil
+            intensite[m, d] = courbe
+
+    intensite *= total_cas / intensite.sum()
+    return rng.poisson(intensite)
+
+
+def seuils_maladies(comptes: np.ndarray) -> List[Dict]:
+    """Seuils d'alerte/épidémie déduits des comptes hebdomadaires (P90 / P98)"""
+    n_semaines = comptes.shape[2] // 7
+    hebdo = comptes[:, :, :n_semaines * 7].reshape(comptes.shape[0], comptes.shape[1], n_semaines, 7).sum(axis=3)
+    seuils = []
+    for m in range(comptes.shape[0]):
+        alerte = max(3, int(np.percentile(hebdo[m], 90)))
+        epidemie = max(alerte + 1, int(np.percentile(hebdo[m], 98)))
+        seuils.append({"seuil_alerte": alerte, "seuil_epidemie": epidemie})
+    return seuils
+
+
+# ========================================
+# 🏗️ RÉFÉRENTIEL EN BASE
+# ========================================
+
+def vider_tables(conn):
+    print("🗑️  Vidage des tables métier...")
+    conn.execute(text(f"TRUNCATE {', '.join(TABLES_A_VIDER)} RESTART IDENTITY CASCADE"))
+
+
+def inserer_referentiel(conn, rng: np.random.Generator, seuils: List[Dict], centres_par_district: int) -> Dict:
+    """Districts, maladies, centres, utilisateurs ; renvoie les identifiants utiles"""
+    district_ids = []
+    for nom, code, population, lat, lon in DISTRICTS:
+        district_ids.append(conn.execute(text("""
+            INSERT INTO districts (nom, code, population, latitude, longitude, is_active)
+            VALUES (:nom, :code, :population, :lat, :lon, true) RETURNING id
+        """), {"nom": nom, "code": code, "population": population, "lat": lat, "lon": lon}).scalar())
+
+    maladie_ids = []
+    for maladie, seuil in zip(MALADIES, seuils):
+        maladie_ids.append(conn.execute(text("""
+            INSERT INTO maladies (nom, code, code_icd10, seuil_alerte, seuil_epidemie,
+                                  priorite_surveillance, is_active)
+            VALUES (:nom, :code, :icd, :sa, :se, :prio, true) RETURNING id
+        """), {
+            "nom": maladie["nom"], "code": maladie["code"], "icd": maladie["code_icd10"],
+            "sa": seuil["seuil_alerte"], "se": seuil["seuil_epidemie"], "prio": maladie["priorite"],
+        }).scalar())
+
+    # Centres : un CHD, quelques CSB2, le reste en CSB1 ; poids = capacité d'accueil
+    centres = []  # (district_index, id, latitude, longitude, capacite)
+    for d, (nom_district, code, _, lat, lon) in enumerate(DISTRICTS):
+        for c in range(centres_par_district):
+            type_centre, capacite = ("CHD", 150) if c == 0 else ("CSB2", 50) if c < 4 else ("CSB1", 20)
+            clat, clon = lat + rng.normal(0, 0.12), lon + rng.normal(0, 0.12)
+            centre_id = conn.execute(text("""
+                INSERT INTO centres_sante (nom, type, district_id, latitude, longitude,
+                                           capacite_accueil, a_laboratoire, is_active)
+                VALUES (:nom, :type, :district_id, :lat, :lon, :capacite, :labo, true) RETURNING id
+            """), {
+                "nom": f"{type_centre} {nom_district} {c + 1:02d}", "type": type_centre,
+                "district_id": district_ids[d], "lat": float(clat), "lon": float(clon),
+                "capacite": capacite, "labo": type_centre != "CSB1",
+            }).scalar()
+            centres.append((d, centre_id, float(clat), float(clon), capacite))
+
+    # Utilisateurs : comptes habituels + un agent de saisie par district
+    comptes = [
+        ("admin@drsp.mg", "Administrateur", "Système", "admin123", UserRole.ADMINISTRATEUR, None),
+        ("epidemio@drsp.mg", "Rakoto", "Jean", "epidemio123", UserRole.EPIDEMIOLOGISTE, None),
+        ("lecteur@drsp.mg", "Randria", "Paul", "lecteur123", UserRole.LECTEUR, None),
+    ]
+    for d, (nom_district, code, *_rest) in enumerate(DISTRICTS):
+        comptes.append((f"agent.{code.lower()}@drsp.mg", "Agent", nom_district, "agent123",
+                        UserRole.AGENT_SAISIE, district_ids[d]))
+
+    hashes = {}
+    user_ids = {}
+    for email, nom, prenom, password, role, district_id in comptes:
+        if password not in hashes:
+            hashes[password] = get_password_hash(password)
+        user_ids[email] = conn.execute(text("""
+            INSERT INTO users (email, nom, prenom, hashed_password, role, district_id, is_active)
+            VALUES (:email, :nom, :prenom, :hash, :role, :district_id, true) RETURNING id
+        """), {
+            "email": email, "nom": nom, "prenom": prenom, "hash": hashes[password],
+            "role": role.name, "district_id": district_id,
+        }).scalar()
+
+    agents = [user_ids[f"agent.{code.lower()}@drsp.mg"] for _, code, *_rest in DISTRICTS]
+    return {
+        "districts": district_ids,
+        "maladies": maladie_ids,
+        "centres": centres,
+        "agents": agents,
+        "admin": user_ids["admin@drsp.mg"],
+        "epidemio": user_ids["epidemio@drsp.mg"],
+    }
+
+
+# ========================================
+# 🧬 GÉNÉRATION DES CAS
+# ========================================
+
+def generer_cas_mois(
+    rng: np.random.Generator,
+    comptes: np.ndarray,
+    jours: np.ndarray,
+    indices_jours: np.ndarray,
+    ids: Dict,
+    compteurs: Dict[int, int],
+) -> pd.DataFrame:
+    """Cas dont les symptômes débutent sur la tranche de jours donnée"""
+    sous_comptes = comptes[:, :, indices_jours]
+    total = int(sous_comptes.sum())
+    if total == 0:
+        return pd.DataFrame(columns=CAS_COLONNES)
+
+    m_idx, d_idx, j_idx = np.nonzero(sous_comptes)
+    repetitions = sous_comptes[m_idx, d_idx, j_idx]
+    maladie = np.repeat(m_idx, repetitions)
+    district = np.repeat(d_idx, repetitions)
+    jour = indices_jours[np.repeat(j_idx, repetitions)]
+
+    # Délai de déclaration : binomiale négative (moyenne ~3 jours, longue traîne)
+    delai = rng.negative_binomial(2, 0.4, size=total)
+    date_fin_idx = len(jours) - 1
+    garde = jour + delai <= date_fin_idx  # troncature à droite : pas encore déclarés
+    maladie, district, jour, delai = maladie[garde], district[garde], jour[garde], delai[garde]
+    n = len(maladie)
+    declaration = jour + delai
+
+    # Centre de santé dans le district, pondéré par la capacité d'accueil
+    centres = ids["centres"]
+    centre_ids = np.empty(n, dtype=np.int64)
+    centre_lat = np.empty(n)
+    centre_lon = np.empty(n)
+    for d in range(len(DISTRICTS)):
+        masque = district == d
+        k = int(masque.sum())
+        if not k:
+            continue
+        locaux = [c for c in centres if c[0] == d]
+        poids = np.array([c[4] for c in locaux], dtype=float)
+        choix = rng.choice(len(locaux), size=k, p=poids / poids.sum())
+        centre_ids[masque] = np.array([c[1] for c in locaux])[choix]
+        centre_lat[masque] = np.array([c[2] for c in locaux])[choix]
+        centre_lon[masque] = np.array([c[3] for c in locaux])[choix]
+
+    # GPS : dispersion ~2 km autour du centre, 5 % de cas sans coordonnées
+    latitude = centre_lat + rng.normal(0, 0.02, n)
+    longitude = centre_lon + rng.normal(0, 0.02, n)
+    sans_gps = rng.random(n) < 0.05
+    latitude[sans_gps] = np.nan
+    longitude[sans_gps] = np.nan
+
+    # Âge selon le profil de la maladie
+    age = np.empty(n)
+    for m, profil in enumerate(MALADIES):
+        masque = maladie == m
+        age[masque] = rng.gamma(*profil["age"], size=int(masque.sum()))
+    age = np.clip(age, 0, 95).astype(int)
+
+    sexe = np.where(rng.random(n) < 0.5, "MASCULIN", "FEMININ")
+
+    # Statut : les cas récents sont encore suspects/probables, les anciens sont clôturés
+    anciennete = date_fin_idx - declaration
+    tirage = rng.random(n)
+    letalite = np.array([p["letalite"] for p in MALADIES])[maladie]
+    statut = np.where(
+        anciennete < 7,
+        np.where(tirage < 0.6, "SUSPECT", np.where(tirage < 0.85, "PROBABLE", "CONFIRME")),
+        np.where(tirage < letalite, "DECEDE",
+                 np.where(tirage < letalite + 0.03, "SUSPECT",
+                          np.where(tirage < letalite + 0.20, "CONFIRME", "GUERI"))),
+    )
+
+    noms = np.array(PRENOMS, dtype=object)[rng.integers(0, len(PRENOMS), n)] + " " + \
+        np.array(NOMS, dtype=object)[rng.integers(0, len(NOMS), n)]
+
+    dates = pd.to_datetime(pd.Series(jours))
+    date_symptomes = dates.iloc[jour].dt.date.values
+    date_declaration = dates.iloc[declaration].reset_index(drop=True)
+    created_at = (date_declaration + pd.to_timedelta(8 * 3600 + rng.integers(0, 10 * 3600, n), unit="s"))
+
+    # Numéros VAKIN-AAAA-NNNNN, séquence par année de déclaration
+    ordre = np.argsort(declaration, kind="stable")
+    annees = date_declaration.dt.year.values
+    numeros = np.empty(n, dtype=object)
+    for i in ordre:
+        annee = int(annees[i])
+        compteurs[annee] = compteurs.get(annee, 0) + 1
+        numeros[i] = f"{PREFIXE_NUMERO}-{annee}-{compteurs[annee]:05d}"
+
+    return pd.DataFrame({
+        "numero_cas": numeros,
+        "nom": noms,
+        "maladie_id": np.array(ids["maladies"])[maladie],
+        "centre_sante_id": centre_ids,
+        "district_id": np.array(ids["districts"])[district],
+        "date_symptomes": date_symptomes,
+        "date_declaration": date_declaration.dt.date.values,
+        "age": age,
+        "sexe": sexe,
+        "statut": statut,
+        "latitude": np.round(latitude, 6),
+        "longitude": np.round(longitude, 6),
+        "created_by": np.array(ids["agents"])[district],
+        "created_at": created_at.dt.strftime("%Y-%m-%d %H:%M:%S+03").values,
+    }).iloc[ordre]
+
+
+def copier(raw_conn, table: str, colonnes: List[str], df: pd.DataFrame):
+    """COPY ... FROM STDIN d'un DataFrame (NaN -> NULL)"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    with raw_conn.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(colonnes)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+
+
+# ========================================
+# 🚨 ALERTES ET INTERVENTIONS
+# ========================================
+
+def generer_alertes(rng, comptes, jours, seuils, ids, date_fin: date):
+    """Une alerte par épisode de semaines consécutives au-dessus du seuil d'alerte"""
+    n_semaines = comptes.shape[2] // 7
+    hebdo = comptes[:, :, :n_semaines * 7].reshape(comptes.shape[0], comptes.shape[1], n_semaines, 7).sum(axis=3)
+    alertes = []
+    for m, maladie in enumerate(MALADIES):
+        seuil, epidemie = seuils[m]["seuil_alerte"], seuils[m]["seuil_epidemie"]
+        for d in range(len(DISTRICTS)):
+            s = 0
+            while s < n_semaines:
+                if hebdo[m, d, s] < seuil:
+                    s += 1
+                    continue
+                debut = s
+                while s < n_semaines and hebdo[m, d, s] >= seuil:
+                    s += 1
+                pic = int(hebdo[m, d, debut:s].max())
+                detection = jours[debut * 7 + 6] + timedelta(days=int(rng.integers(1, 4)))
+                if detection > date_fin:
+                    continue
+                fin_episode = jours[min(s * 7 + 6, len(jours) - 1)]
+                niveau = "critique" if pic >= 1.5 * epidemie else "alerte" if pic >= epidemie else "avertissement"
+                if fin_episode + timedelta(days=14) < date_fin:
+                    statut = "fausse_alerte" if rng.random() < 0.08 else "resolue"
+                    resolution = fin_episode + timedelta(days=int(rng.integers(3, 15)))
+                else:
+                    statut = "en_cours" if rng.random() < 0.5 else "active"
+                    resolution = None
+                alertes.append({
+                    "type_alerte": "Épidémie confirmée" if niveau != "avertissement" else "Dépassement de seuil",
+                    "niveau_gravite": niveau,
+                    "maladie_id": ids["maladies"][m],
+                    "district_id": ids["districts"][d],
+                    "nombre_cas": int(hebdo[m, d, debut]),
+                    "seuil_declenche": seuil,
+                    "date_detection": detection,
+                    "date_resolution": resolution,
+                    "statut": statut,
+                    "description": (
+                        f"{int(hebdo[m, d, debut])} cas de {maladie['nom']} en une semaine "
+                        f"dans le district {DISTRICTS[d][0]} (seuil {seuil}, pic {pic})"
+                    ),
+                    "created_by": ids["epidemio"],
+                    "created_at": f"{detection.isoformat()} 09:00:00",
+                    "_maladie": maladie["nom"],
+                    "_district_index": d,
+                })
+    return alertes
+
+
+def generer_interventions(rng, alertes_ids: List[int], alertes: List[Dict], ids: Dict, date_fin: date):
+    """Une ou deux interventions pour ~70 % des alertes"""
+    interventions = []
+    for alerte_id, alerte in zip(alertes_ids, alertes):
+        if alerte["statut"] == "fausse_alerte" or rng.random() > 0.7:
+            continue
+        types = INTERVENTIONS_PAR_MALADIE[alerte["_maladie"]]
+        for _ in range(int(rng.integers(1, 3))):
+            type_intervention = types[int(rng.integers(0, len(types)))]
+            planifiee = alerte["date_detection"] + timedelta(days=int(rng.integers(1, 6)))
+            debut = planifiee + timedelta(days=int(rng.integers(0, 4)))
+            fin = debut + timedelta(days=int(rng.integers(5, 31)))
+            if rng.random() < 0.05:
+                statut = "ANNULEE"
+            elif fin < date_fin:
+                statut = "TERMINEE"
+            elif debut <= date_fin:
+                statut = "EN_COURS"
+            else:
+                statut = "PLANIFIEE"
+            cible = int(rng.integers(500, 20000))
+            interventions.append({
+                "titre": f"{type_intervention.replace('_', ' ').capitalize()} - {alerte['_maladie']}",
+                "description": f"Riposte à l'alerte du {alerte['date_detection'].isoformat()}",
+                "type": type_intervention,
+                "statut": statut,
+                "district_id": alerte["district_id"],
+                "maladie_id": alerte["maladie_id"],
+                "date_planifiee": planifiee,
+                "date_debut": debut if statut in ("EN_COURS", "TERMINEE") else None,
+                "date_fin": fin if statut == "TERMINEE" else None,
+                "population_cible": cible,
+                "population_atteinte": int(cible * rng.uniform(0.5, 1.0)) if statut == "TERMINEE" else None,
+                "budget_alloue": float(round(rng.uniform(1, 50) * 1e6, -3)),
+                "efficacite_score": int(rng.integers(1, 6)) if statut == "TERMINEE" else None,
+                "generee_par_ia": False,
+                "alerte_id": alerte_id,
+                "created_by": ids["epidemio"],
+            })
+    return interventions
+
+
+# ========================================
+# 🚀 PROGRAMME PRINCIPAL
+# ========================================
+
+def generer(nb_cas: int, seed: int, annees: int, date_fin: date, centres_par_district: int):
+    rng = np.random.default_rng(seed)
+    date_debut = date_fin - timedelta(days=int(round(annees * 365.25)) - 1)
+    jours = np.array([date_debut + timedelta(days=i) for i in range((date_fin - date_debut).days + 1)])
+
+    debut_total = time.perf_counter()
+    print(f"📈 Courbes épidémiques ({len(MALADIES)} maladies x {len(DISTRICTS)} districts x {len(jours)} jours)...")
+    comptes = courbes_epidemiques(rng, jours, nb_cas)
+    seuils = seuils_maladies(comptes)
+
+    # Aucun statement_timeout ici : le chargement dure plusieurs minutes
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    with engine.begin() as conn:
+        vider_tables(conn)
+        assurer_partitions(conn, range(date_debut.year, date_fin.year + 1))
+        ids = inserer_referentiel(conn, rng, seuils, centres_par_district)
+
+    print(f"🧬 Génération et COPY des cas du {date_debut} au {date_fin}...")
+    raw = engine.raw_connection()
+    compteurs: Dict[int, int] = {}
+    total = 0
+    try:
+        with raw.cursor() as cursor:
+            cursor.execute("SET synchronous_commit = off")
+        mois = pd.Series(pd.to_datetime(pd.Series(jours)).dt.to_period("M"))
+        for periode in mois.unique():
+            indices = np.nonzero((mois == periode).values)[0]
+            df = generer_cas_mois(rng, comptes, jours, indices, ids, compteurs)
+            if len(df):
+                copier(raw, "cas", CAS_COLONNES, df)
+                raw.commit()
+                total += len(df)
+            print(f"   {periode}: {len(df):>8,} cas  (total {total:,}, {time.perf_counter() - debut_total:.0f}s)")
+
+        # Compteurs annuels alignés sur les numéros chargés (voir CRUDCas.allouer_numero)
+        with raw.cursor() as cursor:
+            for annee, dernier in sorted(compteurs.items()):
+                cursor.execute(
+                    "INSERT INTO compteurs_cas (prefixe, annee, dernier_numero) VALUES (%s, %s, %s)",
+                    (PREFIXE_NUMERO, annee, dernier)
+                )
+
+        alertes = generer_alertes(rng, comptes, jours, seuils, ids, date_fin)
+        with raw.cursor() as cursor:
+            alertes_ids = []
+            for alerte in alertes:
+                cursor.execute("""
+                    INSERT INTO alertes (type_alerte, niveau_gravite, maladie_id, district_id, nombre_cas,
+                        seuil_declenche, date_detection, date_resolution, statut, description,
+                        created_by, created_at)
+                    VALUES (%(type_alerte)s, %(niveau_gravite)s, %(maladie_id)s, %(district_id)s,
+                        %(nombre_cas)s, %(seuil_declenche)s, %(date_detection)s, %(date_resolution)s,
+                        %(statut)s, %(description)s, %(created_by)s, %(created_at)s)
+                    RETURNING id
+                """, alerte)
+                alertes_ids.append(cursor.fetchone()[0])
+
+        interventions = generer_interventions(rng, alertes_ids, alertes, ids, date_fin)
+        if interventions:
+            df = pd.DataFrame(interventions)
+            # Entiers nullables : sinon pandas écrit "123.0", refusé par COPY
+            for colonne in ("population_atteinte", "efficacite_score"):
+                df[colonne] = df[colonne].astype("Int64")
+            copier(raw, "interventions", list(df.columns), df)
+        raw.commit()
+    finally:
+        raw.close()
+
+    # COPY contourne CRUDCas : cas_daily_agg est calculée une fois le chargement terminé
+    print("📊 Agrégats journaliers (cas_daily_agg)...")
+    with Session(engine) as db:
+        agregat_service.reconstruire(db)
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            raw.autocommit = True
+            cursor.execute("ANALYZE")
+    finally:
+        raw.close()
+
+    duree = time.perf_counter() - debut_total
+    print("\n" + "=" * 50)
+    print(f"✓ {total:,} cas, {len(alertes)} alertes, {len(interventions)} interventions en {duree:.0f}s")
+    print(f"  Reproductible avec : --cas {nb_cas} --seed {seed} --annees {annees} "
+          f"--date-fin {date_fin.isoformat()} --centres-par-district {centres_par_district}")
+    print("=" * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de données synthétiques (COPY)")
+    parser.add_argument("--cas", type=int, default=1_000_000, help="Nombre de cas visé (avant troncature)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--annees", type=int, default=3, help="Profondeur d'historique")
+    parser.add_argument("--date-fin", type=date.fromisoformat, default=date.today(),
+                        help="Dernier jour généré (AAAA-MM-JJ) ; à fixer pour un jeu de référence")
+    parser.add_argument("--centres-par-district", type=int, default=25)
+    parser.add_argument("--oui", action="store_true", help="Ne pas demander de confirmation")
+    args = parser.parse_args()
+
+    if not args.oui:
+        print("⚠️  Ce script va SUPPRIMER les cas, alertes, interventions, référentiels et utilisateurs !")
+        if input("Continuer ? (oui/non) : ").lower() not in ("oui", "o", "yes", "y"):
+            print("❌ Annulé.")
+            return
+
+    generer(args.cas, args.seed, args.annees, args.date_fin, args.centres_par_district)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/init_db.py
+"""
+Script pour créer ou mettre à jour le schéma de la base de données
+Exécuter : python -m scripts.init_db
+
+L'API ne crée plus les tables au démarrage : le schéma appartient à Alembic.
+- Base vide : création complète depuis les modèles puis `alembic stamp head`
+- Base créée par l'ancien `create_all` (sans table alembic_version) : marquée à la
+  révision de ce schéma (98551600bc48) puis `alembic upgrade head`, pour appliquer
+  les migrations suivantes (compteurs, index, partitions, agrégats...)
+- Base existante : `alembic upgrade head`
+Puis création des partitions de cas de l'année courante et suivante(s)
+(l'API n'en crée pas au démarrage).
+"""
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+from app.core.database import engine, Base
+from app.core.partitions import assurer_partitions_courantes
+import app.models  # noqa: F401  (enregistre tous les modèles dans Base.metadata)
+
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+# Dernière révision correspondant au schéma de l'ancien create_all
+REVISION_CREATE_ALL = "98551600bc48"
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return config
+
+
+def init_db():
+    """Crée le schéma sur une base vide, sinon applique les migrations en attente"""
+    config = get_alembic_config()
+    tables = set(inspect(engine).get_table_names())
+
+    if not tables - {"alembic_version"}:
+        print("Base vide : création des tables...")
+        Base.metadata.create_all(bind=engine)
+        command.stamp(config, "head")
+        print("✓ Tables créées, révision Alembic marquée à head")
+    elif "alembic_version" not in tables:
+        print(f"Base créée hors Alembic : marquage à {REVISION_CREATE_ALL} puis migrations...")
+        command.stamp(config, REVISION_CREATE_ALL)
+        command.upgrade(config, "head")
+        print("✓ Schéma à jour")
+    else:
+        print("Base existante : application des migrations...")
+        command.upgrade(config, "head")
+        print("✓ Schéma à jour")
+
+    with engine.begin() as conn:
+        # Déplacement éventuel depuis cas_defaut : pas de statement_timeout OLTP
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        creees = assurer_partitions_courantes(conn)
+    print(f"✓ Partitions de cas : {', '.join(creees) or 'déjà présentes'}")
+
+
+if __name__ == "__main__":
+    init_db()
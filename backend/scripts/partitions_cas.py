@@ -0,0 +1,56 @@
+# scripts/partitions_cas.py
+"""
+Gestion des partitions annuelles de la table cas
+Exécuter : python -m scripts.partitions_cas lister
+           python -m scripts.partitions_cas courantes
+           python -m scripts.partitions_cas creer 2027 2028
+           python -m scripts.partitions_cas detacher 2019
+
+Une partition détachée (cas_AAAA) reste en base comme table autonome : elle
+n'est plus lue par l'API et peut être exportée (pg_dump -t cas_AAAA) puis
+supprimée. `courantes` (année courante + CAS_PARTITIONS_AVANCE) est lancé
+par scripts.init_db et doit être planifié chaque année (cron, décembre) :
+l'API ne crée aucune partition au démarrage.
+"""
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.partitions import assurer_partitions, assurer_partitions_courantes, detacher_partition, partitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitions annuelles de la table cas")
+    parser.add_argument("action", choices=["lister", "courantes", "creer", "detacher"])
+    parser.add_argument("annees", nargs="*", type=int, help="Années concernées (creer, detacher)")
+    args = parser.parse_args()
+
+    if args.action in ("creer", "detacher") and not args.annees:
+        parser.error(f"{args.action} : au moins une année attendue")
+
+    with engine.begin() as conn:
+        # Déplacement depuis cas_defaut potentiellement long
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        if args.action in ("creer", "courantes"):
+            if args.action == "creer":
+                creees = assurer_partitions(conn, args.annees)
+            else:
+                creees = assurer_partitions_courantes(conn)
+            print(f"✅ Partitions créées : {', '.join(creees) or 'aucune (déjà présentes)'}")
+        elif args.action == "detacher":
+            for annee in args.annees:
+                print(f"📦 {detacher_partition(conn, annee)} détachée, prête pour l'archivage")
+        else:
+            for partition in partitions(conn):
+                print(f"{partition['nom']:12s} {partition['lignes_estimees']:>10d}  {partition['bornes']}")
+
+
+if __name__ == "__main__":
+    main()
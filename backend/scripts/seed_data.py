@@ -25,10 +25,9 @@ from app.utils.enums import (
 
 
 def create_tables():
-    """Créer toutes les tables"""
-    print("Création des tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✓ Tables créées")
+    """Créer toutes les tables (ou appliquer les migrations Alembic)"""
+    from scripts.init_db import init_db
+    init_db()
 
 
 def seed_users(db):
@@ -0,0 +1,28 @@
+"""
+📄 Fichier: tests/conftest.py
+📝 Description: Fixtures communes des tests
+🎯 Usage: pytest (depuis backend/)
+
+Les tests d'intégration demandent une base PostgreSQL migrée
+(python -m scripts.init_db) joignable via DATABASE_URL ; ils sont sautés
+sinon.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def base_disponible():
+    """Moteur OLTP si la base répond, sinon les tests qui en dépendent sont sautés"""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import text
+    from sqlalchemy.exc import DBAPIError
+
+    from app.core.database import engine
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except DBAPIError as exc:
+        pytest.skip(f"Base de données indisponible ({exc.__class__.__name__})")
+    return engine
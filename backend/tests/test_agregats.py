@@ -0,0 +1,107 @@
+"""
+📄 Fichier: tests/test_agregats.py
+📝 Description: Tenue incrémentale de cas_daily_agg (AgregatService)
+🎯 Usage: pytest tests/test_agregats.py
+
+Les ajouts, modifications et suppressions incrémentaux doivent donner les
+mêmes lignes que la reconstruction complète. Les cas de test sont déclarés
+en 9999 et tout est annulé à la fin (transaction externe, la reconstruction
+ne valide qu'un point de sauvegarde).
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.cas import Cas  # noqa: E402
+from app.models.cas_daily_agg import AXE_DECLARATION, AXE_SYMPTOMES, CasDailyAgg  # noqa: E402
+from app.services.agregat_service import (  # noqa: E402
+    AGE_INCONNU, CLE, COLONNES_CAS, agregat_service, cles, instantane, tranche_age
+)
+from app.utils.enums import CasStatut, Sexe  # noqa: E402
+
+
+@pytest.mark.parametrize("age, tranche", [
+    (None, AGE_INCONNU), (0, "0-1 an"), (1, "1-4 ans"), (4, "1-4 ans"), (5, "5-14 ans"),
+    (44, "25-44 ans"), (64, "45-64 ans"), (65, "65+ ans"), (102, "65+ ans"),
+])
+def test_tranche_age(age, tranche):
+    assert tranche_age(age) == tranche
+
+
+def test_cles_un_cas_par_axe():
+    cas = SimpleNamespace(
+        date_declaration=date(2024, 3, 4), date_symptomes=date(2024, 3, 1), maladie_id=1, district_id=2,
+        centre_sante_id=3, statut=CasStatut.CONFIRME, sexe=None, age=30
+    )
+    dimensions = (1, 2, 3, "CONFIRME", "NR", "25-44 ans")
+    assert cles(cas) == [
+        (AXE_DECLARATION, date(2024, 3, 4), *dimensions), (AXE_SYMPTOMES, date(2024, 3, 1), *dimensions)
+    ]
+    # Ligne d'archive Parquet : énumérations déjà en noms
+    assert cles(SimpleNamespace(**{**vars(cas), "statut": "CONFIRME"})) == cles(cas)
+
+
+def etat(db: Session):
+    """Lignes non nulles de cas_daily_agg pour l'année 9999"""
+    lignes = db.execute(
+        select(*(getattr(CasDailyAgg, colonne) for colonne in CLE), CasDailyAgg.nombre)
+        .where(CasDailyAgg.jour >= date(9999, 1, 1), CasDailyAgg.nombre != 0)
+    ).all()
+    return {tuple(ligne[:-1]): ligne.nombre for ligne in lignes}
+
+
+def test_incremental_egal_reconstruction(base_disponible):
+    pytest.importorskip("pyarrow")
+    with base_disponible.connect() as conn:
+        references = conn.execute(
+            select(Cas.maladie_id, Cas.centre_sante_id, Cas.district_id, Cas.created_by).limit(1)
+        ).mappings().first()
+        if references is None:
+            pytest.skip("Table cas vide : lancer d'abord scripts.generate_synthetic_data")
+        conn.rollback()
+
+        conn.begin()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            variantes = [
+                {"statut": CasStatut.SUSPECT, "sexe": Sexe.FEMININ, "age": 3},
+                {"statut": CasStatut.SUSPECT, "sexe": Sexe.FEMININ, "age": 3},
+                {"statut": CasStatut.CONFIRME, "sexe": None, "age": None},
+                {"statut": CasStatut.GUERI, "sexe": Sexe.MASCULIN, "age": 70},
+            ]
+            lignes = db.execute(
+                insert(Cas).returning(Cas.id, *(getattr(Cas, colonne) for colonne in COLONNES_CAS)),
+                [
+                    {**references, **variante, "numero_cas": f"TEST-9999-{numero:05d}",
+                     "date_symptomes": date(9999, 1, 1 + numero), "date_declaration": date(9999, 1, 8)}
+                    for numero, variante in enumerate(variantes, start=10)
+                ]
+            ).all()
+            agregat_service.ajouter(db, lignes)
+
+            modifie = db.get(Cas, lignes[0].id)
+            avant = instantane(modifie)
+            modifie.statut, modifie.age, modifie.date_declaration = CasStatut.CONFIRME, 45, date(9999, 2, 1)
+            db.flush()
+            agregat_service.modifier(db, avant, modifie)
+
+            supprime = db.get(Cas, lignes[2].id)
+            agregat_service.retirer(db, [supprime])
+            db.delete(supprime)
+            db.flush()
+
+            incremental = etat(db)
+            assert sum(incremental.values()) == 2 * 3
+
+            agregat_service.reconstruire(db)
+            assert etat(db) == incremental
+        finally:
+            db.close()
+            conn.rollback()
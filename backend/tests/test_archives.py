@@ -0,0 +1,59 @@
+"""
+📄 Fichier: tests/test_archives.py
+📝 Description: Comptages à travers les archives Parquet (ArchiveService)
+🎯 Usage: pytest tests/test_archives.py
+
+Sans base : un fichier d'archive au schéma de l'archivage est écrit dans un
+répertoire temporaire.
+"""
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pa = pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq  # noqa: E402
+
+from app.services.archive_service import SCHEMA, archive_service  # noqa: E402
+from app.utils.enums import CasStatut  # noqa: E402
+
+
+@pytest.fixture
+def fichiers(tmp_path):
+    lignes = [
+        {"id": 1, "maladie_id": 1, "district_id": 10, "statut": "GUERI", "sexe": "FEMININ",
+         "date_declaration": date(2020, 1, 5)},
+        {"id": 2, "maladie_id": 1, "district_id": 10, "statut": "DECEDE", "sexe": None,
+         "date_declaration": date(2020, 2, 5)},
+        {"id": 3, "maladie_id": 2, "district_id": 11, "statut": "GUERI", "sexe": "MASCULIN",
+         "date_declaration": date(2020, 3, 5)},
+    ]
+    chemins = []
+    for numero, morceau in enumerate((lignes[:2], lignes[2:])):
+        chemin = tmp_path / f"cas-{numero}.parquet"
+        pq.write_table(pa.Table.from_pylist(morceau, schema=SCHEMA), chemin, compression="zstd")
+        chemins.append(str(chemin))
+    return chemins
+
+
+def test_compter_sans_fichier():
+    assert archive_service.compter([], maladie_id=1) == 0
+    assert archive_service.compter_par([], "statut") == {}
+    assert archive_service.distincts([], "district_id") == set()
+
+
+def test_compter_filtres(fichiers):
+    assert archive_service.compter(fichiers) == 3
+    assert archive_service.compter(fichiers, maladie_id=1) == 2
+    assert archive_service.compter(fichiers, district_id=11) == 1
+    assert archive_service.compter(fichiers, statuts=[CasStatut.DECEDE]) == 1
+    # Bornes de la période de déclaration incluses
+    assert archive_service.compter(fichiers, date_debut=date(2020, 2, 5), date_fin=date(2020, 3, 5)) == 2
+
+
+def test_compter_par_et_distincts(fichiers):
+    assert archive_service.compter_par(fichiers, "statut") == {"GUERI": 2, "DECEDE": 1}
+    assert archive_service.compter_par(fichiers, "sexe", maladie_id=1) == {"FEMININ": 1, None: 1}
+    assert archive_service.distincts(fichiers, "district_id", date_fin=date(2020, 2, 28)) == {10}
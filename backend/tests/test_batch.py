@@ -0,0 +1,111 @@
+"""
+📄 Fichier: tests/test_batch.py
+📝 Description: POST /batch : sous-requêtes identiques exécutées une fois, erreurs isolées
+🎯 Usage: pytest tests/test_batch.py
+
+Sans base : le routeur du lot est monté sur une petite application dont les
+routes comptent leurs appels, échouent ou renvoient du texte.
+"""
+
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Response  # noqa: E402
+from fastapi.responses import PlainTextResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.deps import get_current_active_user, get_current_user  # noqa: E402
+from app.api.v1.endpoints import batch  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.principal import Principal  # noqa: E402
+from app.main import global_exception_handler  # noqa: E402
+from app.utils.enums import UserRole  # noqa: E402
+from app.utils.pagination import NEXT_CURSOR_HEADER  # noqa: E402
+
+PRINCIPAL = Principal(id=7, role=UserRole.EPIDEMIOLOGISTE, is_active=True)
+
+
+@pytest.fixture
+def appels():
+    return Counter()
+
+
+@pytest.fixture
+def client(appels):
+    routes = APIRouter()
+
+    @routes.get("/compteur")
+    async def compteur(n: int = 0):
+        appels[n] += 1
+        return {"n": n}
+
+    @routes.get("/page")
+    async def page(response: Response):
+        response.headers[NEXT_CURSOR_HEADER] = "suivante"
+        return []
+
+    @routes.get("/moi")
+    async def moi(principal: Principal = Depends(get_current_user)):
+        return {"id": principal.id}
+
+    @routes.get("/absent")
+    async def absent():
+        raise HTTPException(status_code=404, detail="Introuvable")
+
+    @routes.get("/panne")
+    async def panne():
+        raise RuntimeError("panne")
+
+    @routes.get("/texte", response_class=PlainTextResponse)
+    async def texte():
+        return "bonjour"
+
+    app = FastAPI()
+    app.add_exception_handler(Exception, global_exception_handler)
+    app.include_router(routes, prefix=settings.API_V1_STR)
+    app.include_router(batch.router, prefix=f"{settings.API_V1_STR}/batch")
+    app.dependency_overrides[get_current_active_user] = lambda: PRINCIPAL
+    with TestClient(app, raise_server_exceptions=False) as client:
+        yield client
+
+
+def lot(client, *urls):
+    reponse = client.post(
+        f"{settings.API_V1_STR}/batch",
+        json={"requetes": [{"id": str(i), "url": url} for i, url in enumerate(urls)]},
+        headers={"Authorization": "Bearer jeton"}
+    )
+    assert reponse.status_code == 200
+    return reponse.json()["reponses"]
+
+
+def test_sous_requetes_identiques_executees_une_fois(client, appels):
+    reponses = lot(client, "/compteur?n=1", "/compteur?n=2", "/compteur?n=1")
+    assert [(r["id"], r["status"], r["body"]) for r in reponses] == [
+        ("0", 200, {"n": 1}), ("1", 200, {"n": 2}), ("2", 200, {"n": 1})
+    ]
+    assert appels == {1: 1, 2: 1}
+
+
+def test_erreurs_isolees(client):
+    reponses = lot(client, "/absent", "/panne", "/texte", "/inconnue", "/compteur")
+    assert [r["status"] for r in reponses] == [404, 500, 406, 404, 200]
+    assert reponses[0]["body"] == {"detail": "Introuvable"}
+    assert reponses[1]["body"]["detail"] == "Une erreur interne est survenue"
+    assert reponses[4]["body"] == {"n": 0}
+
+
+def test_principal_du_lot_et_en_tetes_transmis(client):
+    moi, page = lot(client, "/moi", "/page")
+    assert moi["body"] == {"id": PRINCIPAL.id}
+    assert page["headers"] == {NEXT_CURSOR_HEADER.lower(): "suivante"}
+
+
+def test_url_absolue_refusee(client):
+    reponse = client.post(f"{settings.API_V1_STR}/batch", json={"requetes": [{"url": "//exemple.org/cas"}]})
+    assert reponse.status_code == 422
@@ -0,0 +1,54 @@
+"""
+📄 Fichier: tests/test_cas_bulk.py
+📝 Description: Lecture et validation du corps de POST /cas/bulk (avant toute écriture)
+🎯 Usage: pytest tests/test_cas_bulk.py
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.api.v1.endpoints.cas import _valider_lignes  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+CAS = {
+    "maladie_id": 1, "centre_sante_id": 2, "district_id": 3,
+    "date_symptomes": "2024-03-01", "date_declaration": "2024-03-04",
+}
+
+
+def test_tableau_json_erreurs_par_ligne():
+    corps = json.dumps([CAS, {**CAS, "maladie_id": None, "age": "trente"}, 5]).encode()
+    total, valides, erreurs = _valider_lignes(corps, "application/json")
+    assert total == 3
+    assert list(valides) == [0]
+    assert valides[0].district_id == 3
+    assert sorted(message.split(":")[0] for message in erreurs[1]) == ["age", "maladie_id"]
+    assert erreurs[2][0].startswith("ligne:")
+
+
+def test_ndjson_ligne_illisible_isolee():
+    corps = b"\n".join([json.dumps(CAS).encode(), b"", b"{pas du json", json.dumps(CAS).encode()])
+    total, valides, erreurs = _valider_lignes(corps, "application/x-ndjson")
+    assert total == 3
+    assert list(valides) == [0, 2]
+    assert erreurs == {1: ["ligne 3: JSON invalide"]}
+
+
+@pytest.mark.parametrize("corps", [b"{pas du json", json.dumps(CAS).encode(), b""])
+def test_corps_invalide_400(corps):
+    with pytest.raises(HTTPException) as exc:
+        _valider_lignes(corps, "application/json")
+    assert exc.value.status_code == 400
+
+
+def test_trop_de_lignes_413(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_CAS_MAX_LIGNES", 2)
+    with pytest.raises(HTTPException) as exc:
+        _valider_lignes(json.dumps([CAS] * 3).encode(), "application/json")
+    assert exc.value.status_code == 413
@@ -0,0 +1,148 @@
+"""
+📄 Fichier: tests/test_cas_changes.py
+📝 Description: Flux de synchronisation /cas/changes (CRUDCas.get_changes_async)
+🎯 Usage: pytest tests/test_cas_changes.py
+
+Une transaction longue (import, lot) qui valide après qu'une
+synchronisation a été servie doit apparaître à la synchronisation suivante ;
+un cas modifié repasse après les transactions antérieures, un cas supprimé
+revient en tombstone.
+"""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import insert, select, text  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, SessionLocal, async_engine  # noqa: E402
+from app.crud.cas import cas as crud_cas  # noqa: E402
+from app.models.cas import Cas  # noqa: E402
+from app.services.agregat_service import COLONNES_CAS, agregat_service  # noqa: E402
+from app.utils.enums import CasStatut  # noqa: E402
+from app.utils.pagination import decode_sync_cursor, encode_cursor, encode_sync_cursor  # noqa: E402
+
+
+def test_curseur_de_synchronisation_aller_retour():
+    for curseur in [(None, (812, 0)), ((815, 3), (812, 7))]:
+        assert decode_sync_cursor(encode_sync_cursor(curseur)) == curseur
+
+
+@pytest.mark.parametrize("curseur", [
+    encode_cursor(date(2024, 3, 1), 42),
+    # Ancien format horodaté [["2024-03-01T10:00:00", 42], ["2024-03-01T10:00:00", 0]] :
+    # refusé, le terminal repart d'une synchronisation initiale
+    "W1siMjAyNC0wMy0wMVQxMDowMDowMCIsNDJdLFsiMjAyNC0wMy0wMVQxMDowMDowMCIsMF1d",
+    encode_sync_cursor(((1.5, 3), (812, 0))),
+    "pas-un-curseur",
+])
+def test_curseur_de_synchronisation_invalide_400(curseur):
+    with pytest.raises(HTTPException) as exc:
+        decode_sync_cursor(curseur)
+    assert exc.value.status_code == 400
+
+
+async def synchroniser(curseur, limit=500):
+    """Toutes les pages depuis `curseur` : (ids des cas reçus dans l'ordre, ids supprimés, curseur suivant)"""
+    try:
+        async with AsyncSessionLocal() as db:
+            recus, supprimes = [], []
+            while True:
+                page = await crud_cas.get_changes_async(db, select(Cas.id), curseur=curseur, limit=limit)
+                recus.extend(ligne.id for ligne in page["cas"])
+                supprimes.extend(ligne.id for ligne in page["supprimes"])
+                curseur = page["curseur"]
+                if not page["suite"]:
+                    return recus, supprimes, curseur
+    finally:
+        await async_engine.dispose()
+
+
+def curseur_courant(engine):
+    """Curseur placé au xmin courant : seules les transactions suivantes seront servies"""
+    with engine.connect() as conn:
+        xmin = conn.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+    return (xmin, 0), (xmin, 0)
+
+
+@pytest.fixture
+def references(base_disponible):
+    with base_disponible.connect() as conn:
+        ligne = conn.execute(text("""
+            SELECT (SELECT id FROM maladies ORDER BY id LIMIT 1) AS maladie_id,
+                   (SELECT id FROM centres_sante ORDER BY id LIMIT 1) AS centre_sante_id,
+                   (SELECT id FROM districts ORDER BY id LIMIT 1) AS district_id,
+                   (SELECT id FROM users ORDER BY id LIMIT 1) AS created_by
+        """)).mappings().one()
+    if None in ligne.values():
+        pytest.skip("Référentiels vides : lancer d'abord scripts.seed_data")
+    return dict(ligne)
+
+
+def test_transaction_longue_validee_apres_une_synchronisation(base_disponible, references):
+    curseur = curseur_courant(base_disponible)
+    with base_disponible.connect() as conn:
+        # Transaction longue : le cas est écrit mais pas encore validé
+        conn.begin()
+        cas_id = conn.execute(text("""
+            INSERT INTO cas (numero_cas, maladie_id, centre_sante_id, district_id, date_symptomes,
+                             date_declaration, statut, created_by)
+            VALUES ('TEST-9999-00001', :maladie_id, :centre_sante_id, :district_id, :jour, :jour,
+                    'SUSPECT', :created_by)
+            RETURNING id
+        """), {**references, "jour": date.today()}).scalar_one()
+        try:
+            recus, _, curseur = asyncio.run(synchroniser(curseur))
+            assert cas_id not in recus
+            conn.commit()
+
+            recus, _, _ = asyncio.run(synchroniser(curseur))
+            assert cas_id in recus
+        finally:
+            conn.rollback()
+            conn.execute(text("DELETE FROM cas WHERE id = :id"), {"id": cas_id})
+            conn.execute(text("DELETE FROM numeros_cas WHERE numero_cas = 'TEST-9999-00001'"))
+            conn.commit()
+
+
+def test_modification_puis_suppression_dans_l_ordre_des_transactions(base_disponible, references):
+    curseur = curseur_courant(base_disponible)
+    numeros = ["TEST-9999-00002", "TEST-9999-00003"]
+    ids = []
+    with SessionLocal() as db:
+        try:
+            # Une transaction par cas, agrégats compris (comme CRUDCas.create)
+            for numero in numeros:
+                ligne = db.execute(
+                    insert(Cas).returning(Cas.id, *(getattr(Cas, colonne) for colonne in COLONNES_CAS)),
+                    {**references, "numero_cas": numero, "date_symptomes": date.today(),
+                     "date_declaration": date.today(), "statut": CasStatut.SUSPECT}
+                ).one()
+                agregat_service.ajouter(db, [ligne])
+                db.commit()
+                ids.append(ligne.id)
+            premier, second = ids
+
+            # Modifié après la création du second : le premier repasse derrière lui
+            crud_cas.update(db, db_obj=db.get(Cas, premier), obj_in={"observations": "Modifié"})
+            recus, supprimes, curseur = asyncio.run(synchroniser(curseur, limit=1))
+            assert [cas_id for cas_id in recus if cas_id in ids] == [second, premier]
+            assert supprimes == []
+
+            crud_cas.remove(db, id=second, supprime_par=references["created_by"])
+            recus, supprimes, _ = asyncio.run(synchroniser(curseur, limit=1))
+            assert second in supprimes
+            assert second not in recus
+        finally:
+            db.rollback()
+            for cas_id in ids:
+                if db.get(Cas, cas_id) is not None:
+                    crud_cas.remove(db, id=cas_id)
+            db.execute(text("DELETE FROM cas_supprimes WHERE id = ANY(:ids)"), {"ids": ids})
+            db.execute(text("DELETE FROM numeros_cas WHERE numero_cas = ANY(:numeros)"), {"numeros": numeros})
+            db.commit()
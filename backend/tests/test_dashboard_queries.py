@@ -0,0 +1,42 @@
+"""
+📄 Fichier: tests/test_dashboard_queries.py
+📝 Description: Budget de requêtes SQL des endpoints du dashboard
+🎯 Usage: pytest tests/test_dashboard_queries.py
+
+Mêmes appels et budgets que benchmarks.bench_dashboard_queries : le nombre
+de requêtes ne doit dépendre ni du nombre de districts ni des données.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.core.instrumentation import capture_sql  # noqa: E402
+from benchmarks.bench_dashboard_queries import BUDGETS, appels  # noqa: E402
+
+
+async def compter_requetes(nom: str) -> int:
+    """Nombre de requêtes SQL d'un appel, après un appel de chauffe"""
+    try:
+        async with AsyncSessionLocal() as db:
+            maladie_id = (await db.execute(text("SELECT min(id) FROM maladies"))).scalar() or 1
+            appel = appels(maladie_id)[nom]
+            await appel(db)
+            with capture_sql() as stats:
+                await appel(db)
+            return stats.count
+    finally:
+        # Les connexions du pool sont liées à la boucle de ce test
+        await async_engine.dispose()
+
+
+@pytest.mark.parametrize("nom", sorted(BUDGETS))
+def test_budget_requetes_dashboard(base_disponible, nom):
+    nombre = asyncio.run(compter_requetes(nom))
+    assert nombre <= BUDGETS[nom], f"{nom} : {nombre} requête(s) SQL pour un budget de {BUDGETS[nom]}"
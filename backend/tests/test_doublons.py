@@ -0,0 +1,83 @@
+"""
+📄 Fichier: tests/test_doublons.py
+📝 Description: Clés de blocs et similarité de la détection des doublons (DoublonService)
+🎯 Usage: pytest tests/test_doublons.py
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.doublon_service import (  # noqa: E402
+    DoublonService, cles_blocage, nom_normalise, semaine, similarite
+)
+from app.utils.enums import Sexe  # noqa: E402
+
+DIMANCHE = date(2024, 3, 10)
+LUNDI = date(2024, 3, 11)
+
+
+def cas(id, nom, jour=LUNDI, age=30, sexe=Sexe.FEMININ, maladie_id=1, district_id=1):
+    return SimpleNamespace(
+        id=id, nom=nom, maladie_id=maladie_id, district_id=district_id, date_symptomes=jour, age=age, sexe=sexe
+    )
+
+
+def test_nom_normalise_ordre_accents_tirets():
+    assert nom_normalise("RAKOTO Jean-Noël") == nom_normalise("noel jean rakoto") == "jean noel rakoto"
+    assert nom_normalise(None) == ""
+
+
+def test_semaine():
+    assert semaine(DIMANCHE) == date(2024, 3, 4)
+    assert semaine(LUNDI) == LUNDI
+
+
+def test_cles_blocage_un_bloc_par_mot():
+    assert cles_blocage(cas(1, "Rakoto Jean B")) == {
+        (1, 1, LUNDI, 6, "jea"), (1, 1, LUNDI, 6, "rak")
+    }
+    assert cles_blocage(cas(1, "Rakoto", age=None)) == {(1, 1, LUNDI, None, "rak")}
+
+
+def test_cles_blocage_semaines_voisines():
+    semaines = {cle[2] for cle in cles_blocage(cas(1, "Rakoto"), decalages=(-1, 0, 1))}
+    assert semaines == {LUNDI - timedelta(weeks=1), LUNDI, LUNDI + timedelta(weeks=1)}
+
+
+def test_similarite():
+    assert similarite(cas(1, "Rakoto Jean"), cas(2, "Jean Rakoto")) == 1.0
+    assert similarite(cas(1, "Rakoto Jean"), cas(2, "Rakoto Jeanne")) > 0.9
+    # Sexes renseignés et différents : jamais le même patient
+    assert similarite(cas(1, "Rakoto Jean"), cas(2, "Rakoto Jean", sexe=Sexe.MASCULIN)) == 0.0
+    assert similarite(cas(1, "Rakoto Jean"), cas(2, "Rakoto Jean", sexe=None)) == 1.0
+
+
+def test_paires_dans_un_meme_bloc_seulement():
+    service = DoublonService(0.85)
+    lignes = [
+        cas(1, "Rakoto Jean"),
+        cas(2, "Jean Rakotoo"),
+        cas(3, "Rakoto Jean", district_id=2),
+        cas(4, "Rabe Marie"),
+    ]
+    assert service.paires(lignes) == {(2, 1): pytest.approx(0.957, abs=1e-3)}
+
+
+def test_paires_semaine_voisine_pour_les_nouveaux_cas():
+    service = DoublonService(0.85)
+    csb, chd = cas(1, "Rakoto Jean", jour=DIMANCHE), cas(2, "Rakoto Jean", jour=LUNDI)
+    # Détection en lot : semaines différentes, blocs distincts
+    assert service.paires([csb, chd]) == {}
+    # Détection incrémentale : le nouveau cas est aussi placé dans les semaines voisines
+    assert service.paires([csb, chd], nouveaux={2}) == {(2, 1): 1.0}
+    assert service.paires([csb, chd], nouveaux={1}) == {(2, 1): 1.0}
+
+
+def test_paires_limitees_aux_nouveaux_cas():
+    service = DoublonService(0.85)
+    lignes = [cas(1, "Rakoto Jean"), cas(2, "Rakoto Jean"), cas(3, "Rabe Marie"), cas(4, "Rabe Marie")]
+    assert service.paires(lignes, nouveaux={4}) == {(4, 3): 1.0}
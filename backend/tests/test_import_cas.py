@@ -0,0 +1,133 @@
+"""
+📄 Fichier: tests/test_import_cas.py
+📝 Description: Lecture et conversion des lignes importées (ImportService)
+🎯 Usage: pytest tests/test_import_cas.py
+
+Sans base : le référentiel est remplacé par ses trois dictionnaires.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.import_service import FichierInvalide, import_service  # noqa: E402
+from app.utils.enums import CasStatut, Sexe  # noqa: E402
+
+REFERENTIEL = SimpleNamespace(
+    maladies={"paludisme": 1, "palu": 1},
+    districts={"analamanga": 10},
+    centres={(10, "csb2 andohalo"): 100},
+)
+
+
+def brut(**valeurs):
+    """Ligne valide (colonnes normalisées), modifiée par `valeurs`"""
+    ligne = {
+        "maladie": "Paludisme", "district": "Analamanga", "centre_sante": "CSB2 Andohalo",
+        "date_symptomes": "02/03/2024", "date_declaration": "2024-03-04",
+    }
+    ligne.update(valeurs)
+    return ligne
+
+
+@pytest.mark.parametrize("valeur, attendu", [
+    ("04/03/2024", date(2024, 3, 4)),
+    ("2024-03-04", date(2024, 3, 4)),
+    ("04-03-2024", date(2024, 3, 4)),
+    (datetime(2024, 3, 4, 9, 30), date(2024, 3, 4)),
+    (date(2024, 3, 4), date(2024, 3, 4)),
+])
+def test_date(valeur, attendu):
+    assert import_service._date(valeur) == attendu
+
+
+@pytest.mark.parametrize("valeur, attendu", [
+    ("Féminin", Sexe.FEMININ),
+    ("MASCULIN", Sexe.MASCULIN),
+    ("Sexe.AUTRE", Sexe.AUTRE),
+    ("f", Sexe.FEMININ),
+])
+def test_enum(valeur, attendu):
+    assert import_service._enum(Sexe, valeur) == attendu
+
+
+def test_enum_inconnu():
+    with pytest.raises(ValueError):
+        import_service._enum(CasStatut, "x")
+
+
+def test_convertir_ligne_valide():
+    numero, cas = import_service.convertir(
+        brut(maladie="PALU", numero_cas="VAKIN-2024-00012", age="34.0", sexe="F",
+             statut="Confirmé", latitude="-18,91", observations=" fièvre "),
+        REFERENTIEL
+    )
+    assert numero == "VAKIN-2024-00012"
+    assert (cas.maladie_id, cas.district_id, cas.centre_sante_id) == (1, 10, 100)
+    assert (cas.date_symptomes, cas.date_declaration) == (date(2024, 3, 2), date(2024, 3, 4))
+    assert (cas.age, cas.sexe, cas.statut) == (34, Sexe.FEMININ, CasStatut.CONFIRME)
+    assert cas.latitude == -18.91
+    assert cas.observations == "fièvre"
+
+
+def test_convertir_valeurs_vides_par_defaut():
+    numero, cas = import_service.convertir(brut(numero_cas="N/A", age="", sexe="-"), REFERENTIEL)
+    assert numero is None
+    assert cas.age is None and cas.sexe is None
+    assert cas.statut == CasStatut.SUSPECT
+
+
+def test_convertir_rapporte_toutes_les_erreurs():
+    with pytest.raises(ValueError) as exc:
+        import_service.convertir(
+            brut(centre_sante="Inconnu", date_symptomes="32/13/2024", age="trente", numero_cas="ABC-1"),
+            REFERENTIEL
+        )
+    erreurs = exc.value.args[0]
+    assert [erreur.split(":")[0] for erreur in erreurs] == ["centre_sante", "date_symptomes", "age", "numero_cas"]
+
+
+def test_convertir_champ_obligatoire_absent():
+    ligne = brut()
+    del ligne["date_declaration"]
+    with pytest.raises(ValueError) as exc:
+        import_service.convertir(ligne, REFERENTIEL)
+    assert exc.value.args[0][0].startswith("date_declaration")
+
+
+@pytest.mark.parametrize("separateur", [";", ","])
+def test_lire_csv_separateur_et_bom(separateur):
+    contenu = "\ufeff" + separateur.join(["N° Cas", "Maladie", "Observations"]) + "\r\n"
+    contenu += separateur.join(["VAKIN-2024-00001", "Paludisme", '"toux; fièvre, frissons"']) + "\r\n"
+    lignes = list(import_service.lire_csv(io.BytesIO(contenu.encode("utf-8"))))
+    assert lignes == [
+        ["N° Cas", "Maladie", "Observations"], ["VAKIN-2024-00001", "Paludisme", "toux; fièvre, frissons"]
+    ]
+
+
+@pytest.mark.parametrize("contenu", [
+    # Latin-1 au lieu d'UTF-8
+    "Maladie;District\nPaludisme;Itasy Région\n".encode("latin-1"),
+    # Champ au-delà de csv.field_size_limit()
+    b'Maladie;District\n"' + b"x" * (csv.field_size_limit() + 1) + b'";Analamanga\n',
+])
+def test_lire_csv_illisible(contenu):
+    with pytest.raises(FichierInvalide):
+        list(import_service.lire_csv(io.BytesIO(contenu)))
+
+
+def test_lire_xlsx_illisible():
+    pytest.importorskip("openpyxl")
+    with pytest.raises(FichierInvalide):
+        list(import_service.lire_xlsx(io.BytesIO(b"PK\x03\x04 pas une archive")))
+
+
+def test_colonnes_obligatoires_absentes():
+    fichier = io.BytesIO("N° Cas;Maladie;District\nVAKIN-2024-00001;Paludisme;Analamanga\n".encode("utf-8"))
+    with pytest.raises(FichierInvalide, match="centre_sante, date_declaration, date_symptomes"):
+        import_service.import_cas(None, fichier, "csv", created_by=1)
@@ -0,0 +1,37 @@
+"""
+📄 Fichier: tests/test_numero_cas.py
+📝 Description: Attribution concurrente des numéros de cas (CRUDCas.allouer_numeros)
+🎯 Usage: pytest tests/test_numero_cas.py
+
+Version courte de benchmarks.bench_numero_cas : des threads attribuent des
+numéros en parallèle sur l'année réservée 9999, une partie des transactions
+est annulée ; aucun doublon, aucun trou, aucune erreur n'est toléré.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from benchmarks.bench_numero_cas import run_level  # noqa: E402
+
+ANNEE = 9999
+THREADS = 16
+
+
+@pytest.fixture(scope="module")
+def sessions(base_disponible):
+    """Pool dédié : une connexion par thread"""
+    engine = create_engine(base_disponible.url, pool_size=THREADS, max_overflow=0)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def test_allocation_parallele_sans_doublon(sessions):
+    resultat = run_level(sessions, ANNEE, threads=THREADS, allocations=50, rollback_ratio=0.1)
+    assert resultat["errors"] == 0, resultat["first_error"]
+    assert resultat["duplicates"] == 0
+    assert resultat["gaps"] == 0
+    assert resultat["committed"] > 0
@@ -0,0 +1,57 @@
+"""
+📄 Fichier: tests/test_pagination.py
+📝 Description: Curseurs opaques et pagination par clé (app.utils.pagination, CRUDCas._paginate)
+🎯 Usage: pytest tests/test_pagination.py
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException, Response  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.crud.cas import cas as crud_cas  # noqa: E402
+from app.utils.pagination import (  # noqa: E402
+    NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, set_next_cursor
+)
+
+
+def test_curseur_aller_retour():
+    curseur = encode_cursor(date(2024, 3, 1), 42)
+    assert "=" not in curseur
+    assert decode_cursor(curseur) == (date(2024, 3, 1), 42)
+
+
+@pytest.mark.parametrize("curseur", ["", "pas-un-curseur", encode_cursor(date(2024, 3, 1), 42)[:-3]])
+def test_curseur_invalide_400(curseur):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(curseur)
+    assert exc.value.status_code == 400
+
+
+def test_curseur_suivant_seulement_si_page_pleine():
+    lignes = [SimpleNamespace(id=i, date_declaration=date(2024, 3, 10 - i)) for i in range(1, 4)]
+
+    response = Response()
+    assert set_next_cursor(response, lignes[:2], 3, "date_declaration") is None
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+    curseur = set_next_cursor(response, lignes, 3, "date_declaration")
+    assert response.headers[NEXT_CURSOR_HEADER] == curseur
+    assert decode_cursor(curseur) == (date(2024, 3, 7), 3)
+
+
+def test_continuation_par_cle_egale_a_une_seule_page(base_disponible):
+    with SessionLocal() as db:
+        page = crud_cas.get_by_filters(db, limit=10)
+        if len(page) < 10:
+            pytest.skip("Moins de 10 cas en base")
+        premiere = crud_cas.get_by_filters(db, limit=5)
+        derniere = premiere[-1]
+        suivante = crud_cas.get_by_filters(db, limit=5, apres=(derniere.date_declaration, derniere.id))
+    assert [c.id for c in premiere + suivante] == [c.id for c in page]
@@ -0,0 +1,67 @@
+"""
+📄 Fichier: tests/test_projection.py
+📝 Description: Projection de colonnes ?fields= (app.utils.projection)
+🎯 Usage: pytest tests/test_projection.py
+"""
+
+import json
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.models.cas import Cas  # noqa: E402
+from app.schemas.cas import CasResponse  # noqa: E402
+from app.utils.enums import CasStatut  # noqa: E402
+from app.utils.projection import dumps, parse_fields, projection  # noqa: E402
+
+
+def ligne(**valeurs):
+    """Ligne de résultat minimale (serialiser ne lit que _mapping)"""
+    return SimpleNamespace(_mapping=valeurs)
+
+
+def test_parse_fields_nettoie_et_deduplique():
+    assert parse_fields(" id, numero_cas,,id ", CasResponse) == ["id", "numero_cas"]
+
+
+@pytest.mark.parametrize("fields", ["", " , ", "id,inconnu"])
+def test_parse_fields_invalide_400(fields):
+    with pytest.raises(HTTPException) as exc:
+        parse_fields(fields, CasResponse)
+    assert exc.value.status_code == 400
+
+
+def test_cles_lues_mais_non_renvoyees():
+    query, serialiser = projection(Cas, CasResponse, "numero_cas", cles=("id", "date_declaration"))
+    assert [colonne.name for colonne in query.selected_columns] == ["numero_cas", "id", "date_declaration"]
+    assert "JOIN" not in str(query)
+
+    resultat = serialiser(ligne(numero_cas="VAKIN-2024-00001", id=1, date_declaration=date(2024, 1, 2)))
+    assert resultat == {"numero_cas": "VAKIN-2024-00001"}
+
+
+def test_relation_jointure_externe_limitee_au_schema_imbrique():
+    query, serialiser = projection(Cas, CasResponse, "id,maladie")
+    assert "LEFT OUTER JOIN maladies" in str(query)
+    assert [colonne.name for colonne in query.selected_columns] == [
+        "id", "maladie__id", "maladie__nom", "maladie__code"
+    ]
+
+    assert serialiser(ligne(id=1, maladie__id=3, maladie__nom="Paludisme", maladie__code="PALU")) == {
+        "id": 1, "maladie": {"id": 3, "nom": "Paludisme", "code": "PALU"}
+    }
+    # Jointure externe sans correspondance : relation nulle, pas un objet vide
+    assert serialiser(ligne(id=1, maladie__id=None, maladie__nom=None, maladie__code=None)) == {
+        "id": 1, "maladie": None
+    }
+
+
+def test_dumps_enum_et_dates():
+    contenu = [{"statut": CasStatut.CONFIRME, "jour": date(2024, 1, 2), "le": datetime(2024, 1, 2, 8, 30)}]
+    assert json.loads(dumps(contenu)) == [{"statut": "confirme", "jour": "2024-01-02", "le": "2024-01-02T08:30:00"}]
@@ -0,0 +1,41 @@
+"""
+📄 Fichier: tests/test_query_plans.py
+📝 Description: Régression des plans d'exécution des requêtes chaudes (EXPLAIN)
+🎯 Usage: pytest tests/test_query_plans.py
+
+Même contrôle que benchmarks.bench_query_plans : aucun plan ne doit parcourir
+séquentiellement cas ou alertes. Sur une petite base, le plan est recalculé
+avec enable_seqscan = off (un index utilisable doit exister). Sauté si la
+base est indisponible ou si cas est vide.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from benchmarks.bench_query_plans import (  # noqa: E402
+    HOT_QUERIES, MIN_ROWS, compter_lignes, explain, index_names, parametres, seq_scans
+)
+
+
+@pytest.fixture(scope="module")
+def contexte(base_disponible):
+    """(connexion, lignes par table, paramètres des requêtes)"""
+    with base_disponible.connect() as conn:
+        params = parametres(conn)
+        if params["fin"] is None:
+            pytest.skip("Table cas vide : lancer d'abord scripts.generate_synthetic_data")
+        lignes = compter_lignes(conn)
+        # Fin de la transaction implicite : chaque EXPLAIN a la sienne (SET LOCAL)
+        conn.rollback()
+        yield conn, lignes, params
+
+
+@pytest.mark.parametrize("nom", sorted(HOT_QUERIES))
+def test_pas_de_parcours_sequentiel(contexte, nom):
+    conn, lignes, params = contexte
+    table, sql = HOT_QUERIES[nom]
+    with conn.begin():
+        plan = explain(conn, sql, params, force_index=lignes[table] < MIN_ROWS)
+    scans = seq_scans(plan)
+    assert not scans, f"{nom} : parcours séquentiel de {', '.join(scans)} (index : {index_names(plan) or 'aucun'})"
@@ -0,0 +1,63 @@
+"""
+📄 Fichier: tests/test_recherche.py
+📝 Description: Recherche de cas par pertinence (CRUDCas.search_async) et son curseur
+🎯 Usage: pytest tests/test_recherche.py
+
+La page suivante, demandée avec la clé (score, id) de la dernière ligne,
+doit prolonger exactement la première.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.crud.cas import cas as crud_cas  # noqa: E402
+from app.utils.pagination import decode_rank_cursor, encode_rank_cursor  # noqa: E402
+
+
+def test_curseur_de_pertinence_aller_retour():
+    assert decode_rank_cursor(encode_rank_cursor(0.4285714, 17)) == (0.4285714, 17)
+
+
+def test_curseur_de_pertinence_invalide_400():
+    with pytest.raises(HTTPException) as exc:
+        decode_rank_cursor(encode_rank_cursor(0.5, 17)[:-4])
+    assert exc.value.status_code == 400
+
+
+async def rechercher(q: str):
+    """(10 premiers résultats, 5 premiers + 5 suivants par curseur) en ids"""
+    try:
+        async with AsyncSessionLocal() as db:
+            page = await crud_cas.search_async(db, q, limit=10)
+            premiere = await crud_cas.search_async(db, q, limit=5)
+            apres = None
+            if premiere:
+                cas, score = premiere[-1]
+                apres = decode_rank_cursor(encode_rank_cursor(score, cas.id))
+            suivante = await crud_cas.search_async(db, q, limit=5, apres=apres) if apres else []
+            return [cas.id for cas, _ in page], [cas.id for cas, _ in premiere + suivante]
+    finally:
+        await async_engine.dispose()
+
+
+def test_page_suivante_par_pertinence(base_disponible):
+    with base_disponible.connect() as conn:
+        q = conn.execute(text("""
+            SELECT split_part(nom, ' ', 1) FROM cas
+            WHERE length(split_part(nom, ' ', 1)) >= 3
+            LIMIT 1
+        """)).scalar()
+    if q is None:
+        pytest.skip("Aucun cas nommé en base")
+
+    page, par_curseur = asyncio.run(rechercher(q))
+    assert page
+    assert par_curseur == page